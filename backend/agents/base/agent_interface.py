@@ -35,8 +35,9 @@ from backend.memory.schemas import (
 )
 from backend.repositories.graph_repository import GraphRepository
 from backend.repositories.task_repository import get_session_factory
+from backend.core.config import get_settings
 from backend.core.token_tracker import ExecutionMetrics
-from backend.core.execution_tracker import ExecutionTracker
+from backend.core.execution_tracker import ExecutionTracker, acquire_tracker, release_tracker
 from backend.core.llm_factory import ModelConfig, get_default_config
 from backend.repositories.agent_model_repository import AgentModelRepository
 
@@ -308,14 +309,18 @@ class BaseAgent(ABC, MemoryAwareMixin):
         Execute agent with the given command and context
         This is the main entry point for agent invocation
         """
+        # Borrow a pooled tracker if the caller did not supply one; it is
+        # returned to the pool once this execution has read its trace
+        owns_tracker = context.execution_tracker is None
+        if owns_tracker:
+            context.execution_tracker = acquire_tracker()
+
         try:
             # Initialize metrics tracking if not provided
             if context.metrics is None:
-                context.metrics = ExecutionMetrics()
-
-            # Initialize execution tracking if not provided
-            if context.execution_tracker is None:
-                context.execution_tracker = ExecutionTracker()
+                context.metrics = ExecutionMetrics(
+                    track_details=get_settings().execution_metrics_details
+                )
 
             # Notify task started
             if context.task_callback:
@@ -401,6 +406,11 @@ class BaseAgent(ABC, MemoryAwareMixin):
                 error=str(e),
             )
 
+        finally:
+            if owns_tracker:
+                release_tracker(context.execution_tracker)
+                context.execution_tracker = None
+
     @abstractmethod
     async def _execute_graph(
         self,
@@ -112,8 +112,11 @@ async def delegate_to_specialists_node(state: ParentAgentState) -> dict[str, Any
     Uses asyncio.gather() for concurrent execution
     """
     import asyncio
+    from backend.core.config import get_settings
     from backend.core.token_tracker import ExecutionMetrics
 
+    track_details = get_settings().execution_metrics_details
+
     async def execute_agent(agent_nickname: str, subtask_query: str) -> tuple[str, dict]:
         """Execute single agent and return results"""
         # Get agent from registry
@@ -126,7 +129,7 @@ async def delegate_to_specialists_node(state: ParentAgentState) -> dict[str, Any
             }
 
         # Create child execution context with fresh metrics
-        child_metrics = ExecutionMetrics()
+        child_metrics = ExecutionMetrics(track_details=track_details)
         context = AgentExecutionContext(
             user_id=state["user_id"],
             thread_id=state["thread_id"],
@@ -16,6 +16,7 @@
 FastAPI application entry point
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from uuid import UUID
 
@@ -34,9 +35,17 @@ async def lifespan(app: FastAPI):
     # Startup
     settings = get_settings()
 
+    # The loop is created by uvicorn before the app is imported, so just verify it
+    if settings.event_loop == "uvloop" and not type(asyncio.get_running_loop()).__module__.startswith("uvloop"):
+        print("⚠️  EVENT_LOOP=uvloop but running on the default asyncio loop (start uvicorn with --loop uvloop)")
+
     # Initialize memory service
     memory_service = await get_memory_service()
 
+    # Shared HTTP connection pool for outbound calls made during agent execution
+    from backend.core.http_client import get_http_client
+    app.state.http_client = get_http_client()
+
     # Initialize and register agents
     await initialize_default_agents()
 
@@ -61,6 +70,10 @@ async def lifespan(app: FastAPI):
     )
     print("📊 Hourly stats aggregation job scheduled")
 
+    # Prewarm DB / LLM connections so the first routed and scored tasks skip setup
+    from backend.core import intelligent_router, performance_evaluator
+    await asyncio.gather(intelligent_router.warmup(), performance_evaluator.warmup())
+
     print("🚀 commander.ai started successfully")
 
     yield
@@ -72,6 +85,17 @@ async def lifespan(app: FastAPI):
 
     await memory_service.shutdown()
 
+    # Flush background performance score / routing decision writes before closing the database
+    from backend.core.execution_tracker import shutdown_performance_writer
+    await shutdown_performance_writer()
+
+    from backend.core.intelligent_router import shutdown_routing_writer
+    await shutdown_routing_writer()
+
+    # Close shared HTTP connection pool
+    from backend.core.http_client import close_http_client
+    await close_http_client()
+
     # Close database connections
     from backend.core.database import close_db_connections
     await close_db_connections()
@@ -16,7 +16,7 @@ from backend.repositories.task_repository import get_db_session
 from backend.repositories.prompt_repository import PromptRepository
 from backend.auth.dependencies import get_current_active_user
 from backend.auth.models import User
-from backend.core.prompt_engineer import get_prompt_engineer, PromptEngineerError
+from backend.core.prompt_engineer import PromptEngineerError
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
@@ -177,15 +177,6 @@ async def create_prompt(
             f"by user {current_user.email}"
         )
 
-        # Invalidate PromptEngineer cache for this agent
-        try:
-            prompt_engineer = get_prompt_engineer()
-            prompt_engineer.clear_cache(prompt.agent_id)
-            logger.info(f"Cleared PromptEngineer cache for {prompt.agent_id}")
-        except RuntimeError:
-            # PromptEngineer not initialized yet - that's OK
-            pass
-
         return prompt
 
     except Exception as e:
@@ -220,14 +211,6 @@ async def update_prompt(
             f"by user {current_user.email}"
         )
 
-        # Invalidate PromptEngineer cache
-        try:
-            prompt_engineer = get_prompt_engineer()
-            prompt_engineer.clear_cache(existing.agent_id)
-            logger.info(f"Cleared PromptEngineer cache for {existing.agent_id}")
-        except RuntimeError:
-            pass
-
         return updated_prompt
 
     except HTTPException:
@@ -266,13 +249,6 @@ async def delete_prompt(
             f"by user {current_user.email}"
         )
 
-        # Invalidate cache
-        try:
-            prompt_engineer = get_prompt_engineer()
-            prompt_engineer.clear_cache(existing.agent_id)
-        except RuntimeError:
-            pass
-
         return {
             "message": "Prompt deactivated successfully",
             "prompt_id": str(prompt_id)
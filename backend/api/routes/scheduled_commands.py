@@ -142,7 +142,7 @@ async def update_scheduled_command(
     # Update in scheduler if configuration changed
     scheduler = get_scheduler_service()
     if updated.enabled:
-        await scheduler.update_schedule(schedule_id)
+        await scheduler.update_schedule(updated, repo)
     else:
         await scheduler.remove_schedule(schedule_id)
 
@@ -312,13 +312,28 @@ async def get_execution_history(
 
 
 @router.get("/scheduler/status")
-async def get_scheduler_status():
+async def get_scheduler_status(
+    limit: int | None = Query(default=None, ge=1, description="Maximum jobs to list"),
+    offset: int = Query(default=0, ge=0, description="Jobs to skip"),
+):
     """
     Get current scheduler status and job information
 
-    Useful for debugging and monitoring.
+    Useful for debugging and monitoring. jobs_count is always the total;
+    use limit/offset to page through the job list.
     """
     scheduler = get_scheduler_service()
-    status = scheduler.get_scheduler_status()
+    status = scheduler.get_scheduler_status(limit=limit, offset=offset)
 
     return status
+
+
+@router.get("/scheduler/summary")
+async def get_scheduler_summary():
+    """
+    Get scheduler state and job count without the job list
+
+    Cheap enough for health checks.
+    """
+    scheduler = get_scheduler_service()
+    return scheduler.get_scheduler_summary()
@@ -35,6 +35,10 @@ class TaskWebSocketManager:
 
     async def broadcast_task_event(self, event: BaseModel):
         """Broadcast task event to all connected users"""
+        # Nobody listening - skip serialization entirely
+        if not self.active_connections:
+            return
+
         message = event.model_dump(mode='json')
         print(f"📤 Broadcasting event: {event.type} to {len(self.active_connections)} connections")
 
@@ -3,7 +3,8 @@ Command Queue - Async queue for managing incoming commands
 """
 
 import asyncio
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any
@@ -26,13 +27,14 @@ class QueuedCommand:
     """A command in the queue with priority"""
 
     priority: int  # Higher = processed first
-    timestamp: datetime
+    timestamp: int  # time.monotonic_ns() tiebreaker - int compares natively in heap ops
     command_id: UUID
     user_id: UUID
     thread_id: UUID
     command_text: str
     target_agent_id: str
     metadata: dict[str, Any]
+    created_at: datetime = field(compare=False)  # Wall-clock time for display only
 
     def __init__(
         self,
@@ -44,7 +46,8 @@ class QueuedCommand:
         metadata: dict[str, Any] | None = None,
     ):
         self.priority = -priority.value  # Negative for heap (lower = higher priority)
-        self.timestamp = datetime.now()
+        self.timestamp = time.monotonic_ns()
+        self.created_at = datetime.now()
         self.command_id = uuid4()
         self.user_id = user_id
         self.thread_id = thread_id
@@ -60,7 +63,8 @@ class CommandQueue:
 
     def __init__(self, maxsize: int = 0):
         self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=maxsize)
-        self._active_commands: dict[UUID, QueuedCommand] = {}
+        # Keyed by UUID.int so lookups hash a native int rather than a UUID object
+        self._active_commands: dict[int, QueuedCommand] = {}
 
     async def enqueue(self, command: QueuedCommand) -> None:
         """Add command to queue"""
@@ -69,12 +73,12 @@ class CommandQueue:
     async def dequeue(self) -> QueuedCommand:
         """Get next command from queue"""
         command = await self._queue.get()
-        self._active_commands[command.command_id] = command
+        self._active_commands[command.command_id.int] = command
         return command
 
     def mark_complete(self, command_id: UUID) -> None:
         """Mark command as complete"""
-        self._active_commands.pop(command_id, None)
+        self._active_commands.pop(command_id.int, None)
 
     def qsize(self) -> int:
         """Get queue size"""
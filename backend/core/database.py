@@ -6,6 +6,7 @@ Provides async SQLAlchemy session for PostgreSQL
 import logging
 from typing import AsyncGenerator
 
+from sqlalchemy import Engine, create_engine, make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from backend.core.config import get_settings
@@ -15,6 +16,7 @@ logger = logging.getLogger(__name__)
 # Global engine and session maker
 _engine = None
 _async_session_maker = None
+_sync_engine: Engine | None = None
 
 
 def get_engine():
@@ -35,6 +37,30 @@ def get_engine():
     return _engine
 
 
+def get_sync_engine() -> Engine:
+    """
+    Get or create the shared synchronous SQLAlchemy engine
+
+    For libraries that need a blocking engine (APScheduler's job store).
+    Uses the same database as get_engine() with the dialect's default sync
+    driver, so every consumer shares one pool instead of building its own.
+    """
+    global _sync_engine
+
+    if _sync_engine is None:
+        settings = get_settings()
+        url = make_url(settings.database_url)
+        _sync_engine = create_engine(
+            url.set(drivername=url.get_backend_name()),
+            pool_size=settings.database_sync_pool_size,
+            max_overflow=settings.database_sync_max_overflow,
+            pool_pre_ping=True,
+        )
+        logger.info("Sync database engine created")
+
+    return _sync_engine
+
+
 def get_session_maker() -> async_sessionmaker[AsyncSession]:
     """Get or create async session maker"""
     global _async_session_maker
@@ -81,10 +107,15 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
 
 async def close_db_connections():
     """Close database connections (call on application shutdown)"""
-    global _engine, _async_session_maker
+    global _engine, _async_session_maker, _sync_engine
 
     if _engine:
         await _engine.dispose()
         logger.info("Database engine disposed")
         _engine = None
         _async_session_maker = None
+
+    if _sync_engine:
+        _sync_engine.dispose()
+        logger.info("Sync database engine disposed")
+        _sync_engine = None
@@ -3,6 +3,7 @@ Dependency management for commander.ai
 Provides singleton instances and dependency injection
 """
 
+import asyncio
 import logging
 from typing import Optional
 
@@ -12,7 +13,8 @@ logger = logging.getLogger(__name__)
 
 # Global singleton instance
 _document_store: Optional[DocumentStore] = None
-_instance_count = 0
+# Serializes first-time initialization; created lazily since import may precede the event loop
+_init_lock: Optional[asyncio.Lock] = None
 
 
 async def get_document_store() -> DocumentStore:
@@ -34,21 +36,34 @@ async def get_document_store() -> DocumentStore:
         results = await doc_store.search_collection(...)
         ```
     """
-    global _document_store, _instance_count
-
-    if _document_store is None:
-        logger.info("Initializing DocumentStore singleton")
-        _document_store = DocumentStore()
-        await _document_store.connect()
-        _instance_count = 1
-        logger.info("DocumentStore singleton initialized successfully")
-    else:
-        _instance_count += 1
-        if _instance_count > 10:
-            logger.warning(
-                f"DocumentStore singleton accessed {_instance_count} times. "
-                "This is expected behavior (shared instance)."
-            )
+    # Fast path: already initialized - one global load and one branch
+    store = _document_store
+    if store is not None:
+        return store
+
+    return await _init_document_store()
+
+
+async def _init_document_store() -> DocumentStore:
+    """
+    Slow path of get_document_store(): create and connect the singleton
+
+    Concurrent first callers wait on the lock and re-check, so only one
+    DocumentStore is constructed and connected. The singleton is published
+    only after connect() succeeds, so no caller sees an unconnected store.
+    """
+    global _document_store, _init_lock
+
+    if _init_lock is None:
+        _init_lock = asyncio.Lock()
+
+    async with _init_lock:
+        if _document_store is None:
+            logger.info("Initializing DocumentStore singleton")
+            store = DocumentStore()
+            await store.connect()
+            _document_store = store
+            logger.info("DocumentStore singleton initialized successfully")
 
     return _document_store
 
@@ -68,13 +83,12 @@ async def shutdown_document_store() -> None:
             await shutdown_document_store()
         ```
     """
-    global _document_store, _instance_count
+    global _document_store
 
     if _document_store is not None:
         logger.info("Shutting down DocumentStore singleton")
         await _document_store.disconnect()
         _document_store = None
-        _instance_count = 0
         logger.info("DocumentStore singleton shut down successfully")
 
 
@@ -84,6 +98,6 @@ def reset_document_store() -> None:
 
     WARNING: Only use this in test cleanup!
     """
-    global _document_store, _instance_count
+    global _document_store, _init_lock
     _document_store = None
-    _instance_count = 0
+    _init_lock = None
@@ -5,75 +5,367 @@ Tracks the sequential flow of nodes, tools, and LLM calls during agent execution
 Provides observability into the agent decision-making process.
 """
 
+import asyncio
+import json
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import math
+import random
+import reprlib
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple
 from uuid import UUID
 from langchain_core.callbacks.base import BaseCallbackHandler
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Callback handlers are matched by class, so a second copy of this module
+# (e.g. imported as ``core.execution_tracker`` with backend/ on sys.path)
+# would yield trackers that fail isinstance checks and double registration.
+if __name__ not in ("backend.core.execution_tracker", "__main__"):
+    raise ImportError(
+        f"execution_tracker imported as {__name__!r}; "
+        "import it as backend.core.execution_tracker"
+    )
+
+# Bounded repr used to preview oversized payloads without rendering them in full
+_preview_repr = reprlib.Repr()
+_preview_repr.maxstring = 256
+_preview_repr.maxother = 256
+_PREVIEW_LENGTH = 256
+
+
+def _estimate_size(data: Any) -> int:
+    """Cheap, one-level approximation of a payload's size in bytes"""
+    if isinstance(data, (str, bytes)):
+        return len(data)
+    if isinstance(data, dict):
+        data = data.values()
+    elif not isinstance(data, (list, tuple)):
+        return sys.getsizeof(data)
+    return sum(len(v) if isinstance(v, (str, bytes)) else sys.getsizeof(v) for v in data)
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=str).encode()
+
+
+_CYCLE_PLACEHOLDER = "<cycle>"
+
+
+def _sanitize(data: Any, max_length: int = 500) -> Any:
+    """
+    Sanitize data for storage (truncate long strings, convert UUIDs)
+
+    Walks the structure with an explicit work stack rather than recursion,
+    so deep agent state costs a single pass. Values of unknown types are
+    converted with str() instead of being probed for JSON serializability.
+    A container that contains itself is replaced with a placeholder.
+    """
+    root: List[Any] = [None]
+    stack: List[Tuple[Any, Any, Any]] = [(root, 0, data)]
+    # ids of the containers on the current path; an exit marker
+    # (None, id, None) is pushed below a container's children so it is
+    # popped once they are all done
+    active: set = set()
+
+    while stack:
+        container, key, value = stack.pop()
+        if container is None:
+            active.discard(key)
+            continue
+        value_type = type(value)
+
+        if value is None or value_type is int or value_type is float or value_type is bool:
+            container[key] = value
+        elif value_type is str or isinstance(value, str):
+            container[key] = value[:max_length] + "..." if len(value) > max_length else value
+        elif value_type is dict or isinstance(value, dict):
+            if id(value) in active:
+                container[key] = _CYCLE_PLACEHOLDER
+                continue
+            active.add(id(value))
+            stack.append((None, id(value), None))
+            # Pre-seed keys so children filled in stack order keep insertion order
+            out = dict.fromkeys(value)
+            container[key] = out
+            for k, v in value.items():
+                stack.append((out, k, v))
+        elif value_type is list or isinstance(value, (list, tuple)):
+            if id(value) in active:
+                container[key] = _CYCLE_PLACEHOLDER
+                continue
+            active.add(id(value))
+            stack.append((None, id(value), None))
+            # Limit to 10 items; index into the source instead of slicing a copy
+            count = len(value) if len(value) <= 10 else 10
+            out = [None] * count
+            container[key] = out
+            for i in range(count):
+                stack.append((out, i, value[i]))
+        elif isinstance(value, (int, float)):
+            container[key] = value
+        else:
+            # UUIDs and any other non-JSON types (callbacks, messages, ...)
+            container[key] = str(value)
+
+    return root[0]
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recently formatted second
+_iso_second_cache: Tuple[int, str] = (-1, "")
+
+
+def _format_timestamp(ts: float) -> str:
+    """
+    Format epoch seconds like datetime.fromtimestamp(ts).isoformat()
+
+    Steps recorded in a burst share the same second, so the date/time prefix
+    is cached and only the microsecond tail is formatted per call.
+    """
+    global _iso_second_cache
+
+    frac, whole = math.modf(ts)
+    second = int(whole)
+    micro = round(frac * 1e6)
+    if micro >= 1_000_000:
+        second += 1
+        micro -= 1_000_000
 
+    cached_second, prefix = _iso_second_cache
+    if cached_second != second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+        _iso_second_cache = (second, prefix)
+
+    return f"{prefix}.{micro:06d}" if micro else prefix
+
+
+def _step_to_dict(
+    step: "ExecutionStep",
+    _sanitize=_sanitize,
+    _format_timestamp=_format_timestamp,
+) -> Dict[str, Any]:
+    """
+    Convert a step to a dictionary for JSON serialization
+
+    Raw inputs/outputs are kept by reference and only sanitized here. Once
+    the step has finished (duration recorded) it no longer changes, so the
+    result is cached and repeated get_trace() calls reuse it. The helpers are
+    bound as defaults so the per-step calls are local rather than global lookups.
+    """
+    cached = step._cached_dict
+    if cached is not None:
+        return cached
+
+    result = {
+        "type": step.step_type,
+        "name": step.name,
+        "timestamp": _format_timestamp(step.timestamp),
+        "duration_ms": step.duration_ms,
+        "inputs": _sanitize(step.inputs),
+        "outputs": _sanitize(step.outputs),
+        "metadata": step.metadata,
+    }
+    if step.duration_ms is not None:
+        step._cached_dict = result
+    return result
+
+
+@dataclass(slots=True)
 class ExecutionStep:
     """Represents a single step in the execution trace"""
 
-    def __init__(
-        self,
-        step_type: str,  # "node", "tool", "llm", "agent"
-        name: str,
-        timestamp: str,
-        duration_ms: Optional[float] = None,
-        inputs: Optional[Dict[str, Any]] = None,
-        outputs: Optional[Dict[str, Any]] = None,
-        metadata: Optional[Dict[str, Any]] = None,
-    ):
-        self.step_type = step_type
-        self.name = name
-        self.timestamp = timestamp
-        self.duration_ms = duration_ms
-        self.inputs = inputs
-        self.outputs = outputs
-        self.metadata = metadata or {}
+    step_type: str  # "node", "tool", "llm", "agent"
+    name: str
+    timestamp: float  # Wall-clock epoch seconds; formatted as ISO in to_dict()
+    duration_ms: Optional[float] = None
+    inputs: Optional[Dict[str, Any]] = None
+    outputs: Optional[Dict[str, Any]] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
-        return {
-            "type": self.step_type,
-            "name": self.name,
-            "timestamp": self.timestamp,
-            "duration_ms": self.duration_ms,
-            "inputs": self._sanitize(self.inputs),
-            "outputs": self._sanitize(self.outputs),
-            "metadata": self.metadata,
-        }
+        return _step_to_dict(self)
 
-    @staticmethod
-    def _sanitize(data: Any, max_length: int = 500) -> Any:
-        """Sanitize data for storage (truncate long strings, convert UUIDs)"""
-        if data is None:
-            return None
 
-        # Convert UUIDs to strings
-        if isinstance(data, UUID):
-            return str(data)
+@lru_cache(maxsize=1024)
+def _is_internal_node(name: str) -> bool:
+    """
+    Whether a chain name is LangGraph plumbing (__start__, Pregel internals, ...)
+
+    Graphs emit the same few names over and over, so results are memoized and
+    repeated lookups skip the lower()/substring scan.
+    """
+    return name.startswith("__") or "pregel" in name.lower()
 
-        if isinstance(data, str):
-            return data[:max_length] + "..." if len(data) > max_length else data
 
-        if isinstance(data, dict):
-            return {k: ExecutionStep._sanitize(v, max_length) for k, v in data.items()}
+# Normalize: 1000 tokens in 10 seconds is the "baseline" (score = 1.0)
+EFFICIENCY_BASELINE = 1000 * 10
 
-        if isinstance(data, list):
-            return [ExecutionStep._sanitize(item, max_length) for item in data[:10]]  # Limit to 10 items
 
-        # For other types (int, float, bool, etc.), return as-is
-        # Skip non-serializable objects like callbacks
+@lru_cache(maxsize=1024)
+def _calculate_efficiency(tokens: int, duration: float) -> float:
+    """
+    Calculate efficiency score (0-1 scale)
+
+    Efficiency = quality / cost ratio
+    For Phase 1, we'll use: inverse of (tokens * duration)
+    Lower tokens + faster = higher efficiency
+
+    Args:
+        tokens: Total tokens used by the task
+        duration: Task duration in seconds
+
+    Returns:
+        Efficiency score (0-1)
+    """
+    # Calculate score (lower is better, so invert)
+    actual = tokens * duration
+    if actual == 0:
+        return 1.0
+
+    # Normalize to 0-1 scale
+    efficiency = EFFICIENCY_BASELINE / actual
+    efficiency = min(max(efficiency, 0.0), 1.0)  # Clamp to 0-1
+
+    return round(efficiency, 2)
+
+
+# === Tracker pool ===
+
+TRACKER_POOL_SIZE = 64
+
+# Cleared, default-configured trackers ready for reuse
+_tracker_pool: Deque["ExecutionTracker"] = deque()
+
+
+def acquire_tracker() -> "ExecutionTracker":
+    """Get a cleared ExecutionTracker from the pool, or a new one if the pool is empty"""
+    try:
+        return _tracker_pool.pop()
+    except IndexError:
+        from backend.core.config import get_settings
+
+        return ExecutionTracker(sample_rate=get_settings().execution_trace_sample_rate)
+
+
+def release_tracker(tracker: "ExecutionTracker") -> None:
+    """
+    Return a tracker obtained from acquire_tracker()
+
+    The tracker is cleared immediately, so the caller must be done reading
+    its trace. Dicts already returned by get_trace()/get_summary() stay valid.
+    """
+    tracker.clear()
+    if len(_tracker_pool) < TRACKER_POOL_SIZE:
+        _tracker_pool.append(tracker)
+
+
+# === Background performance score writer ===
+
+PERF_WRITE_BATCH_SIZE = 32
+PERF_WRITE_LINGER_SECONDS = 0.5  # How long a batch waits for more scores before writing
+
+_perf_queue: Optional[asyncio.Queue] = None
+_perf_writer: Optional[asyncio.Task] = None
+
+
+def enqueue_performance_score(
+    task_id: UUID,
+    agent_id: str,
+    scores: Dict[str, Any],
+    metadata: Dict[str, Any],
+) -> None:
+    """
+    Queue a performance score for persistence without waiting on the database
+
+    A single writer task (started on first use, per event loop) drains the
+    queue and commits each batch in one transaction.
+    """
+    global _perf_queue, _perf_writer
+
+    loop = asyncio.get_running_loop()
+    if _perf_writer is None or _perf_writer.done() or _perf_writer.get_loop() is not loop:
+        _perf_queue = asyncio.Queue()
+        _perf_writer = loop.create_task(_drain_perf_queue(_perf_queue))
+
+    _perf_queue.put_nowait((task_id, agent_id, scores, metadata))
+
+
+async def _drain_perf_queue(queue: asyncio.Queue) -> None:
+    """Consume queued scores forever, coalescing arrivals into batched writes"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + PERF_WRITE_LINGER_SECONDS
+        while len(batch) < PERF_WRITE_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
         try:
-            import json
-            json.dumps(data)  # Test if serializable
-            return data
-        except (TypeError, ValueError):
-            return str(data)  # Convert non-serializable to string
+            await _write_performance_scores(batch)
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+async def _write_performance_scores(batch: List[Tuple[UUID, str, Dict[str, Any], Dict[str, Any]]]) -> None:
+    """Persist a batch of performance scores in a single transaction"""
+    from backend.repositories.performance_repository import PerformanceRepository
+    from backend.core.database import get_session_maker
+
+    try:
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            repo = PerformanceRepository(session)
+            await repo.save_performance_scores_bulk(batch)
+            await session.commit()
+        for task_id, _, scores, _ in batch:
+            logger.info(f"Performance score saved for task {task_id}: {scores['overall_score']:.2f}")
+    except Exception as e:
+        logger.error(f"Failed to save {len(batch)} performance score(s): {e}", exc_info=True)
+
+
+async def shutdown_performance_writer(timeout: float = 10.0) -> None:
+    """
+    Flush queued performance scores and stop the writer task
+
+    Should be called during application lifecycle shutdown.
+    """
+    global _perf_queue, _perf_writer
+
+    if _perf_writer is None:
+        return
+
+    try:
+        await asyncio.wait_for(_perf_queue.join(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Dropped {_perf_queue.qsize()} unsaved performance score(s) on shutdown")
+
+    _perf_writer.cancel()
+    try:
+        await _perf_writer
+    except asyncio.CancelledError:
+        pass
+    _perf_queue = None
+    _perf_writer = None
 
 
 class ExecutionTracker(BaseCallbackHandler):
@@ -92,26 +384,100 @@ class ExecutionTracker(BaseCallbackHandler):
         trace = tracker.get_trace()
     """
 
-    def __init__(self):
-        self.flow: List[ExecutionStep] = []
-        self._start_times: Dict[str, float] = {}
-        self._step_counter = 0
-
-    def _get_timestamp(self) -> str:
-        """Get current timestamp in ISO format"""
-        return datetime.now().isoformat()
+    def __init__(
+        self,
+        max_payload_bytes: int = 4096,
+        keep_payloads: bool = True,
+        sample_rate: float = 1.0,
+        always_sample_errors: bool = True,
+        max_steps: Optional[int] = None,
+    ):
+        """
+        Args:
+            max_payload_bytes: Inputs/outputs estimated above this size are replaced
+                with a short preview when captured
+            keep_payloads: Set False to record only type/size descriptors
+            sample_rate: Fraction of executions that are traced; the decision is
+                drawn once per execution (on init and on every clear())
+            always_sample_errors: Record tool/LLM errors even in unsampled executions
+            max_steps: Keep only the most recent steps in flow (None = unbounded);
+                get_summary() still counts every step
+        """
+        self.max_payload_bytes = max_payload_bytes
+        self.keep_payloads = keep_payloads
+        self.sample_rate = sample_rate
+        self.always_sample_errors = always_sample_errors
+        self._sampled = sample_rate >= 1.0 or random.random() < sample_rate
+        self.max_steps = max_steps
+        self.flow: Deque[ExecutionStep] = deque(maxlen=max_steps)
+        # In-flight steps keyed by the LangChain run_id, with their perf_counter start
+        self._pending: Dict[Any, Tuple[ExecutionStep, float]] = {}
+        # Running totals backing get_summary()
+        self._total_duration_ms = 0.0
+        self._names_by_type: Dict[str, List[str]] = {}
+        # Wall-clock anchor for perf_counter readings, so step timestamps can be
+        # derived from one monotonic clock read per callback
+        self._wall_epoch = time.time()
+        self._perf_epoch = time.perf_counter()
+
+    def _get_timestamp(self, perf_now: float) -> float:
+        """Convert a perf_counter reading to wall-clock epoch seconds"""
+        return self._wall_epoch + (perf_now - self._perf_epoch)
+
+    def _capture(self, data: Any) -> Any:
+        """Bound the memory a captured payload can pin for the tracker's lifetime"""
+        if data is None:
+            return None
 
-    def _get_duration(self, key: str) -> Optional[float]:
-        """Calculate duration since start time"""
-        if key in self._start_times:
-            start_time = self._start_times.pop(key)
-            return (datetime.now().timestamp() - start_time) * 1000  # Convert to ms
-        return None
+        size = _estimate_size(data)
+        if not self.keep_payloads:
+            return {"_type": type(data).__name__, "approx_size": size}
+        if size > self.max_payload_bytes:
+            return {
+                "_truncated": True,
+                "preview": _preview_repr.repr(data)[:_PREVIEW_LENGTH],
+                "approx_size": size,
+            }
+        return data
 
-    def _get_step_key(self) -> str:
-        """Generate unique key for tracking step timing"""
-        self._step_counter += 1
-        return f"step_{self._step_counter}"
+    def _start_step(self, step_type: str, name: str, run_id: Any, **fields: Any) -> ExecutionStep:
+        """Record a new in-flight step"""
+        now = time.perf_counter()
+        step = ExecutionStep(
+            step_type=step_type,
+            name=name,
+            timestamp=self._get_timestamp(now),
+            **fields,
+        )
+        self.flow.append(step)
+        self._names_by_type.setdefault(step_type, []).append(name)
+        # Without a run_id (direct calls), fall back to pairing by step type
+        self._pending[run_id if run_id is not None else step_type] = (step, now)
+        return step
+
+    def _end_step(self, step_type: str, run_id: Any) -> Optional[ExecutionStep]:
+        """Close the step started under run_id and record its duration"""
+        entry = self._pending.pop(run_id if run_id is not None else step_type, None)
+        if entry is None:
+            return None
+        step, start = entry
+        step.duration_ms = (time.perf_counter() - start) * 1000.0  # Convert to ms
+        self._total_duration_ms += step.duration_ms
+        return step
+
+    def _error_step(self, step_type: str, name: str) -> Optional[ExecutionStep]:
+        """Record an error whose start was skipped because the execution is unsampled"""
+        if self._sampled or not self.always_sample_errors:
+            return None
+        step = ExecutionStep(
+            step_type=step_type,
+            name=name,
+            timestamp=self._get_timestamp(time.perf_counter()),
+            metadata={"sampled": False},
+        )
+        self.flow.append(step)
+        self._names_by_type.setdefault(step_type, []).append(name)
+        return step
 
     # === Chain/Node Callbacks ===
 
@@ -122,23 +488,17 @@ class ExecutionTracker(BaseCallbackHandler):
         **kwargs: Any
     ) -> None:
         """Called when a chain/node starts"""
+        if not self._sampled:
+            return
+
         name = kwargs.get("name") or serialized.get("name", "unknown_node")
 
         # Skip internal LangGraph nodes
-        if name.startswith("__") or "pregel" in name.lower():
+        if _is_internal_node(name):
             return
 
-        key = self._get_step_key()
-        self._start_times[key] = datetime.now().timestamp()
-
-        step = ExecutionStep(
-            step_type="node",
-            name=name,
-            timestamp=self._get_timestamp(),
-            inputs=inputs,
-        )
-        self.flow.append(step)
-        logger.debug(f"Node started: {name}")
+        self._start_step("node", name, kwargs.get("run_id"), inputs=self._capture(inputs))
+        logger.debug("Node started: %s", name)
 
     def on_chain_end(
         self,
@@ -146,17 +506,10 @@ class ExecutionTracker(BaseCallbackHandler):
         **kwargs: Any
     ) -> None:
         """Called when a chain/node ends"""
-        # Update the last step with outputs and duration
-        if self.flow:
-            last_step = self.flow[-1]
-            if last_step.step_type == "node":
-                last_step.outputs = outputs
-                # Try to get duration if we have a matching start time
-                if self._start_times:
-                    # Pop the most recent start time
-                    key = max(self._start_times.keys(), default=None)
-                    if key:
-                        last_step.duration_ms = self._get_duration(key)
+        # Ends of skipped internal chains have no pending entry and are ignored
+        step = self._end_step("node", kwargs.get("run_id"))
+        if step is not None:
+            step.outputs = self._capture(outputs)
 
     # === Tool Callbacks ===
 
@@ -167,19 +520,13 @@ class ExecutionTracker(BaseCallbackHandler):
         **kwargs: Any
     ) -> None:
         """Called when a tool starts execution"""
+        if not self._sampled:
+            return
+
         name = serialized.get("name", "unknown_tool")
 
-        key = self._get_step_key()
-        self._start_times[key] = datetime.now().timestamp()
-
-        step = ExecutionStep(
-            step_type="tool",
-            name=name,
-            timestamp=self._get_timestamp(),
-            inputs={"input": input_str},
-        )
-        self.flow.append(step)
-        logger.debug(f"Tool started: {name}")
+        self._start_step("tool", name, kwargs.get("run_id"), inputs={"input": self._capture(input_str)})
+        logger.debug("Tool started: %s", name)
 
     def on_tool_end(
         self,
@@ -187,15 +534,9 @@ class ExecutionTracker(BaseCallbackHandler):
         **kwargs: Any
     ) -> None:
         """Called when a tool ends execution"""
-        if self.flow and self.flow[-1].step_type == "tool":
-            last_step = self.flow[-1]
-            last_step.outputs = {"output": output}
-
-            # Get duration
-            if self._start_times:
-                key = max(self._start_times.keys(), default=None)
-                if key:
-                    last_step.duration_ms = self._get_duration(key)
+        step = self._end_step("tool", kwargs.get("run_id"))
+        if step is not None:
+            step.outputs = {"output": self._capture(output)}
 
     def on_tool_error(
         self,
@@ -203,10 +544,12 @@ class ExecutionTracker(BaseCallbackHandler):
         **kwargs: Any
     ) -> None:
         """Called when a tool encounters an error"""
-        if self.flow and self.flow[-1].step_type == "tool":
-            last_step = self.flow[-1]
-            last_step.metadata["error"] = str(error)
-            last_step.metadata["status"] = "failed"
+        step = self._end_step("tool", kwargs.get("run_id"))
+        if step is None:
+            step = self._error_step("tool", "unknown_tool")
+        if step is not None:
+            step.metadata["error"] = str(error)
+            step.metadata["status"] = "failed"
 
     # === LLM Callbacks ===
 
@@ -217,22 +560,21 @@ class ExecutionTracker(BaseCallbackHandler):
         **kwargs: Any
     ) -> None:
         """Called when an LLM starts generation"""
+        if not self._sampled:
+            return
+
         invocation_params = kwargs.get("invocation_params", {})
         # Try both OpenAI (model_name) and Anthropic (model) formats
         model_name = invocation_params.get("model_name") or invocation_params.get("model") or "unknown_model"
 
-        key = self._get_step_key()
-        self._start_times[key] = datetime.now().timestamp()
-
-        step = ExecutionStep(
-            step_type="llm",
-            name=model_name,
-            timestamp=self._get_timestamp(),
+        self._start_step(
+            "llm",
+            model_name,
+            kwargs.get("run_id"),
             inputs={"prompt_count": len(prompts)},
-            metadata={"model": model_name}
+            metadata={"model": model_name},
         )
-        self.flow.append(step)
-        logger.debug(f"LLM started: {model_name}")
+        logger.debug("LLM started: %s", model_name)
 
     def on_llm_end(
         self,
@@ -240,19 +582,13 @@ class ExecutionTracker(BaseCallbackHandler):
         **kwargs: Any
     ) -> None:
         """Called when an LLM finishes generation"""
-        if self.flow and self.flow[-1].step_type == "llm":
-            last_step = self.flow[-1]
-
+        step = self._end_step("llm", kwargs.get("run_id"))
+        if step is not None:
             # Extract token usage if available
-            if hasattr(response, "llm_output") and response.llm_output:
-                token_usage = response.llm_output.get("token_usage", {})
-                last_step.metadata["tokens"] = token_usage
-
-            # Get duration
-            if self._start_times:
-                key = max(self._start_times.keys(), default=None)
-                if key:
-                    last_step.duration_ms = self._get_duration(key)
+            llm_output = getattr(response, "llm_output", None)
+            if llm_output:
+                token_usage = llm_output.get("token_usage", {})
+                step.metadata["tokens"] = token_usage
 
     def on_llm_error(
         self,
@@ -260,10 +596,12 @@ class ExecutionTracker(BaseCallbackHandler):
         **kwargs: Any
     ) -> None:
         """Called when an LLM encounters an error"""
-        if self.flow and self.flow[-1].step_type == "llm":
-            last_step = self.flow[-1]
-            last_step.metadata["error"] = str(error)
-            last_step.metadata["status"] = "failed"
+        step = self._end_step("llm", kwargs.get("run_id"))
+        if step is None:
+            step = self._error_step("llm", "unknown_model")
+        if step is not None:
+            step.metadata["error"] = str(error)
+            step.metadata["status"] = "failed"
 
     # === Retrieval Methods ===
 
@@ -271,31 +609,31 @@ class ExecutionTracker(BaseCallbackHandler):
         """Get the execution trace as a list of dictionaries"""
         return [step.to_dict() for step in self.flow]
 
-    def get_summary(self) -> Dict[str, Any]:
-        """Get a summary of the execution"""
-        total_duration = sum(
-            step.duration_ms for step in self.flow
-            if step.duration_ms is not None
-        )
-
-        step_counts = {}
-        for step in self.flow:
-            step_counts[step.step_type] = step_counts.get(step.step_type, 0) + 1
+    def get_trace_bytes(self) -> bytes:
+        """Get the execution trace serialized as JSON bytes in a single pass"""
+        return _dumps(self.get_trace())
 
+    def get_summary(self) -> Dict[str, Any]:
+        """Get a summary of the execution (from running totals, no pass over the flow)"""
+        step_counts = {step_type: len(names) for step_type, names in self._names_by_type.items()}
         return {
-            "total_steps": len(self.flow),
-            "total_duration_ms": total_duration,
+            "total_steps": sum(step_counts.values()),
+            "total_duration_ms": self._total_duration_ms,
             "step_counts": step_counts,
-            "nodes": [s.name for s in self.flow if s.step_type == "node"],
-            "tools": [s.name for s in self.flow if s.step_type == "tool"],
-            "llms": [s.name for s in self.flow if s.step_type == "llm"],
+            "nodes": list(self._names_by_type.get("node", ())),
+            "tools": list(self._names_by_type.get("tool", ())),
+            "llms": list(self._names_by_type.get("llm", ())),
         }
 
     def clear(self):
-        """Clear the execution trace"""
-        self.flow = []
-        self._start_times = {}
-        self._step_counter = 0
+        """Clear the execution trace (the tracker can then be reused)"""
+        self.flow = deque(maxlen=self.max_steps)
+        self._pending = {}
+        self._total_duration_ms = 0.0
+        self._names_by_type = {}
+        self._wall_epoch = time.time()
+        self._perf_epoch = time.perf_counter()
+        self._sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
 
     # === Performance Tracking (v0.5.0) ===
 
@@ -326,13 +664,16 @@ class ExecutionTracker(BaseCallbackHandler):
         Returns:
             Dict with calculated performance scores
         """
-        from backend.repositories.performance_repository import PerformanceRepository
-        from backend.core.database import get_session_maker
         from backend.core.performance_evaluator import PerformanceEvaluator
 
         # Phase 2: Use LLM-based quality evaluation
         evaluator = PerformanceEvaluator()
 
+        # Bucket the metrics so repeated runs share cached efficiency scores
+        metrics = task_metadata.get("execution_metrics", {})
+        tokens = round(metrics.get("total_tokens", 100), -1)
+        duration = round(metrics.get("duration_seconds", 1.0), 1)
+
         try:
             # Evaluate task output quality
             quality_scores = await evaluator.evaluate_task(
@@ -343,7 +684,7 @@ class ExecutionTracker(BaseCallbackHandler):
             )
 
             # Calculate efficiency score
-            efficiency_score = self._calculate_efficiency(task_metadata)
+            efficiency_score = _calculate_efficiency(tokens, duration)
 
             # Combine scores (quality + efficiency)
             scores = quality_scores.to_dict()
@@ -359,7 +700,7 @@ class ExecutionTracker(BaseCallbackHandler):
         except Exception as e:
             logger.error(f"Quality evaluation failed: {e}", exc_info=True)
             # Fallback to basic efficiency scoring
-            efficiency_score = self._calculate_efficiency(task_metadata)
+            efficiency_score = _calculate_efficiency(tokens, duration)
             scores = {
                 "efficiency_score": efficiency_score,
                 "overall_score": efficiency_score,
@@ -383,21 +724,8 @@ class ExecutionTracker(BaseCallbackHandler):
                 metadata["estimated_cost"] / scores["overall_score"]
             )
 
-        # Save to database
-        try:
-            session_maker = get_session_maker()
-            async with session_maker() as session:
-                repo = PerformanceRepository(session)
-                await repo.save_performance_score(
-                    task_id=task_id,
-                    agent_id=agent_id,
-                    scores=scores,
-                    metadata=metadata
-                )
-                await session.commit()
-                logger.info(f"Performance score saved for task {task_id}: {scores['overall_score']:.2f}")
-        except Exception as e:
-            logger.error(f"Failed to save performance score: {e}", exc_info=True)
+        # Save to database in the background; the writer batches and commits
+        enqueue_performance_score(task_id, agent_id, scores, metadata)
 
         # Phase 2: Trigger peer evaluation (background)
         if run_peer_eval:
@@ -420,36 +748,3 @@ class ExecutionTracker(BaseCallbackHandler):
                 logger.error(f"Failed to start peer evaluation: {e}", exc_info=True)
 
         return scores
-
-    def _calculate_efficiency(self, task_metadata: Dict[str, Any]) -> float:
-        """
-        Calculate efficiency score (0-1 scale)
-
-        Efficiency = quality / cost ratio
-        For Phase 1, we'll use: inverse of (tokens * duration)
-        Lower tokens + faster = higher efficiency
-
-        Args:
-            task_metadata: Task metadata with execution metrics
-
-        Returns:
-            Efficiency score (0-1)
-        """
-        metrics = task_metadata.get("execution_metrics", {})
-
-        tokens = metrics.get("total_tokens", 100)
-        duration = metrics.get("duration_seconds", 1.0)
-
-        # Normalize: assume 1000 tokens in 10 seconds is "baseline" (score = 0.5)
-        baseline = 1000 * 10
-
-        # Calculate score (lower is better, so invert)
-        actual = tokens * duration
-        if actual == 0:
-            return 1.0
-
-        # Normalize to 0-1 scale
-        efficiency = baseline / actual
-        efficiency = min(max(efficiency, 0.0), 1.0)  # Clamp to 0-1
-
-        return round(efficiency, 2)
@@ -0,0 +1,42 @@
+"""
+Shared HTTP Client
+Provides a single pooled httpx.AsyncClient reused across agent executions
+"""
+
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Global pooled client
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get or create the shared async HTTP client
+
+    Reusing one client keeps connections alive between tasks so outbound
+    calls skip repeated TCP/TLS handshakes.
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(30.0),
+        )
+        logger.info("Shared HTTP client created")
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (call on shutdown)"""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("Shared HTTP client closed")
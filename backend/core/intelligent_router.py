@@ -17,19 +17,26 @@ All decisions are logged for transparency and future NLP analysis.
 **Cost**: Free (no LLM calls, pure algorithm)
 """
 
+import asyncio
+import heapq
+import json
 import logging
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Any, Optional, List, Tuple
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
+from operator import attrgetter
 from uuid import UUID, uuid4
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, insert, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.repositories.performance_repository import (
     AgentPerformanceStatsModel,
     AgentPerformanceScoreModel,
     PerformanceRepository,
+    RoutingDecisionModel,
 )
 from backend.core.category_classifier import TaskCategory
 from backend.core.database import get_session_maker
@@ -37,7 +44,7 @@ from backend.core.database import get_session_maker
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentScore:
     """Score for an agent candidate"""
     agent_id: str
@@ -61,6 +68,34 @@ class RoutingDecision:
     constraints: Dict[str, Any]
 
 
+# Short-lived cache of decisions keyed by (category, constraints); stats only
+# change when the aggregation job runs, so repeats within the TTL are identical
+ROUTING_CACHE_TTL_SECONDS = 60.0
+ROUTING_CACHE_SIZE = 256
+_routing_cache: "OrderedDict[Tuple, Tuple[float, RoutingDecision]]" = OrderedDict()
+_routing_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _routing_cache_key(category: TaskCategory, constraints: Dict[str, Any]) -> Optional[Tuple]:
+    """Cache key for a routing request, or None if constraints are unhashable"""
+    try:
+        key = (category.value, tuple(sorted(constraints.items())))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def invalidate_routing_cache() -> None:
+    """Drop cached routing decisions (call after agent stats change)"""
+    _routing_cache.clear()
+
+
+def get_routing_cache_stats() -> Dict[str, int]:
+    """Get routing cache hit/miss counters and current size"""
+    return {**_routing_cache_stats, "size": len(_routing_cache)}
+
+
 class IntelligentRouter:
     """
     Select optimal agent based on performance history
@@ -98,8 +133,12 @@ class IntelligentRouter:
     # Minimum tasks required before trusting stats (probation period)
     MIN_TASKS_FOR_TRUST = 5
 
+    # Decisions retained in the in-memory routing log
+    ROUTING_LOG_SIZE = 1000
+
     def __init__(self):
-        self.routing_log: List[RoutingDecision] = []
+        # Most recent decisions only; older entries are evicted
+        self.routing_log: Deque[RoutingDecision] = deque(maxlen=self.ROUTING_LOG_SIZE)
 
     async def select_agent(
         self,
@@ -129,6 +168,17 @@ class IntelligentRouter:
             # Fallback: return default agent for category
             return self._fallback_selection(category, constraints)
 
+        # Reuse a recent decision for the same category + constraints
+        cache_key = _routing_cache_key(category, constraints)
+        cached = _routing_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None and cached[0] > time.monotonic():
+            _routing_cache_stats["hits"] += 1
+            decision = replace(cached[1], timestamp=datetime.utcnow(), constraints=constraints)
+            self.routing_log.append(decision)
+            logger.info(f"Selected: {decision.selected_nickname} (cached)")
+            return decision
+        _routing_cache_stats["misses"] += 1
+
         # Score each agent
         session_maker = get_session_maker()
         async with session_maker() as session:
@@ -141,7 +191,7 @@ class IntelligentRouter:
 
         # Select best agent
         if scores:
-            best_score = max(scores, key=lambda x: x.final_score)
+            best_score = max(scores, key=attrgetter("final_score"))
             selected_agent_id = best_score.agent_id
             selected_nickname = best_score.nickname
             reason = self._explain_selection(best_score, scores)
@@ -163,10 +213,17 @@ class IntelligentRouter:
             constraints=constraints
         )
 
+        if cache_key is not None:
+            _routing_cache[cache_key] = (time.monotonic() + ROUTING_CACHE_TTL_SECONDS, decision)
+            _routing_cache.move_to_end(cache_key)
+            if len(_routing_cache) > ROUTING_CACHE_SIZE:
+                _routing_cache.popitem(last=False)
+
         # Log decision (for transparency / future NLP)
         self.routing_log.append(decision)
-        logger.info(f"Selected: {selected_nickname} (score: {best_score.final_score:.2f if scores else 'N/A'})")
-        logger.info(f"Reason: {reason}")
+        score_str = f"{best_score.final_score:.2f}" if scores else "N/A"
+        logger.info("Selected: %s (score: %s)", selected_nickname, score_str)
+        logger.info("Reason: %s", reason)
 
         return decision
 
@@ -177,20 +234,7 @@ class IntelligentRouter:
         Returns:
             List of agent_ids, ordered by default specialization
         """
-        capable = []
-
-        for agent_id, specializations in self.AGENT_SPECIALIZATIONS.items():
-            if category.value in specializations:
-                capable.append(agent_id)
-
-        # If no specialists, return all agents (except chat for non-chat tasks)
-        if not capable and category != TaskCategory.CHAT:
-            capable = [
-                aid for aid in self.AGENT_SPECIALIZATIONS.keys()
-                if aid != "agent_g"  # Exclude chat agent
-            ]
-
-        return capable
+        return list(_CAPABLE_BY_CATEGORY[_CATEGORY_POSITION[category]])
 
     async def _score_agents(
         self,
@@ -209,46 +253,58 @@ class IntelligentRouter:
 
         Final score = (base_score × success_rate) × (1 - load_penalty)
         """
-        scores = []
-
-        for agent_id in capable_agents:
-            nickname = self.AGENT_NICKNAMES[agent_id]
-
-            # Get agent's performance stats
-            stats = await self._get_agent_stats(session, agent_id)
+        # Fetch all candidates' stats and load in batched round trips
+        stats_by_id = await self._get_agents_stats(session, capable_agents)
+        load_by_id = await self._get_load_penalties(session, capable_agents)
+
+        # Scoring itself is pure computation (order of capable_agents is preserved)
+        results = [
+            self._score_one(
+                agent_id, stats_by_id.get(agent_id), load_by_id.get(agent_id, 0.0), category, constraints
+            )
+            for agent_id in capable_agents
+        ]
 
-            if not stats or stats.total_tasks < self.MIN_TASKS_FOR_TRUST:
-                # Not enough data, skip (will use fallback)
-                continue
+        return [score for score in results if score is not None]
 
-            # Get category-specific performance
-            base_score = self._get_category_score(stats, category)
+    def _score_one(
+        self,
+        agent_id: str,
+        stats: Optional[AgentPerformanceStatsModel],
+        load_penalty: float,
+        category: TaskCategory,
+        constraints: Dict[str, Any]
+    ) -> Optional[AgentScore]:
+        """Score a single candidate, or None if it has too little data or fails constraints"""
+        nickname = self.AGENT_NICKNAMES[agent_id]
 
-            # Calculate success rate
-            success_rate = stats.successful_tasks / stats.total_tasks if stats.total_tasks > 0 else 0.0
+        if not stats or stats.total_tasks < self.MIN_TASKS_FOR_TRUST:
+            # Not enough data, skip (will use fallback)
+            return None
 
-            # Get current load
-            load_penalty = await self._get_load_penalty(session, agent_id)
+        # Get category-specific performance
+        base_score = self._get_category_score(stats, category)
 
-            # Check constraints
-            if not self._meets_constraints(stats, constraints):
-                # Agent doesn't meet constraints, skip
-                continue
+        # Calculate success rate
+        success_rate = stats.successful_tasks / stats.total_tasks if stats.total_tasks > 0 else 0.0
 
-            # Calculate final score
-            final_score = (base_score * success_rate) * (1 - load_penalty)
+        # Check constraints
+        if not self._meets_constraints(stats, constraints):
+            # Agent doesn't meet constraints, skip
+            return None
 
-            scores.append(AgentScore(
-                agent_id=agent_id,
-                nickname=nickname,
-                base_score=base_score,
-                success_rate=success_rate,
-                load_penalty=load_penalty,
-                final_score=final_score,
-                reason=f"{nickname}: {base_score:.2f} perf × {success_rate:.2f} success × {1-load_penalty:.2f} availability"
-            ))
+        # Calculate final score
+        final_score = (base_score * success_rate) * (1 - load_penalty)
 
-        return scores
+        return AgentScore(
+            agent_id=agent_id,
+            nickname=nickname,
+            base_score=base_score,
+            success_rate=success_rate,
+            load_penalty=load_penalty,
+            final_score=final_score,
+            reason=f"{nickname}: {base_score:.2f} perf × {success_rate:.2f} success × {1-load_penalty:.2f} availability"
+        )
 
     async def _get_agent_stats(
         self,
@@ -262,6 +318,18 @@ class IntelligentRouter:
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def _get_agents_stats(
+        self,
+        session: AsyncSession,
+        agent_ids: List[str]
+    ) -> Dict[str, AgentPerformanceStatsModel]:
+        """Get aggregated stats for several agents with a single IN query"""
+        stmt = select(AgentPerformanceStatsModel).where(
+            AgentPerformanceStatsModel.agent_id.in_(agent_ids)
+        )
+        result = await session.execute(stmt)
+        return {stats.agent_id: stats for stats in result.scalars().all()}
+
     def _get_category_score(
         self,
         stats: AgentPerformanceStatsModel,
@@ -284,21 +352,21 @@ class IntelligentRouter:
         # Category not found, use overall score
         return float(stats.avg_overall_score) if stats.avg_overall_score else 0.5
 
-    async def _get_load_penalty(
+    async def _get_load_penalties(
         self,
         session: AsyncSession,
-        agent_id: str
-    ) -> float:
+        agent_ids: List[str]
+    ) -> Dict[str, float]:
         """
-        Calculate load penalty based on active tasks
+        Calculate load penalties for several agents based on active tasks
 
         Returns:
-            0.0 = no load, 0.5 = moderate load, 0.8 = heavy load
+            agent_id -> 0.0 = no load, 0.5 = moderate load, 0.8 = heavy load
         """
-        # TODO: Query active tasks from agent_tasks table
+        # TODO: Query active tasks from agent_tasks table (one grouped query)
         # For now, return 0.0 (no load penalty)
         # Phase 3 enhancement: track active tasks
-        return 0.0
+        return {agent_id: 0.0 for agent_id in agent_ids}
 
     def _meets_constraints(
         self,
@@ -325,13 +393,13 @@ class IntelligentRouter:
         if len(all_scores) == 1:
             return f"{best.nickname} is the only agent with sufficient experience in this category"
 
-        # Sort by score
-        sorted_scores = sorted(all_scores, key=lambda x: x.final_score, reverse=True)
+        # Only the top two are needed (same tie order as a full descending sort)
+        top_two = heapq.nlargest(2, all_scores, key=attrgetter("final_score"))
 
         explanation = f"{best.nickname} selected with score {best.final_score:.2f}. "
 
-        if len(sorted_scores) > 1:
-            runner_up = sorted_scores[1]
+        if len(top_two) > 1:
+            runner_up = top_two[1]
             diff = best.final_score - runner_up.final_score
             explanation += f"Runner-up: {runner_up.nickname} ({runner_up.final_score:.2f}, -{diff:.2f}). "
 
@@ -349,18 +417,9 @@ class IntelligentRouter:
 
         Uses default specializations
         """
-        # Map category to default agent
-        default_agents = {
-            TaskCategory.RESEARCH: "agent_a",  # Bob
-            TaskCategory.ANALYSIS: "agent_c",  # Rex
-            TaskCategory.WRITING: "agent_f",   # Alice
-            TaskCategory.COMPLIANCE: "agent_b", # Sue
-            TaskCategory.PLANNING: "agent_d",  # Kai
-            TaskCategory.CHAT: "agent_g",      # Chat
-        }
-
-        agent_id = default_agents.get(category, "agent_a")
-        nickname = self.AGENT_NICKNAMES[agent_id]
+        position = _CATEGORY_POSITION[category]
+        agent_id = _DEFAULT_AGENT_BY_CATEGORY[position]
+        nickname = _DEFAULT_NICKNAME_BY_CATEGORY[position]
 
         return RoutingDecision(
             selected_agent_id=agent_id,
@@ -383,31 +442,210 @@ class IntelligentRouter:
 
         Stores decision log for future NLP analysis and routing optimization
         """
+        logger.info(
+            f"Routing decision for task {task_id}: "
+            f"{decision.selected_nickname} (category: {decision.task_category.value})"
+        )
+        logger.info(f"Reason: {decision.reason}")
+
+        # Persisted in batches by the background writer
+        enqueue_routing_decision(decision, task_id, command)
+
+
+def _build_capable_agents(specializations: Dict[str, List[str]]) -> Tuple[Tuple[str, ...], ...]:
+    """
+    Capable agents for every category, indexed by _CATEGORY_POSITION
+
+    Specialists keep their declaration order; categories without specialists
+    fall back to all agents except chat (chat itself gets none).
+    """
+    non_chat_agents = tuple(
+        aid for aid in specializations
+        if aid != "agent_g"  # Exclude chat agent
+    )
+    table = []
+    for category in TaskCategory:
+        specialists = tuple(
+            aid for aid, categories in specializations.items()
+            if category.value in categories
+        )
+        if not specialists and category != TaskCategory.CHAT:
+            specialists = non_chat_agents
+        table.append(specialists)
+    return tuple(table)
+
+
+# Routing tables precomputed once at import, indexed by category position
+_CATEGORY_POSITION = {category: position for position, category in enumerate(TaskCategory)}
+_CAPABLE_BY_CATEGORY = _build_capable_agents(IntelligentRouter.AGENT_SPECIALIZATIONS)
+
+# Map category to default agent (used when no performance data exists)
+_DEFAULT_AGENTS = {
+    TaskCategory.RESEARCH: "agent_a",  # Bob
+    TaskCategory.ANALYSIS: "agent_c",  # Rex
+    TaskCategory.WRITING: "agent_f",   # Alice
+    TaskCategory.COMPLIANCE: "agent_b", # Sue
+    TaskCategory.PLANNING: "agent_d",  # Kai
+    TaskCategory.CHAT: "agent_g",      # Chat
+}
+_DEFAULT_AGENT_BY_CATEGORY = tuple(
+    _DEFAULT_AGENTS.get(category, "agent_a") for category in TaskCategory
+)
+_DEFAULT_NICKNAME_BY_CATEGORY = tuple(
+    IntelligentRouter.AGENT_NICKNAMES[agent_id] for agent_id in _DEFAULT_AGENT_BY_CATEGORY
+)
+
+
+# === Background routing decision writer ===
+
+ROUTING_WRITE_BATCH_SIZE = 500
+ROUTING_WRITE_INTERVAL_SECONDS = 5.0  # How long a batch waits for more decisions before writing
+
+ROUTING_DECISION_COLUMNS = (
+    "task_id",
+    "command",
+    "category",
+    "selected_agent_id",
+    "all_scores",
+    "reason",
+    "constraints",
+    "created_at",
+)
+
+_routing_queue: Optional[asyncio.Queue] = None
+_routing_writer: Optional[asyncio.Task] = None
+
+
+_ROUTING_JSONB_COLUMNS = frozenset({"all_scores", "constraints"})
+
+
+def _routing_record(decision: RoutingDecision, task_id: UUID, command: str) -> Tuple:
+    """Row for routing_decisions, ordered as ROUTING_DECISION_COLUMNS (JSONB as native values)"""
+    return (
+        task_id,
+        command,
+        decision.task_category.value,
+        decision.selected_agent_id,
+        [asdict(score) for score in decision.all_scores],
+        decision.reason,
+        decision.constraints,
+        decision.timestamp,
+    )
+
+
+def _copy_row(record: Tuple) -> Tuple:
+    """COPY row for a queued record (asyncpg takes JSONB as text)"""
+    return tuple(
+        json.dumps(value, default=str) if column in _ROUTING_JSONB_COLUMNS else value
+        for column, value in zip(ROUTING_DECISION_COLUMNS, record)
+    )
+
+
+def enqueue_routing_decision(decision: RoutingDecision, task_id: UUID, command: str) -> None:
+    """
+    Queue a routing decision for persistence without waiting on the database
+
+    A single writer task (started on first use, per event loop) drains the
+    queue and COPYs each batch into routing_decisions.
+    """
+    global _routing_queue, _routing_writer
+
+    loop = asyncio.get_running_loop()
+    if _routing_writer is None or _routing_writer.done() or _routing_writer.get_loop() is not loop:
+        _routing_queue = asyncio.Queue()
+        _routing_writer = loop.create_task(_drain_routing_queue(_routing_queue))
+
+    _routing_queue.put_nowait(_routing_record(decision, task_id, command))
+
+
+async def _drain_routing_queue(queue: asyncio.Queue) -> None:
+    """Consume queued decisions forever, coalescing arrivals into batched writes"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + ROUTING_WRITE_INTERVAL_SECONDS
+        while len(batch) < ROUTING_WRITE_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            await _write_routing_decisions(batch)
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+async def _write_routing_decisions(records: List[Tuple]) -> None:
+    """
+    Persist a batch of routing decisions
+
+    Uses asyncpg's COPY (copy_records_to_table) for multi-row batches; single
+    rows, or drivers without COPY support, fall back to a plain INSERT.
+    """
+    try:
         session_maker = get_session_maker()
+        async with session_maker() as session:
+            connection = await session.connection()
+            raw = await connection.get_raw_connection()
+            driver_connection = raw.driver_connection
+
+            if len(records) > 1 and hasattr(driver_connection, "copy_records_to_table"):
+                await driver_connection.copy_records_to_table(
+                    RoutingDecisionModel.__tablename__,
+                    records=[_copy_row(record) for record in records],
+                    columns=ROUTING_DECISION_COLUMNS,
+                )
+            else:
+                await session.execute(
+                    insert(RoutingDecisionModel).values([
+                        dict(zip(ROUTING_DECISION_COLUMNS, record)) for record in records
+                    ])
+                )
+            await session.commit()
+        logger.debug(f"Saved {len(records)} routing decision(s)")
+    except Exception as e:
+        logger.error(f"Failed to save {len(records)} routing decision(s): {e}", exc_info=True)
+
+
+async def shutdown_routing_writer(timeout: float = 10.0) -> None:
+    """
+    Flush queued routing decisions and stop the writer task
+
+    Should be called during application lifecycle shutdown.
+    """
+    global _routing_queue, _routing_writer
+
+    if _routing_writer is None:
+        return
+
+    try:
+        await asyncio.wait_for(_routing_queue.join(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Dropped {_routing_queue.qsize()} unsaved routing decision(s) on shutdown")
 
+    _routing_writer.cancel()
+    try:
+        await _routing_writer
+    except asyncio.CancelledError:
+        pass
+    _routing_queue = None
+    _routing_writer = None
+
+
+async def warmup() -> None:
+    """Open a pooled database connection ahead of the first routing call"""
+    try:
+        session_maker = get_session_maker()
         async with session_maker() as session:
-            # TODO: Create routing_decisions table to store this
-            # For now, just log it
-            logger.info(
-                f"Routing decision for task {task_id}: "
-                f"{decision.selected_nickname} (category: {decision.task_category.value})"
-            )
-            logger.info(f"Reason: {decision.reason}")
-
-            # Future: Insert into routing_decisions table
-            # routing_decision = RoutingDecisionModel(
-            #     id=str(uuid4()),
-            #     task_id=str(task_id),
-            #     command=command,
-            #     category=decision.task_category.value,
-            #     selected_agent_id=decision.selected_agent_id,
-            #     all_scores=decision.all_scores,
-            #     reason=decision.reason,
-            #     constraints=decision.constraints,
-            #     created_at=decision.timestamp
-            # )
-            # session.add(routing_decision)
-            # await session.commit()
+            await session.execute(text("SELECT 1"))
+        logger.info("Router database connection warmed up")
+    except Exception as e:
+        logger.warning(f"Router warmup failed: {e}")
 
 
 # Convenience function
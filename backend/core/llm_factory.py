@@ -3,84 +3,60 @@ LLM Factory for creating provider-agnostic LLM instances
 Supports OpenAI, Anthropic, and future providers
 """
 
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
+import httpx
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 
 from backend.core.config import get_settings
+from backend.core.http_client import get_http_client
 
 settings = get_settings()
 
 
-@dataclass
+@dataclass(frozen=True)
 class ModelConfig:
-    """Configuration for an LLM model"""
+    """Configuration for an LLM model (immutable, so configs can be shared safely)"""
 
     provider: str  # 'openai', 'anthropic', 'huggingface'
     model_name: str
     temperature: float = 0.7
     max_tokens: int = 2000
-    model_params: dict[str, Any] | None = None
+    model_params: Mapping[str, Any] | None = field(default=None, hash=False)
 
     def __post_init__(self):
-        if self.model_params is None:
-            self.model_params = {}
+        # Read-only copy: callers can't mutate a config another agent is using
+        object.__setattr__(self, "model_params", MappingProxyType(dict(self.model_params or {})))
 
 
+# Default model configuration shared by all 8 agents
+_DEFAULT_CONFIG = ModelConfig(
+    provider="openai",
+    model_name="gpt-4o-mini",
+    temperature=0.7,
+    max_tokens=2000,
+)
+
 # Default model configurations for all 8 agents
 # These are used as fallbacks if no database config exists
-DEFAULT_CONFIGS = {
-    "parent": ModelConfig(
-        provider="openai",
-        model_name="gpt-4o-mini",
-        temperature=0.7,
-        max_tokens=2000,
-    ),
-    "agent_a": ModelConfig(
-        provider="openai",
-        model_name="gpt-4o-mini",
-        temperature=0.7,
-        max_tokens=2000,
-    ),
-    "agent_b": ModelConfig(
-        provider="openai",
-        model_name="gpt-4o-mini",
-        temperature=0.7,
-        max_tokens=2000,
-    ),
-    "agent_c": ModelConfig(
-        provider="openai",
-        model_name="gpt-4o-mini",
-        temperature=0.7,
-        max_tokens=2000,
-    ),
-    "agent_d": ModelConfig(
-        provider="openai",
-        model_name="gpt-4o-mini",
-        temperature=0.7,
-        max_tokens=2000,
-    ),
-    "agent_e": ModelConfig(
-        provider="openai",
-        model_name="gpt-4o-mini",
-        temperature=0.7,
-        max_tokens=2000,
-    ),
-    "agent_f": ModelConfig(
-        provider="openai",
-        model_name="gpt-4o-mini",
-        temperature=0.7,
-        max_tokens=2000,
-    ),
-    "agent_g": ModelConfig(
-        provider="openai",
-        model_name="gpt-4o-mini",
-        temperature=0.7,
-        max_tokens=2000,
-    ),
-}
+DEFAULT_CONFIGS: Mapping[str, ModelConfig] = MappingProxyType({
+    agent_id: _DEFAULT_CONFIG
+    for agent_id in (
+        "parent",
+        "agent_a",
+        "agent_b",
+        "agent_c",
+        "agent_d",
+        "agent_e",
+        "agent_f",
+        "agent_g",
+    )
+})
 
 
 def create_llm(
@@ -112,32 +88,82 @@ def create_llm(
     # Merge config params with kwargs (kwargs take precedence)
     merged_params = {**(config.model_params or {}), **kwargs}
 
-    if config.provider == "openai":
+    # OpenAI calls go through the shared pooled HTTP client; it is part of the
+    # cache key so a recreated client never leaves models holding a closed one
+    http_client = get_http_client() if config.provider == "openai" else None
+
+    # Identical requests share one client (and its connection pool)
+    try:
+        params_key = tuple(sorted(merged_params.items()))
+        hash(params_key)
+    except TypeError:
+        # Unhashable params (e.g. callback lists) can't be cached
+        return _build_llm.__wrapped__(
+            config.provider,
+            config.model_name,
+            effective_temperature,
+            effective_max_tokens,
+            streaming,
+            tuple(merged_params.items()),
+            http_client,
+        )
+
+    return _build_llm(
+        config.provider,
+        config.model_name,
+        effective_temperature,
+        effective_max_tokens,
+        streaming,
+        params_key,
+        http_client,
+    )
+
+
+@lru_cache(maxsize=64)
+def _build_llm(
+    provider: str,
+    model_name: str,
+    temperature: float,
+    max_tokens: int,
+    streaming: bool,
+    params: tuple[tuple[str, Any], ...],
+    http_client: httpx.AsyncClient | None = None,
+) -> ChatOpenAI | ChatAnthropic:
+    """
+    Instantiate the provider's chat model (memoized by create_llm)
+
+    Chat models are safe to share across coroutines: they hold no
+    per-request state, and their httpx pools handle concurrent requests.
+    """
+    if provider == "openai":
+        openai_params = dict(params)
+        if http_client is not None:
+            openai_params.setdefault("http_async_client", http_client)
         return ChatOpenAI(
-            model=config.model_name,
-            temperature=effective_temperature,
-            max_tokens=effective_max_tokens,
+            model=model_name,
+            temperature=temperature,
+            max_tokens=max_tokens,
             api_key=settings.openai_api_key,
             streaming=streaming,
-            **merged_params
+            **openai_params
         )
 
-    elif config.provider == "anthropic":
+    elif provider == "anthropic":
         return ChatAnthropic(
-            model=config.model_name,
-            temperature=effective_temperature,
-            max_tokens=effective_max_tokens,
+            model=model_name,
+            temperature=temperature,
+            max_tokens=max_tokens,
             anthropic_api_key=settings.anthropic_api_key,
             streaming=streaming,
-            **merged_params
+            **dict(params)
         )
 
-    elif config.provider == "huggingface":
+    elif provider == "huggingface":
         # Future implementation for HuggingFace models
         raise NotImplementedError("HuggingFace provider is not yet implemented")
 
     else:
-        raise ValueError(f"Unsupported LLM provider: {config.provider}")
+        raise ValueError(f"Unsupported LLM provider: {provider}")
 
 
 def get_default_config(agent_id: str) -> ModelConfig:
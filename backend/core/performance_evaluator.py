@@ -10,11 +10,18 @@ Uses GPT-4o to evaluate task outputs on multiple quality dimensions:
 This provides objective quality metrics for agent optimization.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Dict, Any, Optional
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
 from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI
 from langchain_core.messages import HumanMessage
 
 from backend.core.config import get_settings
@@ -42,6 +49,172 @@ class PerformanceScores:
         }
 
 
+# Evaluation prompts (str.format templates with {query} / {output})
+
+_ALL_DIMENSIONS_PROMPT = """You are an expert evaluator assessing AI agent responses.
+
+Original Query: {query}
+
+Agent Response: {output}
+
+Evaluate this response on four dimensions, each on a 0.0-1.0 scale
+(1.0 = excellent, 0.8 = minor issues, 0.6 = partial, 0.4 = significant problems, 0.2 = very poor):
+- accuracy: Factual correctness, logical consistency, absence of hallucinations
+- relevance: Does it answer what was asked and stay on-topic?
+- completeness: Are all parts of the query addressed with sufficient detail?
+- clarity: Organization, writing quality, ease of understanding, use of formatting
+
+Respond with ONLY a JSON object, e.g.
+{{"accuracy": 0.85, "relevance": 0.90, "completeness": 0.75, "clarity": 0.80}}"""
+
+_ACCURACY_PROMPT = """You are an expert evaluator assessing the accuracy of AI agent responses.
+
+Original Query: {query}
+
+Agent Response: {output}
+
+Evaluate the ACCURACY of this response on a 0.0-1.0 scale:
+- 1.0 = Perfectly accurate, all facts correct
+- 0.8 = Mostly accurate, minor errors
+- 0.6 = Partially accurate, some errors
+- 0.4 = Mostly inaccurate, significant errors
+- 0.2 = Completely inaccurate or wrong
+
+Consider:
+- Factual correctness
+- Logical consistency
+- Absence of hallucinations
+
+Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.85")"""
+
+_RELEVANCE_PROMPT = """You are an expert evaluator assessing the relevance of AI agent responses.
+
+Original Query: {query}
+
+Agent Response: {output}
+
+Evaluate the RELEVANCE of this response on a 0.0-1.0 scale:
+- 1.0 = Perfectly relevant, directly addresses the query
+- 0.8 = Mostly relevant, minor tangents
+- 0.6 = Partially relevant, some off-topic content
+- 0.4 = Mostly irrelevant, significant off-topic content
+- 0.2 = Completely irrelevant or unrelated
+
+Consider:
+- Does it answer what was asked?
+- Is the information useful for the query?
+- Does it stay on-topic?
+
+Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.90")"""
+
+_COMPLETENESS_PROMPT = """You are an expert evaluator assessing the completeness of AI agent responses.
+
+Original Query: {query}
+
+Agent Response: {output}
+
+Evaluate the COMPLETENESS of this response on a 0.0-1.0 scale:
+- 1.0 = Fully complete, all aspects covered
+- 0.8 = Mostly complete, minor gaps
+- 0.6 = Partially complete, some aspects missing
+- 0.4 = Mostly incomplete, significant gaps
+- 0.2 = Very incomplete, barely addressed the query
+
+Consider:
+- Are all parts of the query addressed?
+- Is sufficient detail provided?
+- Are there obvious gaps?
+
+Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.75")"""
+
+_CLARITY_PROMPT = """You are an expert evaluator assessing the clarity of AI agent responses.
+
+Agent Response: {output}
+
+Evaluate the CLARITY of this response on a 0.0-1.0 scale:
+- 1.0 = Perfectly clear, well-structured, easy to understand
+- 0.8 = Mostly clear, minor organization issues
+- 0.6 = Partially clear, some confusion
+- 0.4 = Mostly unclear, hard to follow
+- 0.2 = Very unclear, confusing or poorly structured
+
+Consider:
+- Organization and structure
+- Writing quality
+- Ease of understanding
+- Use of formatting (bullets, headers, etc.)
+
+Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.80")"""
+
+
+# First number in a free-text score reply ("0.85", "Score: 0.85.", ...)
+_NUM_RE = re.compile(r"[-+]?\d*\.?\d+")
+
+
+def _parse_score(content: str) -> float:
+    """Extract a 0-1 score from an LLM reply (0.5 if it contains no number)"""
+    match = _NUM_RE.search(content)
+    score = float(match.group()) if match else 0.5
+    return max(0.0, min(1.0, score))  # Clamp to 0-1
+
+
+# In-process LRU of scores keyed by a digest of (query, output)
+EVALUATION_CACHE_SIZE = 1024
+_evaluation_cache: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _evaluation_key(query: str, output: str) -> str:
+    """Digest identifying a (query, output) pair"""
+    return hashlib.blake2b(
+        query.encode() + b"\0" + output.encode(), digest_size=16
+    ).hexdigest()
+
+
+def _cache_dimensions(key: str, dimensions: Dict[str, float]) -> None:
+    """Store dimension scores, evicting the least recently used entry"""
+    _evaluation_cache[key] = dimensions
+    if len(_evaluation_cache) > EVALUATION_CACHE_SIZE:
+        _evaluation_cache.popitem(last=False)
+
+
+def get_evaluation_cache_stats() -> Dict[str, int]:
+    """Get evaluation cache hit/miss counters and current size"""
+    return {**_cache_stats, "size": len(_evaluation_cache)}
+
+
+@lru_cache(maxsize=1)
+def _evaluator_llm() -> ChatOpenAI:
+    """Process-wide evaluator model, shared so evaluators reuse one connection pool"""
+    settings = get_settings()
+
+    # Use GPT-4o-mini for cost-effective evaluation
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0.0,  # Deterministic scoring
+        api_key=settings.openai_api_key,
+        max_retries=2,
+        timeout=30
+    )
+
+
+async def warmup() -> None:
+    """
+    Open the evaluator's connection to OpenAI ahead of the first task
+
+    Sends a 1-token request when LLM_WARMUP_ENABLED is set; failures are
+    logged and otherwise ignored.
+    """
+    if not get_settings().llm_warmup_enabled:
+        return
+
+    try:
+        await _evaluator_llm().ainvoke("ping", max_tokens=1)
+        logger.info("Evaluator LLM warmed up")
+    except Exception as e:
+        logger.warning(f"Evaluator LLM warmup failed: {e}")
+
+
 class PerformanceEvaluator:
     """
     Evaluates task outputs using LLM-based scoring
@@ -57,15 +230,19 @@ class PerformanceEvaluator:
         "clarity": 0.15,
     }
 
-    def __init__(self):
-        settings = get_settings()
+    # Output caps: a bare score ("0.85") fits in 4 tokens, the JSON object in 64
+    SCORE_MAX_TOKENS = 4
+    JSON_SCORE_MAX_TOKENS = 64
 
-        # Use GPT-4o-mini for cost-effective evaluation
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.0,  # Deterministic scoring
-            api_key=settings.openai_api_key
-        )
+    # Offline batches at least this large go through the OpenAI Batch API
+    BATCH_API_THRESHOLD = 100
+    BATCH_POLL_INTERVAL_SECONDS = 30.0
+
+    # Live evaluations in flight at once for smaller offline batches
+    MAX_CONCURRENT_EVALUATIONS = 8
+
+    def __init__(self):
+        self.llm = _evaluator_llm()
 
     async def evaluate_task(
         self,
@@ -89,11 +266,38 @@ class PerformanceEvaluator:
         logger.info(f"Evaluating task output from {agent_name}")
 
         try:
-            # Get individual dimension scores
-            accuracy = await self._evaluate_accuracy(original_command, agent_output)
-            relevance = await self._evaluate_relevance(original_command, agent_output)
-            completeness = await self._evaluate_completeness(original_command, agent_output)
-            clarity = await self._evaluate_clarity(agent_output)
+            # Identical outputs for the same query skip the LLM entirely
+            cache_key = _evaluation_key(original_command, agent_output)
+            dimensions = _evaluation_cache.get(cache_key)
+
+            if dimensions is not None:
+                _cache_stats["hits"] += 1
+                _evaluation_cache.move_to_end(cache_key)
+            else:
+                _cache_stats["misses"] += 1
+                # Score all dimensions in a single call
+                dimensions = await self._evaluate_all(original_command, agent_output)
+                if dimensions is not None:
+                    _cache_dimensions(cache_key, dimensions)
+
+            if dimensions is not None:
+                accuracy = dimensions["accuracy"]
+                relevance = dimensions["relevance"]
+                completeness = dimensions["completeness"]
+                clarity = dimensions["clarity"]
+            else:
+                # Fall back to per-dimension calls (independent, run concurrently)
+                results = await asyncio.gather(
+                    self._evaluate_accuracy(original_command, agent_output),
+                    self._evaluate_relevance(original_command, agent_output),
+                    self._evaluate_completeness(original_command, agent_output),
+                    self._evaluate_clarity(agent_output),
+                    return_exceptions=True
+                )
+                accuracy, relevance, completeness, clarity = (
+                    0.5 if isinstance(result, BaseException) else result
+                    for result in results
+                )
 
             # Calculate weighted overall score
             overall = self._calculate_overall(
@@ -125,37 +329,163 @@ class PerformanceEvaluator:
                 overall=0.5
             )
 
-    async def _evaluate_accuracy(self, query: str, output: str) -> float:
+    async def _evaluate_all(self, query: str, output: str) -> Optional[Dict[str, float]]:
         """
-        Evaluate accuracy: Did it correctly answer the question?
+        Evaluate all quality dimensions with one LLM call returning JSON
 
         Returns:
-            Score from 0.0 to 1.0
+            Scores keyed by dimension (0.0 to 1.0), or None if the response
+            could not be parsed
         """
-        prompt = f"""You are an expert evaluator assessing the accuracy of AI agent responses.
+        try:
+            response = await self.llm.ainvoke(
+                [HumanMessage(content=self._combined_prompt(query, output))],
+                response_format={"type": "json_object"},
+                max_tokens=self.JSON_SCORE_MAX_TOKENS
+            )
+            return self._parse_dimensions(response.content)
+        except Exception as e:
+            logger.warning(f"Combined evaluation failed, falling back to per-dimension calls: {e}")
+            return None
 
-Original Query: {query}
+    def _combined_prompt(self, query: str, output: str) -> str:
+        """Build the prompt scoring all dimensions as a JSON object"""
+        return _ALL_DIMENSIONS_PROMPT.format(query=query, output=output)
 
-Agent Response: {output}
+    def _parse_dimensions(self, content: str) -> Dict[str, float]:
+        """Parse a JSON dimension response (raises on malformed content)"""
+        data = json.loads(content)
+        return {
+            dimension: max(0.0, min(1.0, float(data[dimension])))  # Clamp to 0-1
+            for dimension in self.WEIGHTS
+        }
 
-Evaluate the ACCURACY of this response on a 0.0-1.0 scale:
-- 1.0 = Perfectly accurate, all facts correct
-- 0.8 = Mostly accurate, minor errors
-- 0.6 = Partially accurate, some errors
-- 0.4 = Mostly inaccurate, significant errors
-- 0.2 = Completely inaccurate or wrong
+    def _scores_from_dimensions(self, dimensions: Optional[Dict[str, float]]) -> PerformanceScores:
+        """Build PerformanceScores from dimension scores (defaults when missing)"""
+        if dimensions is None:
+            return PerformanceScores(
+                accuracy=0.5,
+                relevance=0.5,
+                completeness=0.5,
+                clarity=0.5,
+                overall=0.5
+            )
+        return PerformanceScores(overall=self._calculate_overall(**dimensions), **dimensions)
 
-Consider:
-- Factual correctness
-- Logical consistency
-- Absence of hallucinations
+    async def evaluate_batch(self, tasks: List[Tuple[str, str]]) -> List[PerformanceScores]:
+        """
+        Evaluate many (original_command, agent_output) pairs for offline re-scoring
 
-Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.85")"""
+        Pairs already in the evaluation cache are not re-scored. If
+        BATCH_API_THRESHOLD or more remain, they are submitted to the OpenAI
+        Batch API (half the cost, completes within 24h); otherwise the batch is
+        scored live, at most MAX_CONCURRENT_EVALUATIONS at a time.
+
+        Returns:
+            PerformanceScores in the same order as tasks
+        """
+        keys = [_evaluation_key(query, output) for query, output in tasks]
+        cached = {key: _evaluation_cache[key] for key in keys if key in _evaluation_cache}
+        pending = {key: task for key, task in zip(keys, tasks) if key not in cached}
+
+        if len(pending) < self.BATCH_API_THRESHOLD:
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_EVALUATIONS)
+
+            async def evaluate(query: str, output: str) -> PerformanceScores:
+                async with semaphore:
+                    return await self.evaluate_task(query, output, agent_name="batch")
+
+            return list(await asyncio.gather(*(
+                evaluate(query, output) for query, output in tasks
+            )))
+
+        _cache_stats["hits"] += sum(key in cached for key in keys)
+        _cache_stats["misses"] += len(pending)
+
+        try:
+            results = await self._evaluate_via_batch_api(list(pending.values()))
+        except Exception as e:
+            logger.error(f"Batch evaluation of {len(pending)} tasks failed: {e}", exc_info=True)
+            results = [None] * len(pending)
+
+        fresh = dict(zip(pending, results))
+        for key, result in fresh.items():
+            if result is not None:
+                _cache_dimensions(key, result)
+
+        dimensions = {**cached, **fresh}
+        return [self._scores_from_dimensions(dimensions[key]) for key in keys]
+
+    async def _evaluate_via_batch_api(
+        self,
+        tasks: List[Tuple[str, str]]
+    ) -> List[Optional[Dict[str, float]]]:
+        """Submit combined evaluation prompts as one OpenAI batch and wait for results"""
+        lines = [
+            json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.llm.model_name,
+                    "temperature": 0.0,
+                    "max_tokens": self.JSON_SCORE_MAX_TOKENS,
+                    "response_format": {"type": "json_object"},
+                    "messages": [{"role": "user", "content": self._combined_prompt(query, output)}],
+                },
+            })
+            for index, (query, output) in enumerate(tasks)
+        ]
+
+        async with AsyncOpenAI(api_key=get_settings().openai_api_key) as client:
+            batch_file = await client.files.create(
+                file=("evaluations.jsonl", "\n".join(lines).encode()),
+                purpose="batch"
+            )
+            batch = await client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            logger.info(f"Submitted evaluation batch {batch.id} ({len(tasks)} tasks)")
+
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(self.BATCH_POLL_INTERVAL_SECONDS)
+                batch = await client.batches.retrieve(batch.id)
+
+            if batch.status != "completed" or not batch.output_file_id:
+                raise RuntimeError(f"Evaluation batch {batch.id} ended with status {batch.status}")
+
+            content = (await client.files.content(batch.output_file_id)).text
+
+        results: List[Optional[Dict[str, float]]] = [None] * len(tasks)
+        for line in content.splitlines():
+            item = json.loads(line)
+            try:
+                body = item["response"]["body"]
+                results[int(item["custom_id"])] = self._parse_dimensions(
+                    body["choices"][0]["message"]["content"]
+                )
+            except Exception as e:
+                logger.warning(f"Unparseable batch result {item.get('custom_id')}: {e}")
+
+        return results
+
+    async def _evaluate_accuracy(self, query: str, output: str) -> float:
+        """
+        Evaluate accuracy: Did it correctly answer the question?
+
+        Returns:
+            Score from 0.0 to 1.0
+        """
+        prompt = _ACCURACY_PROMPT.format(query=query, output=output)
 
         try:
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
-            score = float(response.content.strip())
-            return max(0.0, min(1.0, score))  # Clamp to 0-1
+            response = await self.llm.ainvoke(
+                [HumanMessage(content=prompt)],
+                max_tokens=self.SCORE_MAX_TOKENS
+            )
+            return _parse_score(response.content)
         except Exception as e:
             logger.warning(f"Accuracy evaluation failed: {e}")
             return 0.5
@@ -167,30 +497,14 @@ Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.85")"""
         Returns:
             Score from 0.0 to 1.0
         """
-        prompt = f"""You are an expert evaluator assessing the relevance of AI agent responses.
-
-Original Query: {query}
-
-Agent Response: {output}
-
-Evaluate the RELEVANCE of this response on a 0.0-1.0 scale:
-- 1.0 = Perfectly relevant, directly addresses the query
-- 0.8 = Mostly relevant, minor tangents
-- 0.6 = Partially relevant, some off-topic content
-- 0.4 = Mostly irrelevant, significant off-topic content
-- 0.2 = Completely irrelevant or unrelated
-
-Consider:
-- Does it answer what was asked?
-- Is the information useful for the query?
-- Does it stay on-topic?
-
-Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.90")"""
+        prompt = _RELEVANCE_PROMPT.format(query=query, output=output)
 
         try:
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
-            score = float(response.content.strip())
-            return max(0.0, min(1.0, score))
+            response = await self.llm.ainvoke(
+                [HumanMessage(content=prompt)],
+                max_tokens=self.SCORE_MAX_TOKENS
+            )
+            return _parse_score(response.content)
         except Exception as e:
             logger.warning(f"Relevance evaluation failed: {e}")
             return 0.5
@@ -202,30 +516,14 @@ Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.90")"""
         Returns:
             Score from 0.0 to 1.0
         """
-        prompt = f"""You are an expert evaluator assessing the completeness of AI agent responses.
-
-Original Query: {query}
-
-Agent Response: {output}
-
-Evaluate the COMPLETENESS of this response on a 0.0-1.0 scale:
-- 1.0 = Fully complete, all aspects covered
-- 0.8 = Mostly complete, minor gaps
-- 0.6 = Partially complete, some aspects missing
-- 0.4 = Mostly incomplete, significant gaps
-- 0.2 = Very incomplete, barely addressed the query
-
-Consider:
-- Are all parts of the query addressed?
-- Is sufficient detail provided?
-- Are there obvious gaps?
-
-Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.75")"""
+        prompt = _COMPLETENESS_PROMPT.format(query=query, output=output)
 
         try:
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
-            score = float(response.content.strip())
-            return max(0.0, min(1.0, score))
+            response = await self.llm.ainvoke(
+                [HumanMessage(content=prompt)],
+                max_tokens=self.SCORE_MAX_TOKENS
+            )
+            return _parse_score(response.content)
         except Exception as e:
             logger.warning(f"Completeness evaluation failed: {e}")
             return 0.5
@@ -237,29 +535,14 @@ Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.75")"""
         Returns:
             Score from 0.0 to 1.0
         """
-        prompt = f"""You are an expert evaluator assessing the clarity of AI agent responses.
-
-Agent Response: {output}
-
-Evaluate the CLARITY of this response on a 0.0-1.0 scale:
-- 1.0 = Perfectly clear, well-structured, easy to understand
-- 0.8 = Mostly clear, minor organization issues
-- 0.6 = Partially clear, some confusion
-- 0.4 = Mostly unclear, hard to follow
-- 0.2 = Very unclear, confusing or poorly structured
-
-Consider:
-- Organization and structure
-- Writing quality
-- Ease of understanding
-- Use of formatting (bullets, headers, etc.)
-
-Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.80")"""
+        prompt = _CLARITY_PROMPT.format(output=output)
 
         try:
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
-            score = float(response.content.strip())
-            return max(0.0, min(1.0, score))
+            response = await self.llm.ainvoke(
+                [HumanMessage(content=prompt)],
+                max_tokens=self.SCORE_MAX_TOKENS
+            )
+            return _parse_score(response.content)
         except Exception as e:
             logger.warning(f"Clarity evaluation failed: {e}")
             return 0.5
@@ -13,17 +13,136 @@ Architecture:
 3. Dynamic adaptation: Adapt cached prompts to specific task context at runtime
 """
 
+import asyncio
 import logging
 import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 from uuid import UUID
 
-from backend.repositories.prompt_repository import PromptRepository
+from backend.core.database import get_session_maker
+from backend.repositories.prompt_repository import (
+    PromptRepository,
+    get_prompt_version,
+    set_prompt_versions,
+)
 from backend.models.prompt_models import AgentPrompt
 
 logger = logging.getLogger(__name__)
 
+# Matches {name} placeholders; substitution happens in a single pass
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
+class _SafeMap(dict):
+    """Substitution mapping that leaves unknown placeholders intact"""
+
+    def __missing__(self, key: str) -> str:
+        return f"{{{key}}}"
+
+
+@lru_cache(maxsize=512)
+def _build_adaptation_suffix(
+    urgency: str | None,
+    token_budget: str | None,
+    complexity: str | None,
+    detail_level: str
+) -> str:
+    """
+    Build the task-context suffix appended to a compiled system prompt
+
+    Task shapes repeat constantly across agents, so the suffix is memoized
+    on its small argument tuple.
+    """
+    suffix = ""
+
+    # Add urgency guidance
+    if urgency == "high":
+        suffix += "\n\nIMPORTANT: This is a high-priority task. Prioritize speed and clarity."
+
+    # Add token budget constraint
+    if token_budget is not None:
+        suffix += f"\n\nToken budget: {token_budget} tokens. Be concise."
+
+    # Add complexity guidance
+    if complexity == "complex":
+        suffix += "\n\nNote: This is a complex task. Break it down into clear steps and be thorough."
+
+    # Add detail level guidance
+    if detail_level == "brief":
+        suffix += "\n\nProvide a brief, concise response. Focus on key points only."
+    elif detail_level == "comprehensive":
+        suffix += "\n\nProvide a comprehensive, detailed response. Cover all relevant aspects."
+
+    return suffix
+
+
+@lru_cache(maxsize=512)
+def _build_adaptation_suffix_bytes(*suffix_args: Any) -> bytes:
+    """UTF-8 encoded _build_adaptation_suffix(), memoized separately"""
+    return _build_adaptation_suffix(*suffix_args).encode()
+
+
+def _adaptation_suffix_args(task_context: dict[str, Any]) -> tuple:
+    """Extract the _build_adaptation_suffix() arguments from a task context"""
+    # Budget is keyed by its rendered text so unhashable values still work
+    return (
+        task_context.get("urgency"),
+        str(task_context["token_budget"]) if "token_budget" in task_context else None,
+        task_context.get("complexity"),
+        task_context.get("detail_level", "standard")
+    )
+
+
+@lru_cache(maxsize=128)
+def _fallback_system_prompt(agent_id: str) -> str:
+    """Fallback system prompt for agents without compiled prompts"""
+    return f"""You are an AI assistant for Commander.ai.
+Agent ID: {agent_id}
+
+Please help the user with their request to the best of your ability."""
+
+
+@lru_cache(maxsize=256)
+def _compile_human_template(template: str) -> Callable[[str, dict[str, Any]], str]:
+    """
+    Partially evaluate a user prompt template into a renderer
+
+    The template is split once into literal parts and placeholder slots, so
+    rendering only fills the slots that exist instead of rescanning the text
+    for {query} and every task_context key.
+    """
+    if not template:
+        # Fallback: simple query pass-through
+        return lambda user_query, task_context: user_query
+
+    # Odd indexes of the split hold placeholder names
+    parts = _PLACEHOLDER_RE.split(template)
+    if len(parts) == 1:
+        return lambda user_query, task_context: template
+
+    slots = tuple(range(1, len(parts), 2))
+
+    def render(user_query: str, task_context: dict[str, Any]) -> str:
+        rendered = parts.copy()
+        for i in slots:
+            name = parts[i]
+            if name == "query":
+                rendered[i] = user_query
+            elif name in task_context:
+                rendered[i] = str(task_context[name])
+            else:
+                # Unknown placeholders are left intact
+                rendered[i] = f"{{{name}}}"
+        return "".join(rendered)
+
+    return render
+
 
 class PromptEngineerError(Exception):
     """Base exception for PromptEngineer errors"""
@@ -40,6 +159,19 @@ class PromptCompilationError(PromptEngineerError):
     pass
 
 
+@dataclass(slots=True)
+class CompiledAgent:
+    """Compiled prompts for one agent, kept in a single cache entry"""
+    system: str
+    system_bytes: bytes
+    human_template: str
+    human_renderer: Callable[[str, dict[str, Any]], str] | None
+    compiled_at: datetime
+    base_hash: str
+    agent_config: dict[str, Any]
+    version: datetime | None  # Prompt version (newest updated_at) compiled from
+
+
 class PromptEngineer:
     """
     Dynamic prompt generation service for Commander.ai agents
@@ -52,22 +184,35 @@ class PromptEngineer:
     - Tracks prompt versions for A/B testing
     """
 
-    def __init__(self, prompt_repo: PromptRepository):
+    # How often cached agents' prompt versions are re-read from the database
+    VERSION_POLL_SECONDS = 30.0
+
+    # Wait after a failed background recompile before trying again
+    REFRESH_RETRY_SECONDS = 30.0
+
+    def __init__(self, prompt_repo: PromptRepository, max_cached_agents: int = 256):
         """
         Initialize PromptEngineer
 
         Args:
             prompt_repo: Repository for accessing prompt database
+            max_cached_agents: Max compiled agents kept; least recently used
+                               agents are evicted beyond this
         """
         self.prompt_repo = prompt_repo
-        self.compiled_cache: dict[str, dict[str, str]] = {}
-        self._compilation_timestamps: dict[str, datetime] = {}
+        self.max_cached_agents = max_cached_agents
+        self.agents: OrderedDict[str, CompiledAgent] = OrderedDict()
+        self._evictions = 0
+        self._refresh_tasks: dict[str, asyncio.Task] = {}
+        self._refresh_failed_at: dict[str, float] = {}
+        self._version_poll: asyncio.Task | None = None
+        self._versions_polled_at = time.monotonic()
 
     async def compile_agent_prompts(
         self,
         agent_id: str,
         agent_config: dict[str, Any]
-    ) -> dict[str, str]:
+    ) -> dict[str, Any]:
         """
         Pre-compile prompts for an agent based on its configuration
         Called at agent startup or when config changes
@@ -84,53 +229,184 @@ class PromptEngineer:
             Dictionary with compiled prompts:
             {
                 "system": "Compiled system prompt text",
-                "human_template": "Template for user prompts with {variables}"
+                "human_template": "Template for user prompts with {variables}",
+                "human_renderer": Precompiled callable for the human template
             }
 
         Raises:
             PromptNotFoundError: If no active prompts found for agent
             PromptCompilationError: If compilation fails
         """
+        return await self._load_and_compile(self.prompt_repo, agent_id, agent_config)
+
+    async def _load_and_compile(
+        self,
+        prompt_repo: PromptRepository,
+        agent_id: str,
+        agent_config: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Load an agent's prompts through prompt_repo and compile them"""
         logger.info(f"Compiling prompts for agent: {agent_id}")
 
         try:
-            # Load active prompts from database
-            prompts = await self.prompt_repo.get_active_prompts(agent_id)
-
-            if not prompts:
-                logger.warning(f"No active prompts found for agent {agent_id}. Using fallback.")
-                # Return empty compiled dict - agent will use hardcoded prompts
-                return {}
-
-            # Compile prompts by type
-            compiled = {}
-
-            for prompt in prompts:
-                if prompt.prompt_type == "system":
-                    compiled["system"] = self._compile_system_prompt(
-                        base_text=prompt.prompt_text,
-                        agent_config=agent_config,
-                        variables=prompt.variables
-                    )
-                elif prompt.prompt_type == "human":
-                    # Human prompts are templates, store as-is
-                    compiled["human_template"] = prompt.prompt_text
-
-            # Cache compiled prompts
-            self.compiled_cache[agent_id] = compiled
-            self._compilation_timestamps[agent_id] = datetime.utcnow()
-
-            logger.info(
-                f"Successfully compiled {len(compiled)} prompt(s) for {agent_id}: "
-                f"{list(compiled.keys())}"
-            )
+            # Read the version before loading so writes racing the load
+            # leave the entry stale rather than silently current
+            versions = await prompt_repo.get_prompt_versions([agent_id])
+            set_prompt_versions(versions)
 
-            return compiled
+            # Load active prompts from database
+            prompts = await prompt_repo.get_active_prompts(agent_id)
+            return self._compile_loaded_prompts(agent_id, prompts, agent_config, versions.get(agent_id))
 
         except Exception as e:
             logger.error(f"Failed to compile prompts for {agent_id}: {e}", exc_info=True)
             raise PromptCompilationError(f"Compilation failed for {agent_id}: {e}") from e
 
+    async def compile_all_agent_prompts(
+        self,
+        configs: dict[str, dict[str, Any]]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Pre-compile prompts for many agents with a single database query
+        Use at startup instead of calling compile_agent_prompts() per agent
+
+        Args:
+            configs: Mapping of agent_id -> agent configuration
+
+        Returns:
+            Mapping of agent_id -> compiled prompts (see compile_agent_prompts)
+
+        Raises:
+            PromptCompilationError: If loading or compilation fails
+        """
+        agent_ids = list(configs)
+        logger.info(f"Compiling prompts for {len(agent_ids)} agent(s)")
+
+        try:
+            versions = await self.prompt_repo.get_prompt_versions(agent_ids)
+            set_prompt_versions(versions)
+
+            # One round-trip for every agent's active prompts
+            prompts_by_agent = await self.prompt_repo.get_active_prompts_bulk(agent_ids)
+        except Exception as e:
+            logger.error(f"Failed to load prompts for {agent_ids}: {e}", exc_info=True)
+            raise PromptCompilationError(f"Bulk prompt load failed: {e}") from e
+
+        results = {}
+        for agent_id, agent_config in configs.items():
+            try:
+                results[agent_id] = self._compile_loaded_prompts(
+                    agent_id, prompts_by_agent.get(agent_id, []), agent_config, versions.get(agent_id)
+                )
+            except Exception as e:
+                logger.error(f"Failed to compile prompts for {agent_id}: {e}", exc_info=True)
+                raise PromptCompilationError(f"Compilation failed for {agent_id}: {e}") from e
+
+        return results
+
+    async def compile_agents_concurrently(
+        self,
+        items: dict[str, dict[str, Any]],
+        max_concurrency: int = 16
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Compile prompts for many agents with overlapping database round-trips
+
+        Note: an AsyncSession cannot run concurrent queries, so the repository
+        must hand out a session per call. When it wraps a single session, use
+        compile_all_agent_prompts() instead.
+
+        Args:
+            items: Mapping of agent_id -> agent configuration
+            max_concurrency: Max compilations in flight at once, to avoid
+                             flooding the database connection pool
+
+        Returns:
+            Mapping of agent_id -> compiled prompts (see compile_agent_prompts)
+
+        Raises:
+            PromptCompilationError: If any agent fails to compile
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def compile_one(agent_id: str, agent_config: dict[str, Any]):
+            async with semaphore:
+                return agent_id, await self.compile_agent_prompts(agent_id, agent_config)
+
+        results = await asyncio.gather(
+            *(compile_one(agent_id, agent_config) for agent_id, agent_config in items.items())
+        )
+        return dict(results)
+
+    def _compile_loaded_prompts(
+        self,
+        agent_id: str,
+        prompts: list[AgentPrompt],
+        agent_config: dict[str, Any],
+        version: datetime | None
+    ) -> dict[str, Any]:
+        """
+        Compile already-loaded prompts for an agent and cache the result
+
+        Args:
+            agent_id: Agent identifier
+            prompts: Active prompts for the agent
+            agent_config: Agent configuration
+            version: Prompt version (newest updated_at) the prompts were loaded at
+
+        Returns:
+            Dictionary with compiled prompts (empty if no prompts)
+        """
+        if not prompts:
+            logger.warning(f"No active prompts found for agent {agent_id}. Using fallback.")
+            # Drop any previous entry - agent will use hardcoded prompts
+            self.agents.pop(agent_id, None)
+            return {}
+
+        # Compile prompts by type
+        compiled = {}
+
+        for prompt in prompts:
+            if prompt.prompt_type == "system":
+                compiled["system"] = self._compile_system_prompt(
+                    base_text=prompt.prompt_text,
+                    agent_config=agent_config,
+                    variables=prompt.variables
+                )
+            elif prompt.prompt_type == "human":
+                # Human prompts are templates, store as-is plus a renderer
+                compiled["human_template"] = prompt.prompt_text
+                compiled["human_renderer"] = _compile_human_template(prompt.prompt_text)
+
+        # Cache compiled prompts
+        # Encode once so byte-oriented callers and the version hash reuse it
+        system = compiled.get("system", "")
+        system_bytes = system.encode()
+        self.agents[agent_id] = CompiledAgent(
+            system=system,
+            system_bytes=system_bytes,
+            human_template=compiled.get("human_template", ""),
+            human_renderer=compiled.get("human_renderer"),
+            compiled_at=datetime.utcnow(),
+            base_hash=self.generate_prompt_version_hash(system_bytes),
+            agent_config=agent_config,
+            version=version
+        )
+        self.agents.move_to_end(agent_id)
+
+        # Evict least recently used agents beyond the cache bound
+        while len(self.agents) > self.max_cached_agents:
+            evicted_id, _ = self.agents.popitem(last=False)
+            self._evictions += 1
+            logger.debug(f"Evicted compiled prompts for agent: {evicted_id}")
+
+        logger.info(
+            f"Successfully compiled {len(compiled)} prompt(s) for {agent_id}: "
+            f"{list(compiled.keys())}"
+        )
+
+        return compiled
+
     async def generate_dynamic_prompt(
         self,
         agent_id: str,
@@ -158,7 +434,8 @@ class PromptEngineer:
             PromptNotFoundError: If agent prompts not compiled
         """
         # Check if prompts are compiled
-        if agent_id not in self.compiled_cache:
+        compiled = self._get_compiled(agent_id)
+        if compiled is None:
             logger.warning(
                 f"Prompts not compiled for {agent_id}. "
                 f"Call compile_agent_prompts() first or agent will use fallback."
@@ -166,23 +443,133 @@ class PromptEngineer:
             # Return simple fallback prompts
             return self._generate_fallback_prompts(agent_id, user_query)
 
-        compiled = self.compiled_cache[agent_id]
-
-        # Adapt system prompt for task context
-        system_prompt = self._adapt_system_prompt(
-            base_system=compiled.get("system", ""),
-            task_context=task_context
-        )
+        # Adapt system prompt for task context (nothing to adapt when empty)
+        if not task_context:
+            system_prompt = compiled.system
+        else:
+            system_prompt = self._adapt_system_prompt(
+                base_system=compiled.system,
+                task_context=task_context
+            )
 
-        # Build user prompt from template
-        user_prompt = self._build_user_prompt(
-            template=compiled.get("human_template", ""),
-            user_query=user_query,
-            task_context=task_context
-        )
+        # Build user prompt from the precompiled template renderer
+        renderer = compiled.human_renderer
+        if renderer is None:
+            user_prompt = user_query
+        else:
+            user_prompt = renderer(user_query, task_context)
 
         return system_prompt, user_prompt
 
+    async def generate_dynamic_prompt_bytes(
+        self,
+        agent_id: str,
+        task_context: dict[str, Any],
+        user_query: str
+    ) -> tuple[bytes, bytes]:
+        """
+        UTF-8 encoded variant of generate_dynamic_prompt()
+        For callers that write prompts straight into a request body
+
+        The compiled system prompt and adaptation suffix are cached already
+        encoded, so only the user prompt is encoded per call.
+
+        Args:
+            agent_id: Agent identifier
+            task_context: Task-specific context (see generate_dynamic_prompt)
+            user_query: User's original query
+
+        Returns:
+            Tuple of (system_prompt, user_prompt) as UTF-8 bytes
+        """
+        compiled = self._get_compiled(agent_id)
+        if compiled is None:
+            system_prompt, user_prompt = await self.generate_dynamic_prompt(
+                agent_id, task_context, user_query
+            )
+            return system_prompt.encode(), user_prompt.encode()
+
+        if not task_context:
+            system_prompt = compiled.system_bytes
+        elif compiled.system_bytes:
+            system_prompt = compiled.system_bytes + _build_adaptation_suffix_bytes(
+                *_adaptation_suffix_args(task_context)
+            )
+        else:
+            system_prompt = b""
+
+        renderer = compiled.human_renderer
+        user_prompt = user_query if renderer is None else renderer(user_query, task_context)
+
+        return system_prompt, user_prompt.encode()
+
+    def _get_compiled(self, agent_id: str) -> CompiledAgent | None:
+        """
+        Look up an agent's compiled prompts, refreshing them lazily
+
+        Prompt versions are re-read from the database every
+        VERSION_POLL_SECONDS. If an agent's version moved since compilation,
+        the current entry is still served while a background task recompiles
+        it and swaps the new entry in, so the request path never waits on the
+        database. A failed recompile is retried after REFRESH_RETRY_SECONDS.
+        """
+        compiled = self.agents.get(agent_id)
+        if compiled is None:
+            return None
+
+        self.agents.move_to_end(agent_id)
+
+        now = time.monotonic()
+        if self._version_poll is None and now - self._versions_polled_at >= self.VERSION_POLL_SECONDS:
+            self._versions_polled_at = now
+            self._version_poll = asyncio.create_task(self._poll_prompt_versions())
+            self._version_poll.add_done_callback(self._version_poll_done)
+
+        if (
+            compiled.version != get_prompt_version(agent_id)
+            and agent_id not in self._refresh_tasks
+            and now - self._refresh_failed_at.get(agent_id, float("-inf"))
+            >= self.REFRESH_RETRY_SECONDS
+        ):
+            task = asyncio.create_task(
+                self._refresh_agent_prompts(agent_id, compiled.agent_config)
+            )
+            self._refresh_tasks[agent_id] = task
+            task.add_done_callback(lambda _: self._refresh_tasks.pop(agent_id, None))
+
+        return compiled
+
+    def _version_poll_done(self, _task: asyncio.Task) -> None:
+        self._version_poll = None
+
+    async def _poll_prompt_versions(self) -> None:
+        """Re-read cached agents' prompt versions on a dedicated session"""
+        try:
+            async with get_session_maker()() as session:
+                versions = await PromptRepository(session).get_prompt_versions(list(self.agents))
+            set_prompt_versions(versions)
+        except Exception as e:
+            logger.warning(f"Failed to poll prompt versions: {e}")
+
+    async def _refresh_agent_prompts(self, agent_id: str, agent_config: dict[str, Any]) -> None:
+        """
+        Recompile stale prompts in the background (errors are logged, not raised)
+
+        Runs on its own session: the shared prompt_repo session may be in use
+        by a request, and an AsyncSession cannot run overlapping operations.
+        """
+        logger.info(f"Prompts changed for {agent_id}, recompiling")
+        try:
+            async with get_session_maker()() as session:
+                await self._load_and_compile(PromptRepository(session), agent_id, agent_config)
+        except Exception as e:
+            if not isinstance(e, PromptCompilationError):  # Those are already logged
+                logger.error(f"Background recompile failed for {agent_id}: {e}", exc_info=True)
+            # Keep serving the previous compilation until the retry
+            self._refresh_failed_at[agent_id] = time.monotonic()
+        else:
+            self._refresh_failed_at.pop(agent_id, None)
+
     def _compile_system_prompt(
         self,
         base_text: str,
@@ -200,27 +587,26 @@ class PromptEngineer:
         Returns:
             Compiled system prompt
         """
-        prompt = base_text
-
-        # Replace agent tools list
-        if "tools" in agent_config and "{tools_list}" in prompt:
-            tools_list = self._format_tools_list(agent_config["tools"])
-            prompt = prompt.replace("{tools_list}", tools_list)
-
-        # Replace agent specialization
-        if "specialization" in agent_config and "{specialization}" in prompt:
-            prompt = prompt.replace("{specialization}", agent_config["specialization"])
-
-        # Replace agent capabilities
-        if "capabilities" in agent_config and "{capabilities}" in prompt:
-            capabilities_text = ", ".join(agent_config["capabilities"])
-            prompt = prompt.replace("{capabilities}", capabilities_text)
-
-        # Replace custom variables
-        for key, value in variables.items():
-            placeholder = f"{{{key}}}"
-            if placeholder in prompt:
-                prompt = prompt.replace(placeholder, str(value))
+        # Nothing to substitute - skip building the mapping entirely
+        if "{" not in base_text:
+            return base_text
+
+        # Custom variables first so agent config wins on name clashes
+        mapping = _SafeMap((key, str(value)) for key, value in variables.items())
+
+        if "tools" in agent_config:
+            mapping["tools_list"] = self._format_tools_list(agent_config["tools"])
+        if "specialization" in agent_config:
+            mapping["specialization"] = agent_config["specialization"]
+        if "capabilities" in agent_config:
+            mapping["capabilities"] = ", ".join(agent_config["capabilities"])
+
+        # Single regex pass rather than str.format_map, which would reject
+        # literal JSON braces in prompts and collapse escaped "{{"
+        prompt = _PLACEHOLDER_RE.sub(
+            lambda m: mapping[m.group(1)],
+            base_text
+        )
 
         return prompt
 
@@ -242,28 +628,7 @@ class PromptEngineer:
         if not base_system:
             return ""
 
-        adapted = base_system
-
-        # Add urgency guidance
-        if task_context.get("urgency") == "high":
-            adapted += "\n\nIMPORTANT: This is a high-priority task. Prioritize speed and clarity."
-
-        # Add token budget constraint
-        if "token_budget" in task_context:
-            adapted += f"\n\nToken budget: {task_context['token_budget']} tokens. Be concise."
-
-        # Add complexity guidance
-        if task_context.get("complexity") == "complex":
-            adapted += "\n\nNote: This is a complex task. Break it down into clear steps and be thorough."
-
-        # Add detail level guidance
-        detail_level = task_context.get("detail_level", "standard")
-        if detail_level == "brief":
-            adapted += "\n\nProvide a brief, concise response. Focus on key points only."
-        elif detail_level == "comprehensive":
-            adapted += "\n\nProvide a comprehensive, detailed response. Cover all relevant aspects."
-
-        return adapted
+        return base_system + _build_adaptation_suffix(*_adaptation_suffix_args(task_context))
 
     def _build_user_prompt(
         self,
@@ -286,16 +651,7 @@ class PromptEngineer:
             # Fallback: simple query pass-through
             return user_query
 
-        # Replace query variable
-        prompt = template.replace("{query}", user_query)
-
-        # Replace task context variables
-        for key, value in task_context.items():
-            placeholder = f"{{{key}}}"
-            if placeholder in prompt:
-                prompt = prompt.replace(placeholder, str(value))
-
-        return prompt
+        return _compile_human_template(template)(user_query, task_context)
 
     def _format_tools_list(self, tools: list[dict[str, str]]) -> str:
         """
@@ -333,14 +689,7 @@ class PromptEngineer:
         Returns:
             Tuple of (system_prompt, user_prompt)
         """
-        system_prompt = f"""You are an AI assistant for Commander.ai.
-Agent ID: {agent_id}
-
-Please help the user with their request to the best of your ability."""
-
-        user_prompt = user_query
-
-        return system_prompt, user_prompt
+        return _fallback_system_prompt(agent_id), user_query
 
     def get_cache_status(self) -> dict[str, Any]:
         """
@@ -350,11 +699,13 @@ Please help the user with their request to the best of your ability."""
             Dictionary with cache statistics
         """
         return {
-            "cached_agents": list(self.compiled_cache.keys()),
-            "cache_size": len(self.compiled_cache),
+            "cached_agents": list(self.agents.keys()),
+            "cache_size": len(self.agents),
+            "max_cached_agents": self.max_cached_agents,
+            "evictions": self._evictions,
             "compilation_timestamps": {
-                agent_id: ts.isoformat()
-                for agent_id, ts in self._compilation_timestamps.items()
+                agent_id: compiled.compiled_at.isoformat()
+                for agent_id, compiled in self.agents.items()
             }
         }
 
@@ -367,27 +718,26 @@ Please help the user with their request to the best of your ability."""
                      If None, clears all caches.
         """
         if agent_id:
-            if agent_id in self.compiled_cache:
-                del self.compiled_cache[agent_id]
-                del self._compilation_timestamps[agent_id]
+            if agent_id in self.agents:
+                del self.agents[agent_id]
                 logger.info(f"Cleared cache for agent: {agent_id}")
         else:
-            self.compiled_cache.clear()
-            self._compilation_timestamps.clear()
+            self.agents.clear()
             logger.info("Cleared all prompt caches")
 
-    def generate_prompt_version_hash(self, prompt_text: str) -> str:
+    def generate_prompt_version_hash(self, prompt_text: str | bytes) -> str:
         """
         Generate version hash for prompt (useful for A/B testing)
 
         Args:
-            prompt_text: Prompt text to hash
+            prompt_text: Prompt text (or its UTF-8 bytes) to hash
 
         Returns:
-            SHA256 hash (first 16 chars) for version tracking
+            16-char BLAKE2b hex digest for version tracking (not a security hash)
         """
-        hash_obj = hashlib.sha256(prompt_text.encode())
-        return hash_obj.hexdigest()[:16]
+        if isinstance(prompt_text, str):
+            prompt_text = prompt_text.encode()
+        return hashlib.blake2b(prompt_text, digest_size=8).hexdigest()
 
 
 # Singleton instance (will be initialized by dependency injection)
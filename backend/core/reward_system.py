@@ -19,14 +19,33 @@ Penalties for:
 - Poor user ratings
 """
 
+import json
 import logging
+import math
+from bisect import bisect_right
+from operator import attrgetter
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Fraction of the max bonus awarded per tier; the last tier gets nothing
+_TIER_FRACTIONS = (1.0, 0.75, 0.50, 0.25, 0.0)
+
+
+def _tier_points(max_bonus: int) -> tuple[int, ...]:
+    """Expand a max bonus into per-tier points (index = bisect position)"""
+    return tuple(int(max_bonus * fraction) for fraction in _TIER_FRACTIONS)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RewardCalculation:
     """Result of reward/penalty calculation"""
     total_reward: int
@@ -41,17 +60,18 @@ class RewardCalculation:
 
     def to_dict(self) -> Dict[str, int]:
         """Convert to dictionary for storage"""
-        return {
-            "total_reward": self.total_reward,
-            "base_reward": self.base_reward,
-            "quality_bonus": self.quality_bonus,
-            "speed_bonus": self.speed_bonus,
-            "cost_bonus": self.cost_bonus,
-            "user_bonus": self.user_bonus,
-            "peer_bonus": self.peer_bonus,
-            "penalties": self.penalties,
-            "net_reward": self.net_reward,
-        }
+        return dict(zip(_REWARD_KEYS, _get_reward_values(self)))
+
+    def to_json(self) -> bytes:
+        """Serialize to JSON bytes (orjson encodes the dataclass directly)"""
+        if orjson is not None:
+            return orjson.dumps(self)
+        return json.dumps(self.to_dict()).encode()
+
+
+# Field names in declaration order, shared by every to_dict() call
+_REWARD_KEYS = tuple(f.name for f in fields(RewardCalculation))
+_get_reward_values = attrgetter(*_REWARD_KEYS)
 
 
 class RewardSystem:
@@ -89,6 +109,14 @@ class RewardSystem:
     COST_THRESHOLD = 0.50  # $0.50
     DURATION_THRESHOLD = 120  # 2 minutes
 
+    # Bonus tiers: upper bounds (exclusive) and points derived from REWARD_WEIGHTS
+    SPEED_TIERS = (5, 10, 30, 60)
+    COST_TIERS = (0.05, 0.10, 0.25, 0.50)
+    _SPEED_POINTS = _tier_points(REWARD_WEIGHTS["speed_bonus"])
+    _COST_POINTS = _tier_points(REWARD_WEIGHTS["cost_efficiency"])
+    _SPEED_POINTS_ARRAY = np.array(_SPEED_POINTS, dtype=np.int64)
+    _COST_POINTS_ARRAY = np.array(_COST_POINTS, dtype=np.int64)
+
     def calculate_reward(
         self,
         task_status: str,
@@ -129,8 +157,9 @@ class RewardSystem:
         cost_bonus = self._calculate_cost_bonus(total_cost, overall_score)
 
         # User satisfaction bonus
+        # Integer math: exact for whole-star ratings, no float round-trip
         user_bonus = (
-            int((user_rating / 5.0) * self.REWARD_WEIGHTS["user_satisfaction"])
+            int(user_rating * self.REWARD_WEIGHTS["user_satisfaction"] // 5)
             if user_rating
             else 0
         )
@@ -178,6 +207,107 @@ class RewardSystem:
 
         return result
 
+    def calculate_rewards_batch(
+        self,
+        task_status,
+        overall_score,
+        duration_seconds,
+        total_cost,
+        user_rating=None,
+        peer_score_avg=None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized calculate_reward() for backfills and replay analysis
+
+        Takes equal-length array-likes (lists, NumPy arrays or pandas Series)
+        and applies the same rules as calculate_reward() column-wise.
+
+        Args:
+            task_status: Task statuses ("COMPLETED", "FAILED", etc.)
+            overall_score: Quality scores (0-1)
+            duration_seconds: Task execution times
+            total_cost: Estimated costs in dollars
+            user_rating: Optional 1-5 star ratings (NaN = no rating)
+            peer_score_avg: Optional average peer scores (NaN = no peer evals)
+
+        Returns:
+            Dict of int64 arrays keyed like RewardCalculation.to_dict()
+            (pass to pd.DataFrame for a tabular view)
+        """
+        status = np.asarray(task_status)
+        score = np.asarray(overall_score, dtype=float)
+        duration = np.asarray(duration_seconds, dtype=float)
+        cost = np.asarray(total_cost, dtype=float)
+        n = len(score)
+
+        rating = (
+            np.full(n, np.nan) if user_rating is None
+            else np.asarray(user_rating, dtype=float)
+        )
+        peer = (
+            np.full(n, np.nan) if peer_score_avg is None
+            else np.asarray(peer_score_avg, dtype=float)
+        )
+        # Missing and zero ratings are treated as "no rating", as in the scalar path
+        rated = ~np.isnan(rating) & (rating != 0)
+        weights = self.REWARD_WEIGHTS
+        amounts = self.PENALTY_AMOUNTS
+
+        # Bonuses: int64 throughout; conditional terms are computed only on
+        # the rows they apply to and scattered into zeroed arrays
+        base_reward = (status == "COMPLETED") * np.int64(weights["task_completion"])
+        quality_bonus = (score * weights["quality_bonus"]).astype(np.int64)
+        speed_bonus = self._SPEED_POINTS_ARRAY[
+            np.searchsorted(self.SPEED_TIERS, duration, side="right")
+        ]
+        cost_bonus = (
+            self._COST_POINTS_ARRAY[np.searchsorted(self.COST_TIERS, cost, side="right")]
+            * np.maximum(score, 0.5)
+        ).astype(np.int64)
+
+        user_bonus = np.zeros(n, dtype=np.int64)
+        user_bonus[rated] = (rating[rated] * weights["user_satisfaction"] // 5).astype(np.int64)
+
+        has_peer = ~np.isnan(peer)
+        peer_bonus = np.zeros(n, dtype=np.int64)
+        peer_bonus[has_peer] = (peer[has_peer] * weights["peer_recognition"]).astype(np.int64)
+
+        total_reward = base_reward + quality_bonus
+        total_reward += speed_bonus
+        total_reward += cost_bonus
+        total_reward += user_bonus
+        total_reward += peer_bonus
+
+        # Penalties (same formulas as _calculate_penalties), accumulated in place
+        penalties = (status == "FAILED") * np.int64(amounts["task_failed"])
+
+        over_cost = cost > self.COST_THRESHOLD
+        penalties[over_cost] += (
+            ((cost[over_cost] - self.COST_THRESHOLD) / 0.10) * amounts["excessive_cost"]
+        ).astype(np.int64)
+
+        over_time = duration > self.DURATION_THRESHOLD
+        penalties[over_time] += (
+            ((duration[over_time] - self.DURATION_THRESHOLD) / 10) * amounts["timeout"]
+        ).astype(np.int64)
+
+        poorly_rated = rated & (rating < 3)
+        penalties[poorly_rated] += (
+            (3 - rating[poorly_rated]) * amounts["poor_rating"]
+        ).astype(np.int64)
+
+        return {
+            "total_reward": total_reward,
+            "base_reward": base_reward,
+            "quality_bonus": quality_bonus,
+            "speed_bonus": speed_bonus,
+            "cost_bonus": cost_bonus,
+            "user_bonus": user_bonus,
+            "peer_bonus": peer_bonus,
+            "penalties": penalties,
+            "net_reward": total_reward - penalties,
+        }
+
     def _calculate_speed_bonus(self, duration_seconds: float) -> int:
         """
         Calculate speed bonus based on execution time
@@ -189,16 +319,7 @@ class RewardSystem:
         - < 60 seconds: 5 points
         - >= 60 seconds: 0 points
         """
-        if duration_seconds < 5:
-            return self.REWARD_WEIGHTS["speed_bonus"]
-        elif duration_seconds < 10:
-            return int(self.REWARD_WEIGHTS["speed_bonus"] * 0.75)
-        elif duration_seconds < 30:
-            return int(self.REWARD_WEIGHTS["speed_bonus"] * 0.50)
-        elif duration_seconds < 60:
-            return int(self.REWARD_WEIGHTS["speed_bonus"] * 0.25)
-        else:
-            return 0
+        return self._SPEED_POINTS[bisect_right(self.SPEED_TIERS, duration_seconds)]
 
     def _calculate_cost_bonus(self, total_cost: float, quality_score: float) -> int:
         """
@@ -213,19 +334,8 @@ class RewardSystem:
 
         Also scales with quality (low cost + low quality = lower bonus)
         """
-        max_bonus = self.REWARD_WEIGHTS["cost_efficiency"]
-
         # Base cost bonus
-        if total_cost < 0.05:
-            cost_bonus = max_bonus
-        elif total_cost < 0.10:
-            cost_bonus = int(max_bonus * 0.75)
-        elif total_cost < 0.25:
-            cost_bonus = int(max_bonus * 0.50)
-        elif total_cost < 0.50:
-            cost_bonus = int(max_bonus * 0.25)
-        else:
-            cost_bonus = 0
+        cost_bonus = self._COST_POINTS[bisect_right(self.COST_TIERS, total_cost)]
 
         # Scale by quality (prevent gaming with cheap but bad outputs)
         quality_multiplier = max(quality_score, 0.5)  # Minimum 50% scaling
@@ -240,6 +350,23 @@ class RewardSystem:
         if not peer_evaluations:
             return 0
 
+        # Fast path: homogeneous lists (all score dicts or all numbers)
+        first = peer_evaluations[0]
+        try:
+            if isinstance(first, dict):
+                total = math.fsum(e["score"] for e in peer_evaluations)
+            elif isinstance(first, (int, float)):
+                total = math.fsum(peer_evaluations)
+            else:
+                total = None
+        except (KeyError, TypeError):
+            # Mixed or partial entries - use the filtering path below
+            total = None
+
+        if total is not None:
+            avg_peer_score = total / len(peer_evaluations)
+            return int(avg_peer_score * self.REWARD_WEIGHTS["peer_recognition"])
+
         # Extract scores from peer evaluations
         scores = []
         for eval_data in peer_evaluations:
@@ -251,7 +378,7 @@ class RewardSystem:
         if not scores:
             return 0
 
-        avg_peer_score = sum(scores) / len(scores)
+        avg_peer_score = math.fsum(scores) / len(scores)
         return int(avg_peer_score * self.REWARD_WEIGHTS["peer_recognition"])
 
     def _calculate_penalties(
@@ -301,6 +428,17 @@ class RewardSystem:
         return penalty
 
 
+def rewards_to_json(results: list[RewardCalculation]) -> bytes:
+    """Serialize many reward calculations to a JSON array in one call"""
+    if orjson is not None:
+        return orjson.dumps(results)
+    return json.dumps([result.to_dict() for result in results]).encode()
+
+
+# Shared instance - RewardSystem holds only class-level constants
+_reward_system = RewardSystem()
+
+
 # Convenience function for calculating rewards from task metadata
 
 def calculate_task_reward(task_metadata: Dict[str, Any]) -> RewardCalculation:
@@ -313,9 +451,7 @@ def calculate_task_reward(task_metadata: Dict[str, Any]) -> RewardCalculation:
     Returns:
         RewardCalculation
     """
-    system = RewardSystem()
-
-    return system.calculate_reward(
+    return _reward_system.calculate_reward(
         task_status=task_metadata.get("status", "UNKNOWN"),
         overall_score=task_metadata.get("overall_score", 0.5),
         duration_seconds=task_metadata.get("duration_seconds", 60.0),
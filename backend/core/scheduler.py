@@ -3,26 +3,85 @@ Command Scheduler Service
 APScheduler-based scheduler for executing NLP commands on a schedule
 """
 
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from typing import Iterator, NamedTuple
 from uuid import UUID
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
-from croniter import croniter
+from apscheduler.jobstores.base import JobLookupError
 import pytz
+from sqlalchemy import text
 
 from backend.core.config import get_settings
-from backend.core.database import get_session_maker
+from backend.core.database import get_session_maker, get_sync_engine
 from backend.repositories.scheduled_command_repository import ScheduledCommandRepository
-from backend.models.scheduled_command_models import ScheduleType, IntervalUnit
+from backend.models.scheduled_command_models import ScheduledCommand, ScheduleType, IntervalUnit
 
 logger = logging.getLogger(__name__)
 
 
+# IntervalTrigger keyword and length in seconds for each interval unit
+_INTERVAL_KW = {
+    IntervalUnit.MINUTES: 'minutes',
+    IntervalUnit.HOURS: 'hours',
+    IntervalUnit.DAYS: 'days',
+}
+_INTERVAL_SECS = {
+    IntervalUnit.MINUTES: 60,
+    IntervalUnit.HOURS: 3600,
+    IntervalUnit.DAYS: 86400,
+}
+
+
+@lru_cache(maxsize=64)
+def _get_timezone(tz_name: str):
+    """Resolve a timezone name once (pytz lookups are not free)"""
+    return pytz.timezone(tz_name)
+
+
+@lru_cache(maxsize=512)
+def _get_cron_trigger(cron_expression: str, tz_name: str) -> CronTrigger:
+    """
+    Parse a crontab expression into a CronTrigger once per (expression, tz)
+
+    Triggers are stateless, so schedules sharing an expression share one.
+    """
+    return CronTrigger.from_crontab(cron_expression, timezone=_get_timezone(tz_name))
+
+
+@lru_cache(maxsize=512)
+def _next_cron_run(cron_expression: str, tz_name: str, after: datetime) -> datetime | None:
+    """
+    Next fire time (UTC) strictly after ``after`` for a cron expression
+
+    Asks the cached CronTrigger itself, so the expression is parsed once and
+    the recorded next_run_at matches when APScheduler will actually fire.
+    Callers truncate ``after`` to the minute: crontab ticks are minute-aligned,
+    so every instant within a minute has the same next run, and schedules
+    sharing an expression are computed once per minute.
+    """
+    trigger = _get_cron_trigger(cron_expression, tz_name)
+    # get_next_fire_time() is inclusive of its start time
+    fire_time = trigger.get_next_fire_time(None, after + timedelta(microseconds=1))
+    return fire_time.astimezone(pytz.UTC) if fire_time else None
+
+
+class _JobView(NamedTuple):
+    """Lightweight view of a scheduled job for status listings"""
+    id: str
+    name: str
+    next_run: str | None
+
+
 class CommandSchedulerService:
     """
     Service for managing scheduled command execution using APScheduler
@@ -32,6 +91,11 @@ class CommandSchedulerService:
         self.scheduler: AsyncIOScheduler | None = None
         self._initialized = False
 
+    @staticmethod
+    def _job_id(schedule_id: UUID) -> str:
+        """APScheduler job id for a scheduled command"""
+        return f"scheduled_command_{schedule_id}"
+
     async def initialize(self):
         """Initialize the scheduler with database-backed job store"""
         if self._initialized:
@@ -41,13 +105,20 @@ class CommandSchedulerService:
         settings = get_settings()
 
         # Configure job stores (use SQLAlchemy to persist jobs)
+        jobstore = SQLAlchemyJobStore(engine=get_sync_engine())
         jobstores = {
-            'default': SQLAlchemyJobStore(url=settings.database_url.replace('+asyncpg', ''))
+            'default': jobstore
         }
 
-        # Configure executors
+        # Open the pool's connections now so the first add_job doesn't pay connect latency
+        await self._warm_jobstore_pool(jobstore.engine, settings.database_sync_pool_size)
+
+        # Configure executors. Coroutine jobs (scheduled commands, system
+        # jobs) run on the event loop; blocking sync jobs should be added
+        # with executor='threadpool' so they don't stall it.
         executors = {
-            'default': AsyncIOExecutor()
+            'default': AsyncIOExecutor(),
+            'threadpool': ThreadPoolExecutor(max_workers=settings.scheduler_threadpool_workers),
         }
 
         # Configure job defaults
@@ -68,6 +139,27 @@ class CommandSchedulerService:
         logger.info("Scheduler initialized")
         self._initialized = True
 
+    @staticmethod
+    async def _warm_jobstore_pool(engine, connections: int):
+        """
+        Check out `connections` pooled connections concurrently and return them
+
+        Best effort: a database that is down here is reported again, with
+        context, by the first real job store operation.
+        """
+        def ping():
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(None, ping) for _ in range(connections)),
+            return_exceptions=True,
+        )
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.warning(f"Job store pool warm-up failed: {failures[0]}")
+
     async def start(self):
         """Start the scheduler and load all enabled schedules"""
         if not self._initialized:
@@ -98,11 +190,31 @@ class CommandSchedulerService:
 
             logger.info(f"Loading {len(schedules)} enabled schedules")
 
+            # Build every trigger and next run up front (no DB writes)
+            prepared = []
             for schedule in schedules:
                 try:
-                    await self.add_schedule(schedule.id)
+                    plan = self._prepare_schedule(schedule)
                 except Exception as e:
                     logger.error(f"Failed to load schedule {schedule.id}: {e}", exc_info=True)
+                    continue
+                if plan:
+                    prepared.append((schedule, *plan))
+
+            # Record all next_run_at values with a single UPDATE
+            next_runs = [(schedule.id, next_run) for schedule, _, next_run in prepared if next_run]
+            if next_runs:
+                try:
+                    await repo.bulk_update_next_run(next_runs)
+                except Exception as e:
+                    # next_run_at is informational - still register the jobs
+                    logger.error(f"Failed to record next runs for {len(next_runs)} schedules: {e}")
+
+        for schedule, trigger, next_run in prepared:
+            try:
+                self._register_job(schedule, trigger, next_run)
+            except Exception as e:
+                logger.error(f"Failed to load schedule {schedule.id}: {e}", exc_info=True)
 
     async def add_schedule(self, schedule_id: UUID) -> bool:
         """
@@ -127,38 +239,79 @@ class CommandSchedulerService:
                 logger.error(f"Schedule {schedule_id} not found")
                 return False
 
-            if not schedule.enabled:
-                logger.warning(f"Schedule {schedule_id} is disabled, not adding to scheduler")
-                return False
+            return await self._add_schedule_obj(schedule, repo)
 
-            # Create appropriate trigger
-            trigger = self._create_trigger(schedule)
-            if not trigger:
-                logger.error(f"Failed to create trigger for schedule {schedule_id}")
-                return False
+    async def _add_schedule_obj(self, schedule, repo: ScheduledCommandRepository) -> bool:
+        """
+        Add an already-loaded schedule to the scheduler
 
-            # Calculate and update next_run_at
-            next_run = self._calculate_next_run(schedule)
-            if next_run:
-                await repo.update_next_run(schedule_id, next_run)
+        Args:
+            schedule: ScheduledCommand object
+            repo: Repository used to record next_run_at
 
-            # Add job to scheduler
-            job_id = f"scheduled_command_{schedule_id}"
+        Returns:
+            True if successfully added, False otherwise
+        """
+        plan = self._prepare_schedule(schedule)
+        if not plan:
+            return False
 
-            # Import here to avoid circular import
-            from backend.jobs.scheduled_command_job import execute_scheduled_command
+        trigger, next_run = plan
 
-            self.scheduler.add_job(
-                execute_scheduled_command,
-                trigger=trigger,
-                id=job_id,
-                name=f"{schedule.agent_nickname}: {schedule.command_text[:50]}",
-                args=[str(schedule_id)],
-                replace_existing=True,
-            )
+        # Update next_run_at
+        if next_run:
+            await repo.update_next_run(schedule.id, next_run)
 
-            logger.info(f"Added schedule {schedule_id} to scheduler (next run: {next_run})")
-            return True
+        self._register_job(schedule, trigger, next_run)
+        return True
+
+    def _prepare_schedule(self, schedule) -> tuple | None:
+        """
+        Build the trigger and next run time for a schedule
+
+        Args:
+            schedule: ScheduledCommand object
+
+        Returns:
+            (trigger, next_run) or None if the schedule can't be added
+        """
+        if not schedule.enabled:
+            logger.warning(f"Schedule {schedule.id} is disabled, not adding to scheduler")
+            return None
+
+        # Create appropriate trigger
+        trigger = self._create_trigger(schedule)
+        if not trigger:
+            logger.error(f"Failed to create trigger for schedule {schedule.id}")
+            return None
+
+        return trigger, self._calculate_next_run(schedule)
+
+    def _register_job(self, schedule, trigger, next_run: datetime | None) -> None:
+        """
+        Add (or replace) the APScheduler job for a prepared schedule
+
+        Args:
+            schedule: ScheduledCommand object
+            trigger: Trigger from _prepare_schedule()
+            next_run: Next run time, for logging
+        """
+        schedule_id = schedule.id
+        job_id = self._job_id(schedule_id)
+
+        # Import here to avoid circular import
+        from backend.jobs.scheduled_command_job import execute_scheduled_command
+
+        self.scheduler.add_job(
+            execute_scheduled_command,
+            trigger=trigger,
+            id=job_id,
+            name=f"{schedule.agent_nickname}: {schedule.command_text[:50]}",
+            args=[str(schedule_id)],
+            replace_existing=True,
+        )
+
+        logger.info(f"Added schedule {schedule_id} to scheduler (next run: {next_run})")
 
     async def remove_schedule(self, schedule_id: UUID) -> bool:
         """
@@ -174,7 +327,7 @@ class CommandSchedulerService:
             logger.error("Scheduler not initialized")
             return False
 
-        job_id = f"scheduled_command_{schedule_id}"
+        job_id = self._job_id(schedule_id)
 
         try:
             self.scheduler.remove_job(job_id)
@@ -184,21 +337,57 @@ class CommandSchedulerService:
             logger.error(f"Failed to remove schedule {schedule_id}: {e}")
             return False
 
-    async def update_schedule(self, schedule_id: UUID) -> bool:
+    async def update_schedule(
+        self,
+        schedule: UUID | ScheduledCommand,
+        repo: ScheduledCommandRepository | None = None,
+    ) -> bool:
         """
-        Update a schedule in the scheduler (remove and re-add)
+        Update a schedule in the scheduler
+
+        The job is re-registered in place (add_job replaces the existing job),
+        so no separate remove is needed. Pass the already-loaded schedule to
+        skip re-fetching it; if it can no longer be scheduled (disabled or
+        invalid), its existing job is dropped.
 
         Args:
-            schedule_id: UUID of the scheduled command
+            schedule: UUID of the scheduled command, or the loaded ScheduledCommand
+            repo: Repository used to record next_run_at (defaults to a new session)
 
         Returns:
             True if successfully updated, False otherwise
         """
-        # Remove existing job
-        await self.remove_schedule(schedule_id)
+        if not self.scheduler:
+            logger.error("Scheduler not initialized")
+            return False
 
-        # Add updated job
-        return await self.add_schedule(schedule_id)
+        schedule_id = schedule if isinstance(schedule, UUID) else schedule.id
+
+        if isinstance(schedule, ScheduledCommand) and repo is not None:
+            updated = await self._add_schedule_obj(schedule, repo)
+        else:
+            session_maker = get_session_maker()
+            async with session_maker() as session:
+                repo = ScheduledCommandRepository(session)
+                if isinstance(schedule, UUID):
+                    schedule = await repo.get_scheduled_command(schedule_id)
+
+                if not schedule:
+                    logger.error(f"Schedule {schedule_id} not found")
+                    updated = False
+                else:
+                    updated = await self._add_schedule_obj(schedule, repo)
+
+        if not updated:
+            self._drop_job(schedule_id)
+        return updated
+
+    def _drop_job(self, schedule_id: UUID) -> None:
+        """Remove a schedule's job if it is registered"""
+        try:
+            self.scheduler.remove_job(self._job_id(schedule_id))
+        except JobLookupError:
+            pass
 
     async def pause_schedule(self, schedule_id: UUID) -> bool:
         """
@@ -214,7 +403,7 @@ class CommandSchedulerService:
             logger.error("Scheduler not initialized")
             return False
 
-        job_id = f"scheduled_command_{schedule_id}"
+        job_id = self._job_id(schedule_id)
 
         try:
             self.scheduler.pause_job(job_id)
@@ -238,7 +427,7 @@ class CommandSchedulerService:
             logger.error("Scheduler not initialized")
             return False
 
-        job_id = f"scheduled_command_{schedule_id}"
+        job_id = self._job_id(schedule_id)
 
         try:
             self.scheduler.resume_job(job_id)
@@ -265,11 +454,8 @@ class CommandSchedulerService:
                 return None
 
             try:
-                # Parse timezone
-                tz = pytz.timezone(schedule.timezone)
-
-                # Create cron trigger
-                return CronTrigger.from_crontab(schedule.cron_expression, timezone=tz)
+                # Create cron trigger (parsed once per expression/timezone)
+                return _get_cron_trigger(schedule.cron_expression, schedule.timezone)
             except Exception as e:
                 logger.error(f"Failed to parse cron expression '{schedule.cron_expression}': {e}")
                 return None
@@ -281,18 +467,12 @@ class CommandSchedulerService:
                 return None
 
             # Convert interval unit to kwargs for IntervalTrigger
-            interval_kwargs = {}
-            if schedule.interval_unit == IntervalUnit.MINUTES:
-                interval_kwargs['minutes'] = schedule.interval_value
-            elif schedule.interval_unit == IntervalUnit.HOURS:
-                interval_kwargs['hours'] = schedule.interval_value
-            elif schedule.interval_unit == IntervalUnit.DAYS:
-                interval_kwargs['days'] = schedule.interval_value
-            else:
+            kw = _INTERVAL_KW.get(schedule.interval_unit)
+            if kw is None:
                 logger.error(f"Unknown interval unit: {schedule.interval_unit}")
                 return None
 
-            return IntervalTrigger(**interval_kwargs)
+            return IntervalTrigger(**{kw: schedule.interval_value})
 
         else:
             logger.error(f"Unknown schedule type: {schedule.schedule_type}")
@@ -310,67 +490,83 @@ class CommandSchedulerService:
         """
         try:
             if schedule.schedule_type == ScheduleType.CRON:
-                # Use croniter to calculate next run
-                tz = pytz.timezone(schedule.timezone)
-                now = datetime.now(tz)
-
-                cron = croniter(schedule.cron_expression, now)
-                next_run_local = cron.get_next(datetime)
+                # Ask the (cached) trigger for its next fire time, in UTC;
+                # results are shared by every instant within the minute
+                tz = _get_timezone(schedule.timezone)
+                now = datetime.now(tz).replace(second=0, microsecond=0)
 
-                # Convert to UTC
-                return next_run_local.astimezone(pytz.UTC)
+                return _next_cron_run(schedule.cron_expression, schedule.timezone, now)
 
             elif schedule.schedule_type == ScheduleType.INTERVAL:
                 # For intervals, next run is now + interval
-                from datetime import timedelta
-
-                now_utc = datetime.now(pytz.UTC)
-
-                if schedule.interval_unit == IntervalUnit.MINUTES:
-                    delta = timedelta(minutes=schedule.interval_value)
-                elif schedule.interval_unit == IntervalUnit.HOURS:
-                    delta = timedelta(hours=schedule.interval_value)
-                elif schedule.interval_unit == IntervalUnit.DAYS:
-                    delta = timedelta(days=schedule.interval_value)
-                else:
+                unit_secs = _INTERVAL_SECS.get(schedule.interval_unit)
+                if unit_secs is None:
                     return None
 
-                return now_utc + delta
+                now_utc = datetime.now(pytz.UTC)
+                return now_utc + timedelta(seconds=unit_secs * schedule.interval_value)
 
         except Exception as e:
             logger.error(f"Failed to calculate next run for schedule {schedule.id}: {e}")
             return None
 
-    def get_scheduler_status(self) -> dict:
+    def get_scheduler_summary(self) -> dict:
         """
-        Get current scheduler status
+        Get scheduler state and job count, without listing jobs
 
         Returns:
-            Dictionary with scheduler status information
+            Dictionary with running/initialized flags and jobs_count
         """
         if not self.scheduler:
             return {
                 "running": False,
                 "initialized": self._initialized,
                 "jobs_count": 0,
-                "jobs": []
             }
 
-        jobs = []
-        for job in self.scheduler.get_jobs():
-            jobs.append({
-                "id": job.id,
-                "name": job.name,
-                "next_run": job.next_run_time.isoformat() if job.next_run_time else None,
-            })
-
         return {
             "running": self.scheduler.running,
             "initialized": self._initialized,
-            "jobs_count": len(jobs),
-            "jobs": jobs,
+            "jobs_count": len(self.scheduler.get_jobs()),
         }
 
+    def iter_jobs(self, limit: int | None = None, offset: int = 0) -> Iterator[_JobView]:
+        """
+        Yield scheduled jobs one at a time
+
+        Args:
+            limit: Maximum number of jobs to yield (None for all)
+            offset: Number of jobs to skip
+
+        Yields:
+            _JobView with job id, name and next run time
+        """
+        if not self.scheduler:
+            return
+
+        stop = None if limit is None else offset + limit
+        for job in islice(self.scheduler.get_jobs(), offset, stop):
+            yield _JobView(
+                job.id,
+                job.name,
+                job.next_run_time.isoformat() if job.next_run_time else None,
+            )
+
+    def get_scheduler_status(self, limit: int | None = None, offset: int = 0) -> dict:
+        """
+        Get current scheduler status
+
+        Args:
+            limit: Maximum number of jobs to list (None for all)
+            offset: Number of jobs to skip
+
+        Returns:
+            Dictionary with scheduler status information
+        """
+        status = self.get_scheduler_summary()
+        status["jobs"] = [job._asdict() for job in self.iter_jobs(limit=limit, offset=offset)]
+        return status
+
     async def add_system_job(
         self,
         job_id: str,
@@ -391,6 +587,7 @@ class CommandSchedulerService:
             trigger: APScheduler trigger (IntervalTrigger, CronTrigger, etc.)
             name: Human-readable job name
             **kwargs: Additional arguments for scheduler.add_job()
+                (e.g. executor='threadpool' for blocking sync functions)
 
         Returns:
             True if successfully added, False otherwise
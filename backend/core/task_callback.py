@@ -1,8 +1,11 @@
 """
 Task progress callbacks for agent execution
 """
+import asyncio
+import logging
+from typing import Awaitable
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 
 from backend.models.task_models import (
     TaskStatus, TaskStatusChangeEvent, TaskProgressEvent,
@@ -11,6 +14,8 @@ from backend.models.task_models import (
 from backend.repositories.task_repository import TaskRepository
 from backend.api.websocket import TaskWebSocketManager
 
+logger = logging.getLogger(__name__)
+
 
 class TaskProgressCallback:
     """Callback for tracking agent execution progress"""
@@ -25,35 +30,63 @@ class TaskProgressCallback:
         self.repo = repo
         self.ws_manager = ws_manager
 
+    async def _write_and_broadcast(self, write: Awaitable, event) -> None:
+        """
+        Run a repository write and its WebSocket broadcast concurrently
+
+        A failed broadcast is logged rather than raised so it can't mask a
+        write that already committed; a failed write is re-raised.
+        """
+        write_result, broadcast_result = await asyncio.gather(
+            write,
+            self.ws_manager.broadcast_task_event(event),
+            return_exceptions=True,
+        )
+        if isinstance(broadcast_result, Exception):
+            logger.error(
+                f"Failed to broadcast {event.type} for task {self.task_id}: {broadcast_result}"
+            )
+        if isinstance(write_result, Exception):
+            logger.error(f"Failed to persist {event.type} for task {self.task_id}: {write_result}")
+            raise write_result
+
     async def on_status_change(self, old_status: TaskStatus, new_status: TaskStatus):
         """Called when task status changes"""
+        ts = datetime.now(timezone.utc)
         kwargs = {}
+        # Task timestamp columns are naive UTC; store the same instant
         if new_status == TaskStatus.IN_PROGRESS:
-            kwargs['started_at'] = datetime.utcnow()
+            kwargs['started_at'] = ts.replace(tzinfo=None)
         elif new_status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
-            kwargs['completed_at'] = datetime.utcnow()
+            kwargs['completed_at'] = ts.replace(tzinfo=None)
+
+        write = self.repo.set_status(self.task_id, new_status, **kwargs)
 
-        await self.repo.set_status(self.task_id, new_status, **kwargs)
+        # Terminal transitions are announced once, by the executor's
+        # TaskCompletedEvent (which carries old_status), so skip the broadcast here
+        if new_status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+            await write
+            return
 
         event = TaskStatusChangeEvent(
             task_id=self.task_id,
             old_status=old_status,
             new_status=new_status,
-            timestamp=datetime.utcnow()
+            timestamp=ts
         )
-        await self.ws_manager.broadcast_task_event(event)
+        await self._write_and_broadcast(write, event)
 
     async def on_progress_update(self, progress: int, current_node: str):
         """Called when agent reports progress"""
-        await self.repo.update_progress(self.task_id, progress, current_node)
-
         event = TaskProgressEvent(
             task_id=self.task_id,
             progress_percentage=progress,
             current_node=current_node,
-            timestamp=datetime.utcnow()
+            timestamp=datetime.now(timezone.utc)
+        )
+        await self._write_and_broadcast(
+            self.repo.update_progress(self.task_id, progress, current_node), event
         )
-        await self.ws_manager.broadcast_task_event(event)
 
     async def on_consultation_started(
         self,
@@ -64,7 +97,7 @@ class TaskProgressCallback:
         """Called when agent consults another agent"""
         from backend.models.task_models import TaskUpdate
 
-        await self.repo.update_task(
+        write = self.repo.update_task(
             self.task_id,
             TaskUpdate(
                 status=TaskStatus.TOOL_CALL,
@@ -77,15 +110,15 @@ class TaskProgressCallback:
             requesting_agent_id=requesting_agent_id,
             target_agent_id=target_agent_id,
             target_agent_nickname=target_nickname,
-            timestamp=datetime.utcnow()
+            timestamp=datetime.now(timezone.utc)
         )
-        await self.ws_manager.broadcast_task_event(event)
+        await self._write_and_broadcast(write, event)
 
     async def on_consultation_completed(self):
         """Called when consultation completes"""
         event = ConsultationCompletedEvent(
             task_id=self.task_id,
-            timestamp=datetime.utcnow()
+            timestamp=datetime.now(timezone.utc)
         )
         await self.ws_manager.broadcast_task_event(event)
 
@@ -97,6 +130,6 @@ class TaskProgressCallback:
         event = TaskMetadataUpdatedEvent(
             task_id=self.task_id,
             metadata=metadata,
-            timestamp=datetime.utcnow()
+            timestamp=datetime.now(timezone.utc)
         )
         await self.ws_manager.broadcast_task_event(event)
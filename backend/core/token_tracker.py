@@ -3,27 +3,32 @@ Token Usage Tracking
 Tracks LLM calls, tool calls, agent calls, and token consumption for cost monitoring
 """
 
-from typing import Any
+from typing import Any, Callable
 from dataclasses import dataclass, field, asdict
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenUsage:
     """Tracks token usage for a single LLM call"""
     prompt_tokens: int = 0
     completion_tokens: int = 0
     total_tokens: int = 0
 
+    def iadd(self, other: "TokenUsage") -> "TokenUsage":
+        """Accumulate another TokenUsage into this one in place"""
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.total_tokens += other.total_tokens
+        return self
+
     def __add__(self, other: "TokenUsage") -> "TokenUsage":
         """Add two TokenUsage objects together"""
         return TokenUsage(
-            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
-            completion_tokens=self.completion_tokens + other.completion_tokens,
-            total_tokens=self.total_tokens + other.total_tokens,
-        )
+            self.prompt_tokens, self.completion_tokens, self.total_tokens
+        ).iadd(other)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionMetrics:
     """Tracks execution metrics for an agent or task"""
     llm_calls: int = 0
@@ -36,6 +41,9 @@ class ExecutionMetrics:
     tool_call_details: list[dict[str, Any]] = field(default_factory=list)
     agent_call_details: list[dict[str, Any]] = field(default_factory=list)
 
+    # When False, only counters are kept and the *_details lists stay empty
+    track_details: bool = True
+
     def add_llm_call(
         self,
         model: str,
@@ -45,28 +53,28 @@ class ExecutionMetrics:
     ) -> None:
         """Record an LLM call"""
         self.llm_calls += 1
-        usage = TokenUsage(
-            prompt_tokens=prompt_tokens,
-            completion_tokens=completion_tokens,
-            total_tokens=prompt_tokens + completion_tokens
-        )
-        self.token_usage = self.token_usage + usage
+        usage = self.token_usage
+        usage.prompt_tokens += prompt_tokens
+        usage.completion_tokens += completion_tokens
+        usage.total_tokens += prompt_tokens + completion_tokens
 
-        self.llm_call_details.append({
-            "model": model,
-            "purpose": purpose,
-            "prompt_tokens": prompt_tokens,
-            "completion_tokens": completion_tokens,
-            "total_tokens": prompt_tokens + completion_tokens,
-        })
+        if self.track_details:
+            self.llm_call_details.append({
+                "model": model,
+                "purpose": purpose,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            })
 
     def add_tool_call(self, tool_name: str, success: bool = True) -> None:
         """Record a tool call"""
         self.tool_calls += 1
-        self.tool_call_details.append({
-            "tool": tool_name,
-            "success": success,
-        })
+        if self.track_details:
+            self.tool_call_details.append({
+                "tool": tool_name,
+                "success": success,
+            })
 
     def add_agent_call(
         self,
@@ -77,38 +85,48 @@ class ExecutionMetrics:
     ) -> None:
         """Record an agent call and merge child metrics"""
         self.agent_calls += 1
-        self.agent_call_details.append({
-            "agent_id": agent_id,
-            "agent_nickname": agent_nickname,
-            "success": success,
-        })
+        if self.track_details:
+            self.agent_call_details.append({
+                "agent_id": agent_id,
+                "agent_nickname": agent_nickname,
+                "success": success,
+            })
 
         # Merge child agent metrics into parent
         if child_metrics:
             self.llm_calls += child_metrics.llm_calls
             self.tool_calls += child_metrics.tool_calls
             self.agent_calls += child_metrics.agent_calls
-            self.token_usage = self.token_usage + child_metrics.token_usage
+            self.token_usage.iadd(child_metrics.token_usage)
 
             # Merge detailed lists
-            self.llm_call_details.extend(child_metrics.llm_call_details)
-            self.tool_call_details.extend(child_metrics.tool_call_details)
-            self.agent_call_details.extend(child_metrics.agent_call_details)
+            if self.track_details:
+                self.llm_call_details.extend(child_metrics.llm_call_details)
+                self.tool_call_details.extend(child_metrics.tool_call_details)
+                self.agent_call_details.extend(child_metrics.agent_call_details)
 
     def to_dict(self, include_details: bool = False) -> dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
+        """
+        Convert to dictionary for JSON serialization
+
+        The "details" key is omitted when there are no details to report
+        (e.g. track_details was off); from_dict() treats it as optional.
+        """
+        usage = self.token_usage
         result = {
             "llm_calls": self.llm_calls,
             "tool_calls": self.tool_calls,
             "agent_calls": self.agent_calls,
             "tokens": {
-                "prompt": self.token_usage.prompt_tokens,
-                "completion": self.token_usage.completion_tokens,
-                "total": self.token_usage.total_tokens,
+                "prompt": usage.prompt_tokens,
+                "completion": usage.completion_tokens,
+                "total": usage.total_tokens,
             }
         }
 
-        if include_details:
+        if include_details and (
+            self.llm_call_details or self.tool_call_details or self.agent_call_details
+        ):
             result["details"] = {
                 "llm_calls": self.llm_call_details,
                 "tool_calls": self.tool_call_details,
@@ -140,6 +158,85 @@ class ExecutionMetrics:
         return metrics
 
 
+def _usage_from_metadata(response: Any) -> tuple[int, int] | None:
+    """Token counts from LangChain response_metadata, if present"""
+    metadata = response.response_metadata
+
+    # OpenAI format
+    usage = metadata.get("token_usage", {})
+    if usage:
+        return (
+            usage.get("prompt_tokens", 0),
+            usage.get("completion_tokens", 0)
+        )
+
+    # Anthropic format (in response_metadata.usage)
+    usage = metadata.get("usage", {})
+    if usage:
+        return (
+            usage.get("input_tokens", 0),
+            usage.get("output_tokens", 0)
+        )
+
+    return None
+
+
+def _usage_from_attribute(response: Any) -> tuple[int, int] | None:
+    """Token counts from a direct API response's usage attribute, if present"""
+    usage = response.usage
+
+    # OpenAI format
+    if hasattr(usage, "prompt_tokens"):
+        return (
+            usage.prompt_tokens,
+            usage.completion_tokens
+        )
+
+    # Anthropic format
+    if hasattr(usage, "input_tokens"):
+        return (
+            usage.input_tokens,
+            usage.output_tokens
+        )
+
+    return None
+
+
+def _extract_from_metadata(response: Any) -> tuple[int, int]:
+    return _usage_from_metadata(response) or (0, 0)
+
+
+def _extract_from_attribute(response: Any) -> tuple[int, int]:
+    return _usage_from_attribute(response) or (0, 0)
+
+
+def _extract_from_both(response: Any) -> tuple[int, int]:
+    return _usage_from_metadata(response) or _usage_from_attribute(response) or (0, 0)
+
+
+def _extract_nothing(response: Any) -> tuple[int, int]:
+    return (0, 0)
+
+
+# Extraction strategy per response class, chosen on first sight. LLM responses
+# come from a handful of classes, so this skips the attribute probing on
+# every later call. Bounded so throwaway classes (e.g. mocks) can't grow it.
+_EXTRACTORS: dict[type, Callable[[Any], tuple[int, int]]] = {}
+_MAX_EXTRACTORS = 64
+
+
+def _select_extractor(response: Any) -> Callable[[Any], tuple[int, int]]:
+    has_metadata = hasattr(response, "response_metadata")
+    has_usage = hasattr(response, "usage")
+    if has_metadata and has_usage:
+        return _extract_from_both
+    if has_metadata:
+        return _extract_from_metadata
+    if has_usage:
+        return _extract_from_attribute
+    return _extract_nothing
+
+
 def extract_token_usage_from_response(response: Any) -> tuple[int, int]:
     """
     Extract token usage from LangChain/OpenAI/Anthropic response
@@ -148,46 +245,13 @@ def extract_token_usage_from_response(response: Any) -> tuple[int, int]:
         tuple[prompt_tokens, completion_tokens]
     """
     try:
-        # LangChain response with response_metadata
-        if hasattr(response, "response_metadata"):
-            metadata = response.response_metadata
-
-            # OpenAI format
-            usage = metadata.get("token_usage", {})
-            if usage:
-                return (
-                    usage.get("prompt_tokens", 0),
-                    usage.get("completion_tokens", 0)
-                )
-
-            # Anthropic format (in response_metadata.usage)
-            usage = metadata.get("usage", {})
-            if usage:
-                return (
-                    usage.get("input_tokens", 0),
-                    usage.get("output_tokens", 0)
-                )
-
-        # Direct API response with usage attribute
-        if hasattr(response, "usage"):
-            usage = response.usage
-
-            # OpenAI format
-            if hasattr(usage, "prompt_tokens"):
-                return (
-                    usage.prompt_tokens,
-                    usage.completion_tokens
-                )
-
-            # Anthropic format
-            if hasattr(usage, "input_tokens"):
-                return (
-                    usage.input_tokens,
-                    usage.output_tokens
-                )
-
-        # Fallback
-        return (0, 0)
+        cls = type(response)
+        extractor = _EXTRACTORS.get(cls)
+        if extractor is None:
+            extractor = _select_extractor(response)
+            if len(_EXTRACTORS) < _MAX_EXTRACTORS:
+                _EXTRACTORS[cls] = extractor
+        return extractor(response)
 
     except Exception:
         return (0, 0)
@@ -5,7 +5,11 @@ Removes stale web cache entries based on TTL
 Run daily via cron or APScheduler
 """
 
+import asyncio
 import logging
+import zlib
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 
 from backend.core.dependencies import get_document_store
@@ -13,6 +17,42 @@ from backend.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Rows deleted (and ids held in memory) per transaction
+_DELETE_BATCH_SIZE = 5000
+
+# Postgres advisory lock shared by all cleanup jobs (stable across processes,
+# unlike hash())
+_CLEANUP_LOCK_KEY = zlib.crc32(b"web_cache_cleanup") & 0x7FFFFFFF
+
+
+@asynccontextmanager
+async def _cleanup_lock(doc_store):
+    """
+    Hold the cleanup advisory lock for the duration of a job
+
+    Uses pg_try_advisory_lock so an overlapping run (scheduler tick, API
+    call) skips instead of repeating the same DELETE scans and Qdrant
+    deletes. The lock lives on this session's connection, which is held
+    until the job finishes.
+
+    Yields:
+        True if the lock was acquired, False if another run holds it
+    """
+    async with doc_store.db.session() as session:
+        result = await session.execute(
+            "SELECT pg_try_advisory_lock(:key)",
+            {"key": _CLEANUP_LOCK_KEY}
+        )
+        acquired = bool(result.scalar())
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await session.execute(
+                    "SELECT pg_advisory_unlock(:key)",
+                    {"key": _CLEANUP_LOCK_KEY}
+                )
+
 
 async def cleanup_stale_web_cache() -> dict[str, int]:
     """
@@ -45,48 +85,47 @@ async def cleanup_stale_web_cache() -> dict[str, int]:
     }
 
     try:
-        # Get all collections
-        collections = await doc_store.qdrant_client.get_collections()
-
-        # Filter for web_cache collections
-        cache_prefix = settings.web_cache_collection_prefix
-        cache_collections = [
-            c for c in collections.collections
-            if c.name.startswith(cache_prefix)
-        ]
-
-        logger.info(f"Found {len(cache_collections)} web cache collections")
-
-        for collection in cache_collections:
-            try:
-                deleted_count = await _delete_stale_chunks(
-                    doc_store=doc_store,
-                    collection_name=collection.name,
-                    ttl_hours=settings.web_cache_ttl_hours,
-                )
-
-                stats["collections_processed"] += 1
-                stats["total_chunks_deleted"] += deleted_count
+        async with _cleanup_lock(doc_store) as acquired:
+            if not acquired:
+                logger.info("Cache cleanup skipped: another cache cleanup is running")
+                return stats
+
+            # Get all collections
+            collections = await doc_store.qdrant_client.get_collections()
+
+            # Filter for web_cache collections
+            cache_prefix = settings.web_cache_collection_prefix
+            cache_collections = [
+                c for c in collections.collections
+                if c.name.startswith(cache_prefix)
+            ]
+
+            logger.info(f"Found {len(cache_collections)} web cache collections")
+
+            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=settings.web_cache_ttl_hours)
+
+            # One set-based DELETE across every cache collection
+            deleted = await _delete_collections_chunks(
+                doc_store=doc_store,
+                collection_names=[c.name for c in cache_collections],
+                cutoff_time=cutoff_time,
+                max_concurrency=settings.web_cache_cleanup_concurrency,
+            )
 
-                logger.info(
-                    f"Cleaned {deleted_count} stale chunks from {collection.name}"
-                )
+            stats["collections_processed"] = len(cache_collections)
+            stats["total_chunks_deleted"] = sum(deleted.values())
 
-            except Exception as e:
-                logger.error(
-                    f"Error cleaning collection {collection.name}: {e}",
-                    exc_info=True
-                )
-                stats["errors"] += 1
+            for collection_name, deleted_count in deleted.items():
+                logger.info(f"Cleaned {deleted_count} stale chunks from {collection_name}")
 
-        logger.info(
-            f"Cache cleanup completed: "
-            f"{stats['total_chunks_deleted']} chunks deleted from "
-            f"{stats['collections_processed']} collections, "
-            f"{stats['errors']} errors"
-        )
+            logger.info(
+                f"Cache cleanup completed: "
+                f"{stats['total_chunks_deleted']} chunks deleted from "
+                f"{stats['collections_processed']} collections, "
+                f"{stats['errors']} errors"
+            )
 
-        return stats
+            return stats
 
     except Exception as e:
         logger.error(f"Cache cleanup failed: {e}", exc_info=True)
@@ -139,56 +178,175 @@ async def _delete_stale_chunks(
 
     collection_id = row[0]
 
-    # Step 2: Delete stale chunks using indexed query
-    # This query uses:
+    # Step 2: Delete stale chunks using indexed query, one bounded batch per
+    # transaction. This query uses:
     # - ix_document_chunks_created_at for efficient time filtering
     # - ix_document_chunks_source_type for web content filtering
     delete_query = """
         DELETE FROM document_chunks
-        WHERE collection_id = :collection_id
-        AND metadata->>'source_type' = 'web'
-        AND created_at < :cutoff_time
+        WHERE id IN (
+            SELECT id FROM document_chunks
+            WHERE collection_id = :collection_id
+            AND metadata->>'source_type' = 'web'
+            AND created_at < :cutoff_time
+            ORDER BY created_at
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
         RETURNING id
     """
 
-    async with doc_store.db.session() as session:
-        result = await session.execute(
-            delete_query,
-            {
-                "collection_id": collection_id,
-                "cutoff_time": cutoff_time
-            }
+    deleted = await _delete_in_batches(
+        doc_store=doc_store,
+        delete_query=delete_query,
+        params={"collection_id": collection_id, "cutoff_time": cutoff_time},
+        collection_name=collection_name,
+    )
+    deleted_count = deleted.get(collection_name, 0)
+
+    if deleted_count > 0:
+        logger.info(
+            f"Deleted {deleted_count} chunks from {collection_name} "
+            f"(PostgreSQL + Qdrant)"
         )
-        deleted_ids = [row[0] for row in result.fetchall()]
-        await session.commit()
 
-    deleted_count = len(deleted_ids)
+    return deleted_count
 
-    if deleted_count > 0:
-        # Step 3: Delete corresponding vectors from Qdrant
-        try:
-            from qdrant_client.models import PointIdsList
 
-            await doc_store.qdrant_client.delete(
-                collection_name=collection_name,
-                points_selector=PointIdsList(
-                    points=[str(chunk_id) for chunk_id in deleted_ids]
-                )
-            )
+async def _delete_in_batches(
+    doc_store,
+    delete_query: str,
+    params: dict,
+    collection_name: str | None = None,
+    batch_size: int = _DELETE_BATCH_SIZE,
+    max_concurrency: int = 4,
+) -> dict[str, int]:
+    """
+    Run a batched DELETE ... RETURNING until it deletes a short batch
 
-            logger.info(
-                f"Deleted {deleted_count} chunks from {collection_name} "
-                f"(PostgreSQL + Qdrant)"
-            )
-        except Exception as e:
-            logger.error(
-                f"Failed to delete vectors from Qdrant: {e}. "
-                f"PostgreSQL cleanup succeeded ({deleted_count} chunks).",
-                exc_info=True
+    Each batch is committed in its own transaction and its vectors are
+    removed from Qdrant before the next batch, so memory and lock time stay
+    bounded however large the backlog is. SKIP LOCKED in the query lets
+    overlapping cleanup runs split the work instead of blocking.
+
+    Args:
+        doc_store: DocumentStore instance
+        delete_query: DELETE query taking a :batch_size limit. Returns
+            (id) rows when collection_name is given, otherwise
+            (qdrant_collection_name, id) rows
+        params: Query parameters (batch_size is added)
+        collection_name: Qdrant collection all deleted rows belong to
+        max_concurrency: Maximum Qdrant deletes in flight at once
+
+    Returns:
+        Number of chunks deleted per Qdrant collection
+    """
+    counts: dict[str, int] = defaultdict(int)
+    params = {**params, "batch_size": batch_size}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def delete_vectors(name: str, chunk_ids: list) -> None:
+        async with semaphore:
+            await _delete_vectors(doc_store, name, chunk_ids)
+
+    while True:
+        async with doc_store.db.session() as session:
+            result = await session.execute(delete_query, params)
+            rows = result.fetchall()
+            await session.commit()
+
+        buckets: dict[str, list] = defaultdict(list)
+        if collection_name is not None:
+            buckets[collection_name] = [row[0] for row in rows]
+        else:
+            for name, chunk_id in rows:
+                buckets[name].append(chunk_id)
+
+        for name, chunk_ids in buckets.items():
+            counts[name] += len(chunk_ids)
+
+        # Delete corresponding vectors from Qdrant, one request per collection
+        await asyncio.gather(*(
+            delete_vectors(name, chunk_ids)
+            for name, chunk_ids in buckets.items() if chunk_ids
+        ))
+
+        if len(rows) < batch_size:
+            return dict(counts)
+
+
+async def _delete_vectors(doc_store, collection_name: str, chunk_ids: list) -> None:
+    """Delete chunk vectors from Qdrant, logging (not raising) failures"""
+    from qdrant_client.models import PointIdsList
+
+    try:
+        await doc_store.qdrant_client.delete(
+            collection_name=collection_name,
+            points_selector=PointIdsList(
+                points=[str(chunk_id) for chunk_id in chunk_ids]
             )
-            # Continue - PostgreSQL is source of truth
+        )
+    except Exception as e:
+        logger.error(
+            f"Failed to delete {len(chunk_ids)} vectors from Qdrant "
+            f"collection {collection_name}: {e}. PostgreSQL cleanup succeeded.",
+            exc_info=True
+        )
+        # Continue - PostgreSQL is source of truth
 
-    return deleted_count
+
+async def _delete_collections_chunks(
+    doc_store,
+    collection_names: list[str],
+    cutoff_time: datetime,
+    news_only: bool = False,
+    max_concurrency: int = 4,
+) -> dict[str, int]:
+    """
+    Delete stale web chunks from many collections with one set-based query
+
+    Joins document_collections on the Qdrant collection names instead of
+    looking up and deleting per collection, then buckets the returned ids
+    by collection for the Qdrant deletes.
+
+    Args:
+        doc_store: DocumentStore instance
+        collection_names: Qdrant collection names to clean
+        cutoff_time: Delete chunks created before this time
+        news_only: Only delete chunks with topic='news'
+        max_concurrency: Maximum Qdrant collections cleaned at once
+
+    Returns:
+        Number of chunks deleted per Qdrant collection
+    """
+    if not collection_names:
+        return {}
+
+    topic_filter = "AND c.metadata->>'topic' = 'news'" if news_only else ""
+    delete_query = f"""
+        DELETE FROM document_chunks dc
+        USING document_collections dcol
+        WHERE dc.collection_id = dcol.id
+        AND dc.id IN (
+            SELECT c.id FROM document_chunks c
+            JOIN document_collections col ON c.collection_id = col.id
+            WHERE col.qdrant_collection_name = ANY(:collection_names)
+            AND c.metadata->>'source_type' = 'web'
+            {topic_filter}
+            AND c.created_at < :cutoff_time
+            ORDER BY c.created_at
+            LIMIT :batch_size
+            FOR UPDATE OF c SKIP LOCKED
+        )
+        RETURNING dcol.qdrant_collection_name, dc.id
+    """
+
+    return await _delete_in_batches(
+        doc_store=doc_store,
+        delete_query=delete_query,
+        params={"collection_names": list(collection_names), "cutoff_time": cutoff_time},
+        max_concurrency=max_concurrency,
+    )
 
 
 async def cleanup_web_cache_for_user(user_id: str, ttl_hours: int = 24) -> int:
@@ -208,17 +366,25 @@ async def cleanup_web_cache_for_user(user_id: str, ttl_hours: int = 24) -> int:
     collection_name = f"{settings.web_cache_collection_prefix}_{user_id}"
 
     try:
-        deleted_count = await _delete_stale_chunks(
-            doc_store=doc_store,
-            collection_name=collection_name,
-            ttl_hours=ttl_hours,
-        )
+        async with _cleanup_lock(doc_store) as acquired:
+            if not acquired:
+                logger.info(
+                    f"Cache cleanup for user {user_id} skipped: "
+                    f"another cache cleanup is running"
+                )
+                return 0
 
-        logger.info(
-            f"Cleaned {deleted_count} stale chunks for user {user_id}"
-        )
+            deleted_count = await _delete_stale_chunks(
+                doc_store=doc_store,
+                collection_name=collection_name,
+                ttl_hours=ttl_hours,
+            )
+
+            logger.info(
+                f"Cleaned {deleted_count} stale chunks for user {user_id}"
+            )
 
-        return deleted_count
+            return deleted_count
 
     except Exception as e:
         logger.error(f"Failed to clean cache for user {user_id}: {e}", exc_info=True)
@@ -248,48 +414,48 @@ async def cleanup_news_cache() -> dict[str, int]:
     logger.info(f"Starting news cache cleanup (TTL: {news_ttl_hours}h)")
 
     try:
-        # Get all collections
-        collections = await doc_store.qdrant_client.get_collections()
-
-        # Filter for web_cache collections
-        cache_prefix = settings.web_cache_collection_prefix
-        cache_collections = [
-            c for c in collections.collections
-            if c.name.startswith(cache_prefix)
-        ]
-
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=news_ttl_hours)
-
-        for collection in cache_collections:
-            try:
-                deleted_count = await _delete_news_chunks(
-                    doc_store=doc_store,
-                    collection_name=collection.name,
-                    cutoff_time=cutoff_time,
-                )
+        async with _cleanup_lock(doc_store) as acquired:
+            if not acquired:
+                logger.info("News cache cleanup skipped: another cache cleanup is running")
+                return stats
+
+            # Get all collections
+            collections = await doc_store.qdrant_client.get_collections()
+
+            # Filter for web_cache collections
+            cache_prefix = settings.web_cache_collection_prefix
+            cache_collections = [
+                c for c in collections.collections
+                if c.name.startswith(cache_prefix)
+            ]
+
+            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=news_ttl_hours)
+
+            # One set-based DELETE across every cache collection
+            deleted = await _delete_collections_chunks(
+                doc_store=doc_store,
+                collection_names=[c.name for c in cache_collections],
+                cutoff_time=cutoff_time,
+                news_only=True,
+                max_concurrency=settings.web_cache_cleanup_concurrency,
+            )
 
-                stats["collections_processed"] += 1
-                stats["total_chunks_deleted"] += deleted_count
+            stats["collections_processed"] = len(cache_collections)
+            stats["total_chunks_deleted"] = sum(deleted.values())
 
+            for collection_name, deleted_count in deleted.items():
                 if deleted_count > 0:
                     logger.info(
-                        f"Cleaned {deleted_count} stale news chunks from {collection.name}"
+                        f"Cleaned {deleted_count} stale news chunks from {collection_name}"
                     )
 
-            except Exception as e:
-                logger.error(
-                    f"Error cleaning news from {collection.name}: {e}",
-                    exc_info=True
-                )
-                stats["errors"] += 1
-
-        logger.info(
-            f"News cache cleanup completed: "
-            f"{stats['total_chunks_deleted']} chunks deleted from "
-            f"{stats['collections_processed']} collections"
-        )
+            logger.info(
+                f"News cache cleanup completed: "
+                f"{stats['total_chunks_deleted']} chunks deleted from "
+                f"{stats['collections_processed']} collections"
+            )
 
-        return stats
+            return stats
 
     except Exception as e:
         logger.error(f"News cache cleanup failed: {e}", exc_info=True)
@@ -333,42 +499,27 @@ async def _delete_news_chunks(
 
     collection_id = row[0]
 
-    # Delete news chunks using metadata index
+    # Delete news chunks using metadata index, in bounded batches
     # This query uses ix_document_chunks_metadata_gin for efficient filtering
     delete_query = """
         DELETE FROM document_chunks
-        WHERE collection_id = :collection_id
-        AND metadata->>'source_type' = 'web'
-        AND metadata->>'topic' = 'news'
-        AND created_at < :cutoff_time
+        WHERE id IN (
+            SELECT id FROM document_chunks
+            WHERE collection_id = :collection_id
+            AND metadata->>'source_type' = 'web'
+            AND metadata->>'topic' = 'news'
+            AND created_at < :cutoff_time
+            ORDER BY created_at
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
         RETURNING id
     """
 
-    async with doc_store.db.session() as session:
-        result = await session.execute(
-            delete_query,
-            {
-                "collection_id": collection_id,
-                "cutoff_time": cutoff_time
-            }
-        )
-        deleted_ids = [row[0] for row in result.fetchall()]
-        await session.commit()
-
-    deleted_count = len(deleted_ids)
-
-    if deleted_count > 0:
-        # Delete from Qdrant
-        try:
-            from qdrant_client.models import PointIdsList
-
-            await doc_store.qdrant_client.delete(
-                collection_name=collection_name,
-                points_selector=PointIdsList(
-                    points=[str(chunk_id) for chunk_id in deleted_ids]
-                )
-            )
-        except Exception as e:
-            logger.error(f"Failed to delete news vectors from Qdrant: {e}")
-
-    return deleted_count
+    deleted = await _delete_in_batches(
+        doc_store=doc_store,
+        delete_query=delete_query,
+        params={"collection_id": collection_id, "cutoff_time": cutoff_time},
+        collection_name=collection_name,
+    )
+    return deleted.get(collection_name, 0)
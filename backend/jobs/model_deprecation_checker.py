@@ -3,6 +3,7 @@ Model Deprecation Checker
 Automated job to detect deprecated models and update approved models table
 """
 
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
@@ -64,6 +65,10 @@ class DeprecationReport:
 class ModelDeprecationChecker:
     """Check model availability across providers and detect deprecations"""
 
+    # Provider checks are independent HTTPS round-trips, so run them in parallel
+    MAX_CONCURRENT_CHECKS = 8
+    CHECK_TIMEOUT_SECONDS = 10
+
     def __init__(self, session: AsyncSession):
         self.session = session
         self.settings = get_settings()
@@ -82,12 +87,16 @@ class ModelDeprecationChecker:
         result = await self.session.execute(stmt)
         approved_models = result.scalars().all()
 
-        results: list[ModelCheckResult] = []
+        # Check every model concurrently (bounded), keeping input order
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_CHECKS)
+
+        async def guarded_check(model) -> ModelCheckResult:
+            async with semaphore:
+                return await self._check_model_with_timeout(model.provider, model.model_name)
 
-        # Check each model
-        for model in approved_models:
-            check_result = await self._check_model(model.provider, model.model_name)
-            results.append(check_result)
+        results: list[ModelCheckResult] = list(
+            await asyncio.gather(*(guarded_check(model) for model in approved_models))
+        )
 
         # Generate report
         active_count = sum(1 for r in results if r.status == "active")
@@ -107,6 +116,23 @@ class ModelDeprecationChecker:
             suggested_updates=suggested_updates,
         )
 
+    async def _check_model_with_timeout(
+        self, provider: str, model_name: str
+    ) -> ModelCheckResult:
+        """Check a model, reporting it as unknown if the provider is too slow"""
+        try:
+            return await asyncio.wait_for(
+                self._check_model(provider, model_name),
+                timeout=self.CHECK_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            return ModelCheckResult(
+                provider=provider,
+                model_name=model_name,
+                status="unknown",
+                error_message=f"Check timed out after {self.CHECK_TIMEOUT_SECONDS}s",
+            )
+
     async def _check_model(self, provider: str, model_name: str) -> ModelCheckResult:
         """
         Check if a specific model is available
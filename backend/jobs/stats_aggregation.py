@@ -27,6 +27,7 @@ from backend.repositories.performance_repository import (
     PerformanceRepository,
 )
 from backend.core.database import get_session_maker
+from backend.core.intelligent_router import invalidate_routing_cache
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +85,9 @@ class StatsAggregationJob:
 
             await session.commit()
 
+        # Routing decisions cached against the old stats are now stale
+        invalidate_routing_cache()
+
         duration = (datetime.utcnow() - start_time).total_seconds()
 
         result = {
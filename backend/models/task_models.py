@@ -79,6 +79,7 @@ class TaskCompletedEvent(BaseModel):
 
     type: str = "task_completed"
     task_id: UUID
+    old_status: TaskStatus | None = None  # Status before the terminal transition
     status: TaskStatus  # COMPLETED or FAILED
     result: str | None = None
     error_message: str | None = None
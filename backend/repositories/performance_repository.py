@@ -6,7 +6,7 @@ from datetime import datetime
 from uuid import UUID, uuid4
 from typing import List, Optional
 
-from sqlalchemy import select, update, desc, func, and_, or_, text
+from sqlalchemy import select, insert, update, desc, func, and_, or_, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, Text, Numeric, ARRAY
 from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB, JSON
@@ -145,6 +145,23 @@ class ObjectiveTemplateModel(Base):
     recommended_agents = Column(ARRAY(String), nullable=True)
 
 
+class RoutingDecisionModel(Base):
+    """Routing decisions made by the IntelligentRouter (for transparency / NLP analysis)"""
+
+    __tablename__ = "routing_decisions"
+
+    id = Column(PGUUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    task_id = Column(PGUUID(as_uuid=True), nullable=False, index=True)
+    command = Column(Text, nullable=True)
+    category = Column(String(50), nullable=False, index=True)
+    selected_agent_id = Column(String(50), nullable=False, index=True)
+    all_scores = Column(JSONB, nullable=True)
+    reason = Column(Text, nullable=True)
+    constraints = Column(JSONB, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, server_default="NOW()")
+
+
 # Repository Class
 
 class PerformanceRepository:
@@ -175,6 +192,39 @@ class PerformanceRepository:
             Created performance score record
         """
         score_record = AgentPerformanceScoreModel(
+            **self._score_row(task_id, agent_id, scores, metadata)
+        )
+
+        self.session.add(score_record)
+        await self.session.flush()
+        return score_record
+
+    async def save_performance_scores_bulk(self, rows: List[tuple]) -> int:
+        """
+        Save many performance scores with a single multi-row INSERT
+
+        Args:
+            rows: (task_id, agent_id, scores, metadata) tuples, as accepted
+                by save_performance_score
+
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+
+        values = [
+            self._score_row(task_id, agent_id, scores, metadata)
+            for task_id, agent_id, scores, metadata in rows
+        ]
+        await self.session.execute(insert(AgentPerformanceScoreModel).values(values))
+        return len(values)
+
+    @staticmethod
+    def _score_row(task_id: UUID, agent_id: str, scores: dict, metadata: Optional[dict]) -> dict:
+        """Build column values for an agent_performance_scores row"""
+        metadata = metadata or {}
+        return dict(
             id=str(uuid4()),
             task_id=str(task_id),
             agent_id=agent_id,
@@ -188,19 +238,15 @@ class PerformanceRepository:
             user_rating=scores.get("user_rating"),
             user_feedback=scores.get("user_feedback"),
             user_id=str(scores.get("user_id")) if scores.get("user_id") else None,
-            total_tokens=metadata.get("total_tokens") if metadata else None,
-            estimated_cost=metadata.get("estimated_cost") if metadata else None,
-            cost_per_quality_point=metadata.get("cost_per_quality_point") if metadata else None,
-            model_used=metadata.get("model_used") if metadata else None,
-            temperature=metadata.get("temperature") if metadata else None,
-            duration_seconds=metadata.get("duration_seconds") if metadata else None,
+            total_tokens=metadata.get("total_tokens"),
+            estimated_cost=metadata.get("estimated_cost"),
+            cost_per_quality_point=metadata.get("cost_per_quality_point"),
+            model_used=metadata.get("model_used"),
+            temperature=metadata.get("temperature"),
+            duration_seconds=metadata.get("duration_seconds"),
             created_at=datetime.utcnow()
         )
 
-        self.session.add(score_record)
-        await self.session.flush()
-        return score_record
-
     async def update_user_feedback(
         self,
         task_id: UUID,
@@ -14,6 +14,23 @@ from backend.models.base import Base
 from backend.models.prompt_models import AgentPrompt, PromptCreate, PromptUpdate
 
 
+# Last known prompt version per agent: the newest updated_at across the
+# agent's rows in agent_prompts. Every read of those timestamps (compiles,
+# writes through PromptRepository, PromptEngineer's periodic poll) refreshes
+# it, so writes made by other worker processes are picked up too.
+_prompt_versions: dict[str, datetime] = {}
+
+
+def get_prompt_version(agent_id: str) -> datetime | None:
+    """Last known prompt version for an agent (None if it has no prompts)"""
+    return _prompt_versions.get(agent_id)
+
+
+def set_prompt_versions(versions: dict[str, datetime]) -> None:
+    """Record prompt versions read from the database"""
+    _prompt_versions.update(versions)
+
+
 class AgentPromptModel(Base):
     """SQLAlchemy model for agent_prompts table"""
 
@@ -51,6 +68,7 @@ class PromptRepository:
         self.session.add(model)
         await self.session.commit()
         await self.session.refresh(model)
+        set_prompt_versions(await self.get_prompt_versions([model.agent_id]))
 
         return self._model_to_pydantic(model)
 
@@ -77,6 +95,38 @@ class PromptRepository:
 
         return [self._model_to_pydantic(m) for m in models]
 
+    async def get_active_prompts_bulk(self, agent_ids: list[str]) -> dict[str, list[AgentPrompt]]:
+        """Get active prompts for several agents in one query, grouped by agent"""
+        grouped: dict[str, list[AgentPrompt]] = {agent_id: [] for agent_id in agent_ids}
+        if not agent_ids:
+            return grouped
+
+        stmt = (
+            select(AgentPromptModel)
+            .where(AgentPromptModel.agent_id.in_(agent_ids), AgentPromptModel.active == True)
+            .order_by(desc(AgentPromptModel.created_at))
+        )
+        result = await self.session.execute(stmt)
+
+        for model in result.scalars().all():
+            grouped[model.agent_id].append(self._model_to_pydantic(model))
+
+        return grouped
+
+    async def get_prompt_versions(self, agent_ids: list[str]) -> dict[str, datetime]:
+        """Get each agent's prompt version (newest updated_at across its prompts)"""
+        if not agent_ids:
+            return {}
+
+        stmt = (
+            select(AgentPromptModel.agent_id, func.max(AgentPromptModel.updated_at))
+            .where(AgentPromptModel.agent_id.in_(agent_ids))
+            .group_by(AgentPromptModel.agent_id)
+        )
+        result = await self.session.execute(stmt)
+
+        return dict(result.all())
+
     async def update_prompt(self, prompt_id: UUID, prompt_update: PromptUpdate) -> AgentPrompt:
         """Update prompt"""
         update_data = {}
@@ -97,7 +147,11 @@ class PromptRepository:
             await self.session.execute(stmt)
             await self.session.commit()
 
-        return await self.get_prompt(prompt_id)
+        prompt = await self.get_prompt(prompt_id)
+        if update_data and prompt is not None:
+            set_prompt_versions(await self.get_prompt_versions([prompt.agent_id]))
+
+        return prompt
 
     def _model_to_pydantic(self, model: AgentPromptModel) -> AgentPrompt:
         """Convert SQLAlchemy model to Pydantic model"""
@@ -276,6 +276,28 @@ class ScheduledCommandRepository:
         await self.session.execute(stmt)
         await self.session.commit()
 
+    async def bulk_update_next_run(self, rows: list[tuple[UUID, datetime]]) -> None:
+        """Update next_run_at for many commands in one executemany UPDATE"""
+        from sqlalchemy import update
+
+        if not rows:
+            return
+
+        # Convert UUIDs to strings for SQLite compatibility (as in update_next_run)
+        updated_at = datetime.utcnow()
+        await self.session.execute(
+            update(ScheduledCommandModel),
+            [
+                {
+                    "id": str(command_id) if isinstance(command_id, UUID) else command_id,
+                    "next_run_at": next_run_at,
+                    "updated_at": updated_at,
+                }
+                for command_id, next_run_at in rows
+            ],
+        )
+        await self.session.commit()
+
     async def delete_scheduled_command(self, command_id: UUID) -> bool:
         """Delete a scheduled command"""
         from sqlalchemy import delete
@@ -7,6 +7,7 @@ Run this script to create the new tables for agent performance tracking:
 - agent_node_performance
 - agent_performance_stats
 - objective_templates
+- routing_decisions
 
 Usage:
     python -m backend.scripts.init_performance_tables
@@ -28,6 +29,7 @@ from backend.repositories.performance_repository import (
     AgentNodePerformanceModel,
     AgentPerformanceStatsModel,
     ObjectiveTemplateModel,
+    RoutingDecisionModel,
 )
 
 
@@ -53,6 +55,7 @@ async def init_performance_tables():
             AgentNodePerformanceModel,
             AgentPerformanceStatsModel,
             ObjectiveTemplateModel,
+            RoutingDecisionModel,
         )
 
         # Create only the performance tables (not all Base tables)
@@ -65,6 +68,7 @@ async def init_performance_tables():
                     AgentNodePerformanceModel.__table__,
                     AgentPerformanceStatsModel.__table__,
                     ObjectiveTemplateModel.__table__,
+                    RoutingDecisionModel.__table__,
                 ],
                 checkfirst=True  # Only create if doesn't exist
             )
@@ -77,6 +81,7 @@ async def init_performance_tables():
     print("  - agent_node_performance")
     print("  - agent_performance_stats")
     print("  - objective_templates")
+    print("  - routing_decisions")
 
     await engine.dispose()
 
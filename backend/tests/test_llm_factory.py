@@ -11,9 +11,18 @@ from backend.core.llm_factory import (
     create_llm,
     get_default_config,
     DEFAULT_CONFIGS,
+    _build_llm,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_llm_cache():
+    """Keep cached clients (including patched mocks) from leaking between tests"""
+    _build_llm.cache_clear()
+    yield
+    _build_llm.cache_clear()
+
+
 class TestModelConfig:
     """Tests for ModelConfig dataclass"""
 
@@ -89,6 +98,17 @@ class TestDefaultConfigs:
             assert config.provider == "openai"
             assert config.model_name == "gpt-4o-mini"
 
+    def test_default_configs_are_read_only(self):
+        """Should not allow defaults to be replaced or mutated"""
+        with pytest.raises(TypeError):
+            DEFAULT_CONFIGS["agent_a"] = ModelConfig(provider="openai", model_name="gpt-4o")
+
+        config = DEFAULT_CONFIGS["agent_a"]
+        with pytest.raises(AttributeError):
+            config.temperature = 0.0
+        with pytest.raises(TypeError):
+            config.model_params["top_p"] = 0.5
+
 
 class TestGetDefaultConfig:
     """Tests for get_default_config function"""
@@ -231,6 +251,64 @@ class TestCreateLLM:
             create_llm(config)
 
 
+class TestLLMCache:
+    """Tests for client reuse in create_llm"""
+
+    @patch("backend.core.llm_factory.ChatOpenAI")
+    def test_identical_requests_share_instance(self, mock_chat_openai):
+        """Should build one client for repeated identical requests"""
+        config = get_default_config("agent_a")
+
+        first = create_llm(config, temperature=0.3)
+        second = create_llm(config, temperature=0.3)
+
+        assert first is second
+        mock_chat_openai.assert_called_once()
+
+    @patch("backend.core.llm_factory.ChatOpenAI")
+    def test_overrides_are_part_of_cache_key(self, mock_chat_openai):
+        """Should build separate clients for different overrides"""
+        config = get_default_config("agent_a")
+
+        create_llm(config, temperature=0.3)
+        create_llm(config, temperature=0.0)
+        create_llm(config, temperature=0.0, streaming=True)
+
+        assert mock_chat_openai.call_count == 3
+
+    @patch("backend.core.llm_factory.ChatOpenAI")
+    def test_openai_uses_shared_http_client(self, mock_chat_openai):
+        """Should route OpenAI calls through the pooled HTTP client"""
+        client = MagicMock()
+
+        with patch("backend.core.llm_factory.get_http_client", return_value=client):
+            create_llm(get_default_config("agent_a"))
+
+        assert mock_chat_openai.call_args[1]["http_async_client"] is client
+
+    @patch("backend.core.llm_factory.ChatOpenAI")
+    def test_new_http_client_builds_new_llm(self, mock_chat_openai):
+        """Should not reuse a cached model bound to a replaced HTTP client"""
+        config = get_default_config("agent_a")
+
+        for client in (MagicMock(), MagicMock()):
+            with patch("backend.core.llm_factory.get_http_client", return_value=client):
+                create_llm(config)
+
+        assert mock_chat_openai.call_count == 2
+
+    @patch("backend.core.llm_factory.ChatOpenAI")
+    def test_unhashable_params_bypass_cache(self, mock_chat_openai):
+        """Should still build clients when params can't be hashed"""
+        config = get_default_config("agent_a")
+
+        create_llm(config, stop=["END"])
+        create_llm(config, stop=["END"])
+
+        assert mock_chat_openai.call_count == 2
+        assert mock_chat_openai.call_args[1]["stop"] == ["END"]
+
+
 class TestIntegrationScenarios:
     """Integration tests for common usage patterns"""
 
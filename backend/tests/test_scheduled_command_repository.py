@@ -331,6 +331,34 @@ async def test_update_next_run(test_session, sample_cron_command):
     assert updated.last_run_status == ExecutionStatus.SUCCESS
 
 
+@pytest.mark.asyncio
+async def test_bulk_update_next_run(test_session, sample_cron_command, sample_interval_command):
+    """Test updating next_run_at for several commands at once"""
+    repo = ScheduledCommandRepository(test_session)
+
+    from unittest.mock import patch, MagicMock
+    mock_agent = MagicMock()
+    mock_agent.nickname = "alice"
+
+    with patch('backend.agents.base.agent_registry.AgentRegistry.get_specialist', return_value=mock_agent):
+        first = await repo.create_scheduled_command(sample_cron_command)
+        second = await repo.create_scheduled_command(sample_interval_command)
+
+    first_run = datetime.utcnow() + timedelta(hours=1)
+    second_run = datetime.utcnow() + timedelta(hours=2)
+
+    await repo.bulk_update_next_run([(first.id, first_run), (second.id, second_run)])
+    test_session.expire_all()
+
+    updated_first = await repo.get_scheduled_command(first.id)
+    updated_second = await repo.get_scheduled_command(second.id)
+    assert updated_first.next_run_at.replace(tzinfo=None) == first_run
+    assert updated_second.next_run_at.replace(tzinfo=None) == second_run
+
+    # Empty input is a no-op
+    await repo.bulk_update_next_run([])
+
+
 @pytest.mark.asyncio
 async def test_delete_scheduled_command(test_session, sample_cron_command):
     """Test deleting a scheduled command"""
@@ -403,6 +403,19 @@ async def test_get_scheduler_status(test_client):
     assert 'jobs' in data
 
 
+@pytest.mark.asyncio
+async def test_get_scheduler_summary(test_client):
+    """Test getting scheduler summary without the job list"""
+    response = await test_client.get("/api/scheduled-commands/scheduler/summary")
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert 'running' in data
+    assert 'jobs_count' in data
+    assert 'jobs' not in data
+
+
 @pytest.mark.asyncio
 async def test_filter_schedules_by_agent(test_client, sample_user_id):
     """Test filtering schedules by agent_id"""
@@ -6,7 +6,7 @@ Tests the scheduler logic without full integration
 import pytest
 from datetime import datetime, timedelta
 from uuid import uuid4
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import pytz
 
 from backend.core.scheduler import CommandSchedulerService
@@ -350,3 +350,290 @@ async def test_calculate_next_run_daily_interval():
 
     # Allow 1 minute tolerance
     assert timedelta(days=1, minutes=-1) <= time_diff <= timedelta(days=1, minutes=1)
+
+
+@pytest.mark.asyncio
+async def test_cron_parsing_is_cached():
+    """Test cron expressions are parsed once and shared by trigger and next run"""
+    from backend.core import scheduler as scheduler_module
+
+    scheduler = CommandSchedulerService()
+    scheduler_module._get_cron_trigger.cache_clear()
+    scheduler_module._next_cron_run.cache_clear()
+
+    schedules = [
+        ScheduledCommand(
+            id=uuid4(),
+            user_id=uuid4(),
+            command_text="@test task",
+            agent_id="agent_test",
+            agent_nickname="test",
+            schedule_type=ScheduleType.CRON,
+            cron_expression="*/15 * * * *",
+            timezone="America/New_York",
+            enabled=True,
+            interval_value=None,
+            interval_unit=None,
+            max_retries=3,
+            retry_delay_minutes=5,
+            timeout_seconds=300,
+            description=None,
+            tags=[],
+            metadata={},
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+        )
+        for _ in range(3)
+    ]
+
+    triggers = [scheduler._create_trigger(s) for s in schedules]
+    next_runs = [scheduler._calculate_next_run(s) for s in schedules]
+
+    assert triggers[0] is triggers[1] is triggers[2]
+    assert scheduler_module._get_cron_trigger.cache_info().misses == 1
+    assert max(next_runs) - min(next_runs) < timedelta(minutes=15)
+    assert all(run.minute % 15 == 0 for run in next_runs)
+
+
+def test_next_cron_run_sparse_and_minute_aligned():
+    """Test sparse crons resolve directly and results are minute-aligned"""
+    from backend.core.scheduler import _next_cron_run
+
+    tz = pytz.timezone("UTC")
+    after = tz.localize(datetime(2025, 3, 1, 12, 0))
+
+    assert _next_cron_run("0 0 1 1 *", "UTC", after) == tz.localize(datetime(2026, 1, 1))
+    assert _next_cron_run("0 0 29 2 *", "UTC", after) == tz.localize(datetime(2028, 2, 29))
+    # Strictly after: a schedule on the current minute fires next period
+    assert _next_cron_run("0 12 * * *", "UTC", after) == tz.localize(datetime(2025, 3, 2, 12, 0))
+
+
+def _make_cron_schedule(**overrides):
+    """Build a minimal enabled cron ScheduledCommand"""
+    fields = dict(
+        id=uuid4(),
+        user_id=uuid4(),
+        command_text="@test task",
+        agent_id="agent_test",
+        agent_nickname="test",
+        schedule_type=ScheduleType.CRON,
+        cron_expression="0 9 * * *",
+        timezone="UTC",
+        enabled=True,
+        interval_value=None,
+        interval_unit=None,
+        max_retries=3,
+        retry_delay_minutes=5,
+        timeout_seconds=300,
+        description=None,
+        tags=[],
+        metadata={},
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+    )
+    fields.update(overrides)
+    return ScheduledCommand(**fields)
+
+
+def _mock_session_maker():
+    """Session maker whose sessions work as async context managers"""
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=session)
+
+
+@pytest.mark.asyncio
+async def test_load_enabled_schedules_uses_preloaded_objects():
+    """Test startup loading adds every schedule without refetching it"""
+    scheduler = CommandSchedulerService()
+    scheduler.scheduler = MagicMock()
+
+    good = _make_cron_schedule()
+    bad = _make_cron_schedule(cron_expression="not a cron")
+    other = _make_cron_schedule(cron_expression="*/5 * * * *")
+
+    repo = MagicMock()
+    repo.get_enabled_scheduled_commands = AsyncMock(return_value=[good, bad, other])
+    repo.get_scheduled_command = AsyncMock()
+    repo.update_next_run = AsyncMock()
+    repo.bulk_update_next_run = AsyncMock()
+
+    with patch("backend.core.scheduler.get_session_maker", return_value=_mock_session_maker()), \
+         patch("backend.core.scheduler.ScheduledCommandRepository", return_value=repo):
+        await scheduler._load_enabled_schedules()
+
+    repo.get_scheduled_command.assert_not_called()
+
+    # All next runs recorded with one bulk UPDATE
+    repo.update_next_run.assert_not_called()
+    repo.bulk_update_next_run.assert_awaited_once()
+    (rows,), _ = repo.bulk_update_next_run.call_args
+    assert [schedule_id for schedule_id, _ in rows] == [good.id, other.id]
+
+    added_ids = {c.kwargs["id"] for c in scheduler.scheduler.add_job.call_args_list}
+    assert added_ids == {
+        f"scheduled_command_{good.id}",
+        f"scheduled_command_{other.id}",
+    }
+
+
+@pytest.mark.asyncio
+async def test_warm_jobstore_pool():
+    """Test pool warm-up opens each connection and tolerates a down database"""
+    engine = MagicMock()
+
+    await CommandSchedulerService._warm_jobstore_pool(engine, 3)
+
+    assert engine.connect.call_count == 3
+    assert engine.connect.return_value.__enter__.return_value.execute.call_count == 3
+
+    engine.connect.side_effect = ConnectionRefusedError("database down")
+
+    # Must not raise
+    await CommandSchedulerService._warm_jobstore_pool(engine, 2)
+
+
+@pytest.mark.asyncio
+async def test_jobstore_shares_sync_engine():
+    """Test the job store reuses the app's sync engine instead of building one"""
+    from backend.core.database import get_sync_engine
+
+    scheduler = CommandSchedulerService()
+    with patch.object(CommandSchedulerService, "_warm_jobstore_pool", AsyncMock()):
+        await scheduler.initialize()
+
+    engine = get_sync_engine()
+    assert scheduler.scheduler._jobstores["default"].engine is engine
+    assert engine is get_sync_engine()
+    assert "+" not in engine.url.drivername  # default sync driver, not asyncpg
+
+
+@pytest.mark.asyncio
+async def test_job_id_matches_persisted_format():
+    """Test job ids keep the str(UUID) form already stored in the job store"""
+    schedule_id = uuid4()
+    scheduler = CommandSchedulerService()
+    scheduler.scheduler = MagicMock()
+
+    assert CommandSchedulerService._job_id(schedule_id) == f"scheduled_command_{schedule_id}"
+
+    await scheduler.pause_schedule(schedule_id)
+    await scheduler.resume_schedule(schedule_id)
+    await scheduler.remove_schedule(schedule_id)
+
+    expected = CommandSchedulerService._job_id(schedule_id)
+    scheduler.scheduler.pause_job.assert_called_once_with(expected)
+    scheduler.scheduler.resume_job.assert_called_once_with(expected)
+    scheduler.scheduler.remove_job.assert_called_once_with(expected)
+
+
+@pytest.mark.asyncio
+async def test_update_schedule_upserts_loaded_schedule():
+    """Test updating with a loaded schedule replaces the job without a fetch or remove"""
+    scheduler = CommandSchedulerService()
+    scheduler.scheduler = MagicMock()
+    schedule = _make_cron_schedule()
+
+    repo = MagicMock()
+    repo.get_scheduled_command = AsyncMock()
+    repo.update_next_run = AsyncMock()
+
+    assert await scheduler.update_schedule(schedule, repo) is True
+
+    repo.get_scheduled_command.assert_not_called()
+    repo.update_next_run.assert_awaited_once()
+    scheduler.scheduler.remove_job.assert_not_called()
+    add_kwargs = scheduler.scheduler.add_job.call_args.kwargs
+    assert add_kwargs["id"] == f"scheduled_command_{schedule.id}"
+    assert add_kwargs["replace_existing"] is True
+
+
+@pytest.mark.asyncio
+async def test_update_schedule_drops_unschedulable_job():
+    """Test a schedule that can no longer run loses its existing job"""
+    from apscheduler.jobstores.base import JobLookupError
+
+    scheduler = CommandSchedulerService()
+    scheduler.scheduler = MagicMock()
+    schedule = _make_cron_schedule(enabled=False)
+
+    assert await scheduler.update_schedule(schedule, MagicMock()) is False
+    scheduler.scheduler.add_job.assert_not_called()
+    scheduler.scheduler.remove_job.assert_called_once_with(f"scheduled_command_{schedule.id}")
+
+    # No job registered yet is not an error
+    scheduler.scheduler.remove_job.side_effect = JobLookupError("missing")
+    assert await scheduler.update_schedule(schedule, MagicMock()) is False
+
+
+def test_scheduler_summary_and_job_paging():
+    """Test summary skips the job list and iter_jobs pages lazily"""
+    scheduler = CommandSchedulerService()
+
+    assert scheduler.get_scheduler_summary() == {
+        "running": False, "initialized": False, "jobs_count": 0,
+    }
+    assert list(scheduler.iter_jobs()) == []
+
+    jobs = []
+    for i in range(5):
+        job = MagicMock(id=f"job_{i}", next_run_time=None)
+        job.name = f"Job {i}"
+        jobs.append(job)
+    scheduler.scheduler = MagicMock(running=True)
+    scheduler.scheduler.get_jobs.return_value = jobs
+
+    summary = scheduler.get_scheduler_summary()
+    assert summary == {"running": True, "initialized": False, "jobs_count": 5}
+
+    assert [j.id for j in scheduler.iter_jobs(limit=2, offset=1)] == ["job_1", "job_2"]
+    assert [j.id for j in scheduler.iter_jobs(offset=3)] == ["job_3", "job_4"]
+
+    status = scheduler.get_scheduler_status(limit=1)
+    assert status["jobs_count"] == 5
+    assert status["jobs"] == [{"id": "job_0", "name": "Job 0", "next_run": None}]
+
+
+@pytest.mark.asyncio
+async def test_threadpool_executor_for_blocking_jobs():
+    """Test blocking system jobs can be routed off the event loop"""
+    from apscheduler.executors.pool import ThreadPoolExecutor
+
+    scheduler = CommandSchedulerService()
+    with patch.object(CommandSchedulerService, "_warm_jobstore_pool", AsyncMock()):
+        await scheduler.initialize()
+
+    assert isinstance(scheduler.scheduler._lookup_executor("threadpool"), ThreadPoolExecutor)
+
+    scheduler.scheduler = MagicMock()
+    await scheduler.add_system_job(
+        job_id="system_blocking",
+        job_function=lambda: None,
+        trigger=MagicMock(),
+        name="Blocking job",
+        executor="threadpool",
+    )
+    assert scheduler.scheduler.add_job.call_args.kwargs["executor"] == "threadpool"
+
+
+@pytest.mark.parametrize("unit,value,expected", [
+    (IntervalUnit.MINUTES, 30, timedelta(minutes=30)),
+    (IntervalUnit.HOURS, 2, timedelta(hours=2)),
+    (IntervalUnit.DAYS, 3, timedelta(days=3)),
+])
+def test_interval_units_map_to_trigger_and_next_run(unit, value, expected):
+    """Test each interval unit yields matching trigger interval and next run"""
+    scheduler = CommandSchedulerService()
+    schedule = _make_cron_schedule(
+        schedule_type=ScheduleType.INTERVAL,
+        cron_expression=None,
+        interval_value=value,
+        interval_unit=unit,
+    )
+
+    before = datetime.now(pytz.UTC)
+    next_run = scheduler._calculate_next_run(schedule)
+
+    assert scheduler._create_trigger(schedule).interval == expected
+    assert before + expected <= next_run <= datetime.now(pytz.UTC) + expected
@@ -87,7 +87,9 @@ export const useTaskStore = create<TaskStore>((set, get) => ({
         break;
 
       case "task_completed":
-        console.log("  → Task completed with result:", event.task_id, event.status);
+        // Single terminal signal: the backend no longer sends task_status_changed
+        // for COMPLETED/FAILED, so the status transition is applied here
+        console.log("  → Task completed with result:", event.task_id, event.old_status, "→", event.status);
         updateTask(event.task_id, {
           status: event.status,
           result: event.result || null,
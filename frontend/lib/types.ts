@@ -74,6 +74,7 @@ export interface TaskDeletedEvent {
 export interface TaskCompletedEvent {
   type: "task_completed";
   task_id: string;
+  old_status?: TaskStatus | null;
   status: TaskStatus;
   result?: string | null;
   error_message?: string | null;
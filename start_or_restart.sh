@@ -193,7 +193,7 @@ print_info "Starting backend server..."
 
 # Check if uvicorn is available
 if command -v uvicorn &> /dev/null; then
-    nohup uvicorn backend.api.main:app --reload --host 0.0.0.0 --port 8000 > "$BACKEND_LOG" 2>&1 &
+    nohup uvicorn backend.api.main:app --reload --loop "${EVENT_LOOP:-uvloop}" --host 0.0.0.0 --port 8000 > "$BACKEND_LOG" 2>&1 &
     BACKEND_PID=$!
     echo "$BACKEND_PID" > "$BACKEND_PID_FILE"
 
@@ -117,3 +117,28 @@ class TestDocumentStoreSingleton:
 
             # Constructor should only be called once
             MockDocumentStore.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_access_connects_once(self):
+        """Concurrent first callers share one connected instance"""
+        import asyncio
+
+        with patch('backend.core.dependencies.DocumentStore') as MockDocumentStore:
+            mock_instance = AsyncMock()
+            connected = []
+
+            async def slow_connect():
+                await asyncio.sleep(0.01)
+                connected.append(True)
+
+            mock_instance.connect.side_effect = slow_connect
+            MockDocumentStore.return_value = mock_instance
+
+            results = await asyncio.gather(*[
+                get_document_store() for _ in range(10)
+            ])
+
+            # Every caller got the instance only after it finished connecting
+            assert all(r is mock_instance for r in results)
+            assert connected == [True]
+            MockDocumentStore.assert_called_once()
@@ -0,0 +1,350 @@
+"""
+Unit tests for ExecutionTracker
+"""
+
+import json
+import time
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+from backend.core.execution_tracker import (
+    ExecutionTracker,
+    acquire_tracker,
+    release_tracker,
+    _calculate_efficiency,
+    _format_timestamp,
+    _sanitize,
+    enqueue_performance_score,
+    shutdown_performance_writer,
+)
+
+
+@pytest.fixture
+def tracker():
+    """Fresh ExecutionTracker"""
+    return ExecutionTracker()
+
+
+class TestStepPairing:
+    """Start/end callbacks are matched by run_id"""
+
+    def test_durations_assigned_with_more_than_ten_steps_in_flight(self, tracker):
+        """Ends pair with their own start even past step_9/step_10"""
+        run_ids = [uuid4() for _ in range(12)]
+        for i, run_id in enumerate(run_ids):
+            tracker.on_chain_start({}, {"i": i}, name=f"node_{i}", run_id=run_id)
+
+        for i, run_id in reversed(list(enumerate(run_ids))):
+            tracker.on_chain_end({"done": i}, run_id=run_id)
+
+        assert len(tracker.flow) == 12
+        for i, step in enumerate(tracker.flow):
+            assert step.outputs == {"done": i}
+            assert step.duration_ms is not None and step.duration_ms >= 0
+
+    def test_nested_tool_does_not_steal_node_end(self, tracker):
+        """A node's end is recorded even when a tool ran inside it"""
+        node_run, tool_run = uuid4(), uuid4()
+        tracker.on_chain_start({}, {"q": "x"}, name="research", run_id=node_run)
+        tracker.on_tool_start({"name": "web_search"}, "query", run_id=tool_run)
+        tracker.on_tool_end("results", run_id=tool_run)
+        tracker.on_chain_end({"answer": "y"}, run_id=node_run)
+
+        node, tool = tracker.flow
+        assert node.outputs == {"answer": "y"}
+        assert tool.outputs == {"output": "results"}
+
+    def test_internal_chain_end_is_ignored(self, tracker):
+        """Ends of filtered LangGraph internals do not touch recorded steps"""
+        node_run = uuid4()
+        tracker.on_chain_start({}, {}, name="__start__", run_id=uuid4())
+        tracker.on_chain_start({}, {}, name="research", run_id=node_run)
+        tracker.on_chain_end({"internal": True}, run_id=uuid4())
+
+        assert len(tracker.flow) == 1
+        assert tracker.flow[0].outputs is None
+
+        tracker.on_chain_end({"answer": "y"}, run_id=node_run)
+        assert tracker.flow[0].outputs == {"answer": "y"}
+
+    def test_llm_error_marks_step_failed(self, tracker):
+        """LLM errors are recorded on the matching step"""
+        run_id = uuid4()
+        tracker.on_llm_start({}, ["prompt"], invocation_params={"model": "claude"}, run_id=run_id)
+        tracker.on_llm_error(RuntimeError("boom"), run_id=run_id)
+
+        step = tracker.flow[0]
+        assert step.metadata["status"] == "failed"
+        assert step.metadata["error"] == "boom"
+
+    def test_llm_end_records_token_usage(self, tracker):
+        """Token usage is read from llm_output when present"""
+        with_usage, without_usage = uuid4(), uuid4()
+        tracker.on_llm_start({}, ["a"], run_id=with_usage)
+        tracker.on_llm_start({}, ["b"], run_id=without_usage)
+
+        tracker.on_llm_end(SimpleNamespace(llm_output={"token_usage": {"total_tokens": 7}}), run_id=with_usage)
+        tracker.on_llm_end(object(), run_id=without_usage)
+
+        assert tracker.flow[0].metadata["tokens"] == {"total_tokens": 7}
+        assert "tokens" not in tracker.flow[1].metadata
+
+
+class TestTimestampFormat:
+    """Step timestamp formatting"""
+
+    @pytest.mark.parametrize("offset", [0.0, 0.5, 0.123456, 0.9999996, 1.000001])
+    def test_timestamp_format_matches_isoformat(self, offset):
+        """Cached-prefix formatting matches datetime.isoformat()"""
+        ts = float(int(time.time())) + offset
+        assert _format_timestamp(ts) == datetime.fromtimestamp(ts).isoformat()
+
+
+class TestTrace:
+    """Serialized trace output"""
+
+    def test_trace_has_iso_timestamps(self, tracker):
+        """Timestamps serialize as ISO strings"""
+        run_id = uuid4()
+        tracker.on_tool_start({"name": "calc"}, "1+1", run_id=run_id)
+        tracker.on_tool_end("2", run_id=run_id)
+
+        trace = tracker.get_trace()
+        assert trace[0]["type"] == "tool"
+        assert trace[0]["name"] == "calc"
+        assert "T" in trace[0]["timestamp"]
+
+    def test_summary_counts_steps(self, tracker):
+        """Summary reflects recorded steps"""
+        for name in ("plan", "act"):
+            run_id = uuid4()
+            tracker.on_chain_start({}, {}, name=name, run_id=run_id)
+            tracker.on_chain_end({}, run_id=run_id)
+        tracker.on_tool_start({"name": "search"}, "q", run_id=uuid4())
+
+        summary = tracker.get_summary()
+        assert summary["total_steps"] == 3
+        assert summary["step_counts"] == {"node": 2, "tool": 1}
+        assert summary["nodes"] == ["plan", "act"]
+        assert summary["tools"] == ["search"]
+        assert summary["total_duration_ms"] == pytest.approx(
+            sum(step.duration_ms for step in tracker.flow if step.duration_ms is not None)
+        )
+
+    def test_max_steps_keeps_latest_and_exact_summary(self):
+        """Bounded flow evicts old steps; summary still counts them"""
+        tracker = ExecutionTracker(max_steps=3)
+        for i in range(5):
+            run_id = uuid4()
+            tracker.on_chain_start({}, {}, name=f"node_{i}", run_id=run_id)
+            tracker.on_chain_end({}, run_id=run_id)
+
+        assert [step["name"] for step in tracker.get_trace()] == ["node_2", "node_3", "node_4"]
+        assert tracker.get_summary()["total_steps"] == 5
+
+    def test_clear_resets_state(self, tracker):
+        """clear() drops recorded and in-flight steps"""
+        tracker.on_chain_start({}, {}, name="plan", run_id=uuid4())
+        tracker.clear()
+
+        assert tracker.get_trace() == []
+        assert tracker.get_summary()["total_steps"] == 0
+
+    def test_finished_steps_are_serialized_once(self, tracker):
+        """Completed steps reuse their dict; in-flight steps are rebuilt"""
+        done_run, open_run = uuid4(), uuid4()
+        tracker.on_tool_start({"name": "calc"}, "1+1", run_id=done_run)
+        tracker.on_tool_end("2", run_id=done_run)
+        tracker.on_chain_start({}, {}, name="plan", run_id=open_run)
+
+        first, second = tracker.get_trace(), tracker.get_trace()
+        assert first[0] is second[0]
+        assert first[1]["outputs"] is None
+
+        tracker.on_chain_end({"plan": "done"}, run_id=open_run)
+        assert tracker.get_trace()[1]["outputs"] == {"plan": "done"}
+
+    def test_trace_bytes_round_trip(self, tracker):
+        """get_trace_bytes() encodes the same trace as get_trace()"""
+        run_id = uuid4()
+        tracker.on_chain_start({}, {"task_id": uuid4()}, name="plan", run_id=run_id)
+        tracker.on_chain_end({"steps": [1, 2]}, run_id=run_id)
+
+        assert json.loads(tracker.get_trace_bytes()) == tracker.get_trace()
+
+
+class TestSampling:
+    """Per-execution trace sampling"""
+
+    def test_unsampled_execution_records_nothing(self):
+        """With sample_rate=0 start callbacks are skipped"""
+        tracker = ExecutionTracker(sample_rate=0.0)
+        run_id = uuid4()
+        tracker.on_chain_start({}, {}, name="plan", run_id=run_id)
+        tracker.on_chain_end({}, run_id=run_id)
+        tracker.on_tool_start({"name": "search"}, "q", run_id=uuid4())
+
+        assert tracker.get_trace() == []
+
+    def test_errors_recorded_when_unsampled(self):
+        """Errors are kept even when the execution is not sampled"""
+        tracker = ExecutionTracker(sample_rate=0.0)
+        run_id = uuid4()
+        tracker.on_llm_start({}, ["prompt"], run_id=run_id)
+        tracker.on_llm_error(RuntimeError("boom"), run_id=run_id)
+
+        step = tracker.flow[0]
+        assert step.step_type == "llm"
+        assert step.metadata == {"sampled": False, "error": "boom", "status": "failed"}
+
+    def test_errors_dropped_when_disabled(self):
+        """always_sample_errors=False drops errors of unsampled executions"""
+        tracker = ExecutionTracker(sample_rate=0.0, always_sample_errors=False)
+        tracker.on_tool_error(RuntimeError("boom"), run_id=uuid4())
+
+        assert tracker.get_trace() == []
+
+
+class TestPayloadCapture:
+    """Payload size bounds applied at ingestion"""
+
+    def test_oversized_payload_replaced_with_preview(self):
+        """Inputs above max_payload_bytes are not retained"""
+        tracker = ExecutionTracker(max_payload_bytes=100)
+        tracker.on_chain_start({}, {"document": "x" * 10_000}, name="load", run_id=uuid4())
+
+        captured = tracker.flow[0].inputs
+        assert captured["_truncated"] is True
+        assert captured["approx_size"] >= 10_000
+        assert len(captured["preview"]) <= 256
+
+    def test_small_payload_kept_by_reference(self):
+        """Inputs under the cap are stored as-is"""
+        tracker = ExecutionTracker(max_payload_bytes=100)
+        inputs = {"query": "short"}
+        tracker.on_chain_start({}, inputs, name="plan", run_id=uuid4())
+
+        assert tracker.flow[0].inputs is inputs
+
+    def test_keep_payloads_false_records_descriptors(self):
+        """With keep_payloads=False only type and size are recorded"""
+        tracker = ExecutionTracker(keep_payloads=False)
+        run_id = uuid4()
+        tracker.on_tool_start({"name": "search"}, "query", run_id=run_id)
+        tracker.on_tool_end("results", run_id=run_id)
+
+        step = tracker.flow[0]
+        assert step.inputs == {"input": {"_type": "str", "approx_size": 5}}
+        assert step.outputs == {"output": {"_type": "str", "approx_size": 7}}
+
+
+class TestSanitize:
+    """Trace payload sanitization"""
+
+    def test_nested_structure(self):
+        """Strings truncated, lists capped, UUIDs and unknown types stringified"""
+        task_id = uuid4()
+        data = {
+            "text": "x" * 600,
+            "items": list(range(25)),
+            "nested": {"id": task_id, "flags": (True, None, 1.5)},
+            "callback": object(),
+        }
+
+        result = _sanitize(data)
+
+        assert list(result) == ["text", "items", "nested", "callback"]
+        assert result["text"] == "x" * 500 + "..."
+        assert result["items"] == list(range(10))
+        assert result["nested"] == {"id": str(task_id), "flags": [True, None, 1.5]}
+        assert isinstance(result["callback"], str)
+
+    def test_deep_nesting_does_not_recurse(self):
+        """Very deep state is handled without hitting the recursion limit"""
+        data = current = {}
+        for _ in range(5000):
+            current["child"] = {}
+            current = current["child"]
+
+        result = _sanitize(data)
+
+        depth = 0
+        while result:
+            result = result["child"]
+            depth += 1
+        assert depth == 5000
+
+    def test_cyclic_structure_is_cut(self):
+        """Self-referencing containers terminate with a placeholder"""
+        data = {"name": "plan", "items": []}
+        data["self"] = data
+        data["items"].append(data["items"])
+
+        result = _sanitize(data)
+
+        assert result == {"name": "plan", "items": ["<cycle>"], "self": "<cycle>"}
+
+    def test_shared_reference_is_not_a_cycle(self):
+        """The same container reached via two keys is copied both times"""
+        shared = {"id": 1}
+
+        assert _sanitize({"a": shared, "b": [shared]}) == {"a": {"id": 1}, "b": [{"id": 1}]}
+
+
+class TestEfficiency:
+    """Token/duration efficiency scoring"""
+
+    @pytest.mark.parametrize("tokens,duration,expected", [
+        (1000, 10.0, 1.0),
+        (2000, 10.0, 0.5),
+        (4000, 10.0, 0.25),
+        (0, 5.0, 1.0),
+    ])
+    def test_efficiency_against_baseline(self, tokens, duration, expected):
+        """Score is baseline / (tokens * duration), clamped to 0-1"""
+        assert _calculate_efficiency(tokens, duration) == expected
+
+
+class TestTrackerPool:
+    """acquire_tracker / release_tracker"""
+
+    def test_released_tracker_is_reused_cleared(self):
+        """A released tracker comes back empty on the next acquire"""
+        tracker = acquire_tracker()
+        run_id = uuid4()
+        tracker.on_chain_start({}, {}, name="plan", run_id=run_id)
+        tracker.on_chain_end({}, run_id=run_id)
+        trace = tracker.get_trace()
+
+        release_tracker(tracker)
+        reused = acquire_tracker()
+
+        assert reused is tracker
+        assert reused.get_trace() == []
+        assert reused.get_summary()["total_steps"] == 0
+        # Previously returned trace data is unaffected by the reset
+        assert trace[0]["name"] == "plan"
+        release_tracker(reused)
+
+
+class TestPerformanceWriter:
+    """Background batching of performance score writes"""
+
+    async def test_scores_written_in_background_batch(self):
+        """Queued scores are persisted together and flushed on shutdown"""
+        batches = []
+
+        async def fake_write(batch):
+            batches.append(list(batch))
+
+        with patch("backend.core.execution_tracker._write_performance_scores", side_effect=fake_write), \
+                patch("backend.core.execution_tracker.PERF_WRITE_LINGER_SECONDS", 0.01):
+            for i in range(3):
+                enqueue_performance_score(uuid4(), "agent_a", {"overall_score": 0.5 + i / 10}, {})
+            await shutdown_performance_writer()
+
+        assert [len(batch) for batch in batches] == [3]
+        assert all(agent_id == "agent_a" for _, agent_id, _, _ in batches[0])
@@ -0,0 +1,355 @@
+"""
+Unit tests for IntelligentRouter
+"""
+
+import json
+import time
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+from unittest.mock import AsyncMock, patch
+
+from backend.core import intelligent_router
+from backend.core.category_classifier import TaskCategory
+from backend.core.intelligent_router import (
+    IntelligentRouter,
+    AgentScore,
+    RoutingDecision,
+    get_routing_cache_stats,
+    invalidate_routing_cache,
+    shutdown_routing_writer,
+    warmup,
+)
+
+
+def make_stats(agent_id, total=10, successful=8, score=0.8):
+    """Minimal stand-in for an AgentPerformanceStatsModel row"""
+    return SimpleNamespace(
+        agent_id=agent_id,
+        total_tasks=total,
+        successful_tasks=successful,
+        avg_overall_score=score,
+        avg_cost_per_task=None,
+        avg_duration_seconds=None,
+        category_performance=None,
+    )
+
+
+class FakeSession:
+    """Records executed statements and returns canned stats rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        rows = self.rows
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: rows))
+
+
+class FakeWriteSession(FakeSession):
+    """Session context exposing a raw driver connection for routing writes"""
+
+    def __init__(self, driver_connection):
+        super().__init__([])
+        self.driver_connection = driver_connection
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def connection(self):
+        raw = SimpleNamespace(driver_connection=self.driver_connection)
+
+        async def get_raw_connection():
+            return raw
+
+        return SimpleNamespace(get_raw_connection=get_raw_connection)
+
+    async def commit(self):
+        self.committed = True
+
+
+@pytest.fixture
+def router():
+    return IntelligentRouter()
+
+
+@pytest.fixture(autouse=True)
+def empty_routing_cache(monkeypatch):
+    """Isolate the module-level routing cache per test"""
+    monkeypatch.setattr(intelligent_router, "_routing_cache", intelligent_router.OrderedDict())
+    monkeypatch.setattr(intelligent_router, "_routing_cache_stats", {"hits": 0, "misses": 0})
+
+
+class TestCapableAgents:
+    """Category to candidate-agent lookup"""
+
+    @pytest.mark.parametrize("category,expected", [
+        (TaskCategory.RESEARCH, ["agent_a", "agent_f"]),
+        (TaskCategory.ANALYSIS, ["agent_a", "agent_b", "agent_c", "agent_d"]),
+        (TaskCategory.CHAT, ["agent_e", "agent_g"]),
+        (TaskCategory.UNKNOWN, ["agent_a", "agent_b", "agent_c", "agent_d", "agent_e", "agent_f"]),
+    ])
+    def test_capable_agents(self, router, category, expected):
+        """Specialists in declaration order, or every non-chat agent"""
+        assert router._get_capable_agents(category) == expected
+
+
+class TestFallbackSelection:
+    """Default specialist when no performance data exists"""
+
+    @pytest.mark.parametrize("category,expected", [
+        (TaskCategory.WRITING, "agent_f"),
+        (TaskCategory.CHAT, "agent_g"),
+        (TaskCategory.UNKNOWN, "agent_a"),
+    ])
+    def test_default_specialist(self, router, category, expected):
+        """Each category maps to its default agent (bob for unknown)"""
+        decision = router._fallback_selection(category, {})
+
+        assert decision.selected_agent_id == expected
+        assert decision.selected_nickname == router.AGENT_NICKNAMES[expected]
+
+
+class TestScoreAgents:
+    """Scoring of capable agents from performance stats"""
+
+    async def test_stats_fetched_in_single_query(self, router):
+        """All candidates' stats come from one round trip"""
+        session = FakeSession([make_stats("agent_a", score=0.9), make_stats("agent_f", score=0.6)])
+
+        scores = await router._score_agents(
+            session=session,
+            capable_agents=["agent_a", "agent_f"],
+            category=TaskCategory.RESEARCH,
+            constraints={},
+        )
+
+        assert len(session.statements) == 1
+        assert [score.agent_id for score in scores] == ["agent_a", "agent_f"]
+        assert scores[0].final_score == pytest.approx(0.9 * 0.8)
+
+    async def test_load_penalties_fetched_once_before_scoring(self, router):
+        """Load comes from one batched lookup; scoring never touches the session"""
+        session = FakeSession([make_stats("agent_a", score=0.9), make_stats("agent_f", score=0.6)])
+
+        with patch.object(
+            router, "_get_load_penalties", AsyncMock(return_value={"agent_a": 0.5})
+        ) as get_load:
+            scores = await router._score_agents(
+                session=session,
+                capable_agents=["agent_a", "agent_f"],
+                category=TaskCategory.RESEARCH,
+                constraints={},
+            )
+
+        get_load.assert_awaited_once_with(session, ["agent_a", "agent_f"])
+        assert [score.load_penalty for score in scores] == [0.5, 0.0]
+        assert scores[0].final_score == pytest.approx(0.9 * 0.8 * 0.5)
+
+    def test_score_one_is_synchronous(self, router):
+        """A single candidate is scored without awaiting anything"""
+        score = router._score_one(
+            "agent_a", make_stats("agent_a", score=0.9), 0.5, TaskCategory.RESEARCH, {}
+        )
+
+        assert score.load_penalty == 0.5
+        assert score.final_score == pytest.approx(0.9 * 0.8 * 0.5)
+        assert router._score_one("agent_a", None, 0.0, TaskCategory.RESEARCH, {}) is None
+
+    async def test_agents_on_probation_are_skipped(self, router):
+        """Agents below MIN_TASKS_FOR_TRUST or without stats are not scored"""
+        session = FakeSession([make_stats("agent_a", total=2, successful=2)])
+
+        scores = await router._score_agents(
+            session=session,
+            capable_agents=["agent_a", "agent_f"],
+            category=TaskCategory.RESEARCH,
+            constraints={},
+        )
+
+        assert scores == []
+
+
+class TestSelectAgent:
+    """End-to-end agent selection"""
+
+    @pytest.mark.parametrize("rows,expected", [
+        ([make_stats("agent_a", score=0.6), make_stats("agent_f", score=0.9)], "agent_f"),
+        ([], "agent_a"),
+    ])
+    async def test_select_agent_returns_decision(self, router, rows, expected):
+        """Selection completes with and without performance data"""
+        session = FakeSession(rows)
+
+        class FakeSessionContext:
+            async def __aenter__(self):
+                return session
+
+            async def __aexit__(self, *exc):
+                return False
+
+        with patch.object(intelligent_router, "get_session_maker", return_value=FakeSessionContext):
+            decision = await router.select_agent("research x", TaskCategory.RESEARCH)
+
+        assert decision.selected_agent_id == expected
+        assert router.routing_log[-1] is decision
+
+
+class TestExplainSelection:
+    """Human-readable routing explanation"""
+
+    def test_runner_up_reported(self, router):
+        """The explanation names the second-best candidate and the gap"""
+        scores = [
+            AgentScore("agent_c", "rex", 0.7, 0.9, 0.0, 0.63, ""),
+            AgentScore("agent_a", "bob", 0.9, 0.9, 0.0, 0.81, ""),
+            AgentScore("agent_d", "kai", 0.5, 0.9, 0.0, 0.45, ""),
+        ]
+
+        explanation = router._explain_selection(scores[1], scores)
+
+        assert explanation.startswith("bob selected with score 0.81. ")
+        assert "Runner-up: rex (0.63, -0.18)" in explanation
+
+
+class TestRoutingCache:
+    """Reuse of recent routing decisions"""
+
+    def seed(self, constraints, expires_in=60.0):
+        decision = RoutingDecision(
+            selected_agent_id="agent_f",
+            selected_nickname="alice",
+            task_category=TaskCategory.RESEARCH,
+            all_scores=[],
+            reason="cached",
+            timestamp=datetime(2020, 1, 1),
+            constraints=constraints,
+        )
+        key = intelligent_router._routing_cache_key(TaskCategory.RESEARCH, constraints)
+        intelligent_router._routing_cache[key] = (time.monotonic() + expires_in, decision)
+        return decision
+
+    async def test_hit_skips_database(self, router):
+        """A fresh cached decision is returned as a copy with a new timestamp"""
+        cached = self.seed({"max_cost": 0.1})
+
+        with patch.object(intelligent_router, "get_session_maker", side_effect=AssertionError):
+            decision = await router.select_agent("research x", TaskCategory.RESEARCH, {"max_cost": 0.1})
+
+        assert decision is not cached
+        assert decision.selected_agent_id == "agent_f"
+        assert decision.timestamp > cached.timestamp
+        assert get_routing_cache_stats()["hits"] == 1
+
+    def test_invalidate_clears_entries(self):
+        """invalidate_routing_cache() drops every cached decision"""
+        self.seed({})
+        invalidate_routing_cache()
+
+        assert get_routing_cache_stats()["size"] == 0
+
+    def test_unhashable_constraints_not_cached(self):
+        """Constraints with unhashable values produce no cache key"""
+        assert intelligent_router._routing_cache_key(TaskCategory.RESEARCH, {"tags": ["a"]}) is None
+
+
+class TestRoutingDecisionWriter:
+    """Background persistence of routing decisions"""
+
+    def make_decision(self):
+        score = AgentScore("agent_a", "bob", 0.9, 0.8, 0.0, 0.72, "bob: ...")
+        return RoutingDecision(
+            selected_agent_id="agent_a",
+            selected_nickname="bob",
+            task_category=TaskCategory.RESEARCH,
+            all_scores=[score],
+            reason="best",
+            timestamp=datetime(2024, 1, 1),
+            constraints={"max_cost": 0.1},
+        )
+
+    async def test_decisions_written_in_one_batch(self, router):
+        """Saved decisions are coalesced and flushed on shutdown"""
+        batches = []
+
+        async def fake_write(records):
+            batches.append(list(records))
+
+        task_ids = [uuid4() for _ in range(3)]
+        with patch.object(intelligent_router, "_write_routing_decisions", side_effect=fake_write), \
+                patch.object(intelligent_router, "ROUTING_WRITE_INTERVAL_SECONDS", 0.01):
+            for task_id in task_ids:
+                await router.save_routing_decision(self.make_decision(), task_id, "research x")
+            await shutdown_routing_writer()
+
+        assert [len(batch) for batch in batches] == [3]
+        record = dict(zip(intelligent_router.ROUTING_DECISION_COLUMNS, batches[0][0]))
+        assert record["task_id"] == task_ids[0]
+        assert record["category"] == "research"
+        assert record["all_scores"][0]["agent_id"] == "agent_a"
+        assert record["constraints"] == {"max_cost": 0.1}
+
+    async def test_single_record_inserts_native_jsonb(self, router):
+        """A one-record batch goes through INSERT with lists and dicts, not JSON text"""
+        session = FakeWriteSession(SimpleNamespace(copy_records_to_table=AsyncMock()))
+        record = intelligent_router._routing_record(self.make_decision(), uuid4(), "research x")
+
+        with patch.object(intelligent_router, "get_session_maker", return_value=lambda: session):
+            await intelligent_router._write_routing_decisions([record])
+
+        assert len(session.statements) == 1
+        params = session.statements[0].compile().params
+        assert isinstance(params["all_scores_m0"], list)
+        assert params["all_scores_m0"][0]["agent_id"] == "agent_a"
+        assert params["constraints_m0"] == {"max_cost": 0.1}
+        session.driver_connection.copy_records_to_table.assert_not_awaited()
+        assert session.committed
+
+    async def test_multi_record_batch_copies_jsonb_as_text(self, router):
+        """COPY rows carry JSONB columns as JSON text"""
+        session = FakeWriteSession(SimpleNamespace(copy_records_to_table=AsyncMock()))
+        records = [
+            intelligent_router._routing_record(self.make_decision(), uuid4(), "research x")
+            for _ in range(2)
+        ]
+
+        with patch.object(intelligent_router, "get_session_maker", return_value=lambda: session):
+            await intelligent_router._write_routing_decisions(records)
+
+        rows = session.driver_connection.copy_records_to_table.await_args.kwargs["records"]
+        row = dict(zip(intelligent_router.ROUTING_DECISION_COLUMNS, rows[0]))
+        assert json.loads(row["all_scores"])[0]["agent_id"] == "agent_a"
+        assert json.loads(row["constraints"]) == {"max_cost": 0.1}
+        assert session.statements == []
+
+
+class TestWarmup:
+    """Startup connection prewarming"""
+
+    async def test_warmup_runs_trivial_query(self):
+        """warmup() opens a session and issues one statement"""
+        session = FakeSession([])
+
+        class FakeSessionContext:
+            async def __aenter__(self):
+                return session
+
+            async def __aexit__(self, *exc):
+                return False
+
+        with patch.object(intelligent_router, "get_session_maker", return_value=FakeSessionContext):
+            await warmup()
+
+        assert len(session.statements) == 1
+
+    async def test_warmup_failure_is_swallowed(self):
+        """A database outage at startup does not raise"""
+        with patch.object(intelligent_router, "get_session_maker", side_effect=RuntimeError("down")):
+            await warmup()
@@ -0,0 +1,235 @@
+"""
+Unit tests for PerformanceEvaluator
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+
+from backend.core import performance_evaluator
+from backend.core.performance_evaluator import (
+    PerformanceEvaluator,
+    _parse_score,
+    get_evaluation_cache_stats,
+)
+
+
+class FakeLLM:
+    """Stand-in chat model that answers after a short delay"""
+
+    def __init__(self, content="0.8", delay=0.05):
+        self.content = content
+        self.delay = delay
+        self.calls = 0
+        self.kwargs = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        self.kwargs.append(kwargs)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return SimpleNamespace(content=self.content)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    """Isolate the module-level evaluation cache per test"""
+    monkeypatch.setattr(performance_evaluator, "_evaluation_cache", performance_evaluator.OrderedDict())
+    monkeypatch.setattr(performance_evaluator, "_cache_stats", {"hits": 0, "misses": 0})
+
+
+@pytest.fixture
+def evaluator():
+    """Evaluator wired to a fake LLM that cannot produce JSON"""
+    evaluator = PerformanceEvaluator()
+    evaluator.llm = FakeLLM()
+    return evaluator
+
+
+class TestEvaluatorLLM:
+    """Shared evaluator model"""
+
+    def test_evaluators_share_llm(self):
+        """Every evaluator uses the same ChatOpenAI instance"""
+        assert PerformanceEvaluator().llm is PerformanceEvaluator().llm
+
+
+class TestPrompts:
+    """Prompt templates"""
+
+    def test_combined_prompt_renders_braces(self, evaluator):
+        """Template braces render literally; braces in outputs are left alone"""
+        prompt = evaluator._combined_prompt("Return {json}", "{\"a\": 1}")
+
+        assert "Original Query: Return {json}" in prompt
+        assert 'Agent Response: {"a": 1}' in prompt
+        assert '{"accuracy": 0.85,' in prompt
+
+
+class TestParseScore:
+    """Score extraction from free-text replies"""
+
+    @pytest.mark.parametrize("content,expected", [
+        ("0.85", 0.85),
+        ("0.85.", 0.85),
+        ("Score: 0.7", 0.7),
+        (".9", 0.9),
+        ("1.5", 1.0),
+        ("-0.2", 0.0),
+        ("no idea", 0.5),
+    ])
+    def test_parse_score(self, content, expected):
+        """First number is used and clamped to 0-1"""
+        assert _parse_score(content) == expected
+
+
+class TestEvaluateTask:
+    """Scoring of completed task outputs"""
+
+    async def test_all_dimensions_scored_in_one_call(self, evaluator):
+        """A JSON response scores every dimension with a single request"""
+        evaluator.llm = FakeLLM(
+            '{"accuracy": 1.0, "relevance": 0.8, "completeness": 0.6, "clarity": 1.7}'
+        )
+
+        scores = await evaluator.evaluate_task("What is 2+2?", "4", "agent_a")
+
+        assert evaluator.llm.calls == 1
+        assert (scores.accuracy, scores.relevance, scores.completeness) == (1.0, 0.8, 0.6)
+        assert scores.clarity == 1.0  # Clamped
+        assert scores.overall == 0.85
+
+    async def test_output_tokens_capped(self, evaluator):
+        """Combined and per-dimension calls bound the completion length"""
+        await evaluator.evaluate_task("What is 2+2?", "4", "agent_a")
+
+        combined, *dimensions = evaluator.llm.kwargs
+        assert combined["max_tokens"] == PerformanceEvaluator.JSON_SCORE_MAX_TOKENS
+        assert {call["max_tokens"] for call in dimensions} == {PerformanceEvaluator.SCORE_MAX_TOKENS}
+
+    async def test_dimensions_evaluated_concurrently(self, evaluator):
+        """Fallback dimension calls overlap instead of running back to back"""
+        scores = await evaluator.evaluate_task("What is 2+2?", "4", "agent_a")
+
+        assert evaluator.llm.calls == 5  # Unparseable combined call + 4 dimensions
+        assert evaluator.llm.max_in_flight == 4
+        assert scores.accuracy == scores.relevance == scores.completeness == scores.clarity == 0.8
+        assert scores.overall == 0.8
+
+    async def test_failed_dimension_defaults_to_midpoint(self, evaluator):
+        """An exception from one dimension does not discard the others"""
+        async def broken(*args):
+            raise RuntimeError("boom")
+
+        evaluator._evaluate_clarity = broken
+        scores = await evaluator.evaluate_task("What is 2+2?", "4", "agent_a")
+
+        assert scores.clarity == 0.5
+        assert scores.accuracy == 0.8
+
+
+class TestEvaluationCache:
+    """Score reuse for repeated (query, output) pairs"""
+
+    async def test_repeat_evaluation_skips_llm(self, evaluator):
+        """A second evaluation of the same output is served from the cache"""
+        evaluator.llm = FakeLLM(
+            '{"accuracy": 0.9, "relevance": 0.9, "completeness": 0.9, "clarity": 0.9}'
+        )
+
+        first = await evaluator.evaluate_task("What is 2+2?", "4", "agent_a")
+        second = await evaluator.evaluate_task("What is 2+2?", "4", "agent_b")
+        await evaluator.evaluate_task("What is 2+2?", "5", "agent_a")
+
+        assert first == second
+        assert evaluator.llm.calls == 2
+        assert get_evaluation_cache_stats() == {"hits": 1, "misses": 2, "size": 2}
+
+    async def test_fallback_scores_not_cached(self, evaluator):
+        """Scores from the per-dimension fallback are re-evaluated next time"""
+        await evaluator.evaluate_task("What is 2+2?", "4", "agent_a")
+
+        assert get_evaluation_cache_stats()["size"] == 0
+
+
+class TestEvaluateBatch:
+    """Offline batch evaluation"""
+
+    async def test_small_batch_scored_live_in_order(self, evaluator):
+        """Batches under the Batch API threshold use live evaluation"""
+        evaluator.llm = FakeLLM(
+            '{"accuracy": 0.9, "relevance": 0.9, "completeness": 0.9, "clarity": 0.9}'
+        )
+
+        results = await evaluator.evaluate_batch([("q1", "a1"), ("q2", "a2")])
+
+        assert [scores.overall for scores in results] == [0.9, 0.9]
+        assert evaluator.llm.calls == 2
+
+    async def test_small_batch_concurrency_is_bounded(self, evaluator):
+        """Live evaluations run at most MAX_CONCURRENT_EVALUATIONS at a time"""
+        evaluator.llm = FakeLLM(
+            '{"accuracy": 0.9, "relevance": 0.9, "completeness": 0.9, "clarity": 0.9}'
+        )
+        evaluator.MAX_CONCURRENT_EVALUATIONS = 2
+
+        results = await evaluator.evaluate_batch([(f"q{i}", f"a{i}") for i in range(6)])
+
+        assert len(results) == 6
+        assert evaluator.llm.calls == 6
+        assert evaluator.llm.max_in_flight == 2
+
+    async def test_batch_api_skips_cached_pairs(self, evaluator, monkeypatch):
+        """Pairs already in the evaluation cache are not re-submitted"""
+        cached = {"accuracy": 0.2, "relevance": 0.2, "completeness": 0.2, "clarity": 0.2}
+        fresh = {"accuracy": 0.9, "relevance": 0.9, "completeness": 0.9, "clarity": 0.9}
+        performance_evaluator._cache_dimensions(performance_evaluator._evaluation_key("q0", "a0"), cached)
+        evaluator.BATCH_API_THRESHOLD = 2
+        submitted = []
+
+        async def fake_batch_api(tasks):
+            submitted.extend(tasks)
+            return [fresh] * len(tasks)
+
+        monkeypatch.setattr(evaluator, "_evaluate_via_batch_api", fake_batch_api)
+
+        results = await evaluator.evaluate_batch([("q0", "a0"), ("q1", "a1"), ("q2", "a2")])
+
+        assert submitted == [("q1", "a1"), ("q2", "a2")]
+        assert [scores.overall for scores in results] == pytest.approx([0.2, 0.9, 0.9])
+        assert get_evaluation_cache_stats() == {"hits": 1, "misses": 2, "size": 3}
+
+    async def test_batch_api_client_is_closed(self, evaluator, monkeypatch):
+        """The Batch API client is closed even when the batch fails"""
+        class FakeClient:
+            closed = False
+
+            def __init__(self, **kwargs):
+                self.files = SimpleNamespace(create=self.create_file)
+                self.batches = SimpleNamespace(create=self.create_batch)
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                FakeClient.closed = True
+
+            async def create_file(self, **kwargs):
+                return SimpleNamespace(id="file-1")
+
+            async def create_batch(self, **kwargs):
+                return SimpleNamespace(id="batch-1", status="failed", output_file_id=None)
+
+        monkeypatch.setattr(performance_evaluator, "AsyncOpenAI", FakeClient)
+        evaluator.llm = SimpleNamespace(model_name="gpt-4o-mini")
+
+        with pytest.raises(RuntimeError, match="failed"):
+            await evaluator._evaluate_via_batch_api([("q", "a")])
+
+        assert FakeClient.closed
@@ -21,7 +21,17 @@ from backend.models.prompt_models import AgentPrompt
 @pytest.fixture
 def mock_prompt_repo():
     """Mock PromptRepository"""
-    return AsyncMock()
+    repo = AsyncMock()
+    repo.get_prompt_versions.return_value = {}
+    return repo
+
+
+@pytest.fixture(autouse=True)
+def empty_prompt_versions(monkeypatch):
+    """Isolate the module-level prompt versions per test"""
+    from backend.repositories import prompt_repository
+
+    monkeypatch.setattr(prompt_repository, "_prompt_versions", {})
 
 
 @pytest.fixture
@@ -164,11 +174,13 @@ class TestPromptCompilation:
         await prompt_engineer.compile_agent_prompts("agent_a", agent_config)
 
         # Verify cache was populated
-        assert "agent_a" in prompt_engineer.compiled_cache
-        assert "system" in prompt_engineer.compiled_cache["agent_a"]
+        assert "agent_a" in prompt_engineer.agents
+        cached = prompt_engineer.agents["agent_a"]
+        assert "Bob" in cached.system
 
-        # Verify timestamp was recorded
-        assert "agent_a" in prompt_engineer._compilation_timestamps
+        # Verify timestamp and version hash were recorded
+        assert cached.compiled_at is not None
+        assert cached.base_hash == prompt_engineer.generate_prompt_version_hash(cached.system)
 
     @pytest.mark.asyncio
     async def test_compile_multiple_agents(
@@ -186,8 +198,78 @@ class TestPromptCompilation:
         await prompt_engineer.compile_agent_prompts("agent_b", agent_config)
 
         # Verify both cached
-        assert "agent_a" in prompt_engineer.compiled_cache
-        assert "agent_b" in prompt_engineer.compiled_cache
+        assert "agent_a" in prompt_engineer.agents
+        assert "agent_b" in prompt_engineer.agents
+
+    @pytest.mark.asyncio
+    async def test_compile_all_agent_prompts_single_query(
+        self,
+        prompt_engineer,
+        mock_prompt_repo,
+        sample_system_prompt,
+        sample_human_prompt,
+        agent_config
+    ):
+        """Test bulk compilation loads every agent's prompts in one query"""
+        mock_prompt_repo.get_active_prompts_bulk.return_value = {
+            "agent_a": [sample_system_prompt, sample_human_prompt],
+            "agent_b": [],
+        }
+
+        compiled = await prompt_engineer.compile_all_agent_prompts(
+            {"agent_a": agent_config, "agent_b": agent_config}
+        )
+
+        mock_prompt_repo.get_active_prompts_bulk.assert_called_once_with(["agent_a", "agent_b"])
+        mock_prompt_repo.get_active_prompts.assert_not_called()
+        assert "Research Specialist" in compiled["agent_a"]["system"]
+        assert compiled["agent_b"] == {}
+        assert "agent_a" in prompt_engineer.agents
+        assert "agent_b" not in prompt_engineer.agents
+
+    @pytest.mark.asyncio
+    async def test_compile_all_agent_prompts_load_failure(
+        self,
+        prompt_engineer,
+        mock_prompt_repo,
+        agent_config
+    ):
+        """Test bulk load errors are wrapped in PromptCompilationError"""
+        mock_prompt_repo.get_active_prompts_bulk.side_effect = RuntimeError("db down")
+
+        with pytest.raises(PromptCompilationError, match="db down"):
+            await prompt_engineer.compile_all_agent_prompts({"agent_a": agent_config})
+
+    @pytest.mark.asyncio
+    async def test_compile_agents_concurrently_bounded(
+        self,
+        prompt_engineer,
+        mock_prompt_repo,
+        sample_system_prompt,
+        agent_config
+    ):
+        """Test concurrent compilation respects max_concurrency"""
+        import asyncio
+
+        in_flight = 0
+        peak = 0
+
+        async def get_active_prompts(agent_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return [sample_system_prompt]
+
+        mock_prompt_repo.get_active_prompts.side_effect = get_active_prompts
+        configs = {f"agent_{i}": agent_config for i in range(6)}
+
+        compiled = await prompt_engineer.compile_agents_concurrently(configs, max_concurrency=2)
+
+        assert list(compiled) == list(configs)
+        assert all("system" in prompts for prompts in compiled.values())
+        assert peak == 2
 
 
 class TestDynamicPromptGeneration:
@@ -277,6 +359,96 @@ class TestDynamicPromptGeneration:
         assert "500 tokens" in system_prompt
         assert "concise" in system_prompt
 
+    def test_adaptation_suffix_is_memoized(self, prompt_engineer):
+        """Test repeated task shapes reuse the cached suffix"""
+        from backend.core.prompt_engineer import _build_adaptation_suffix
+
+        _build_adaptation_suffix.cache_clear()
+        task_context = {"urgency": "high", "token_budget": 500}
+
+        first = prompt_engineer._adapt_system_prompt("Base", task_context)
+        second = prompt_engineer._adapt_system_prompt("Base", dict(task_context))
+
+        assert first == second
+        assert first.startswith("Base\n\nIMPORTANT")
+        assert _build_adaptation_suffix.cache_info().hits == 1
+
+    @pytest.mark.asyncio
+    async def test_human_template_precompiled(
+        self,
+        prompt_engineer,
+        mock_prompt_repo,
+        sample_human_prompt,
+        agent_config
+    ):
+        """Test human template is compiled into a renderer at compile time"""
+        mock_prompt_repo.get_active_prompts.return_value = [sample_human_prompt]
+        compiled = await prompt_engineer.compile_agent_prompts("agent_a", agent_config)
+
+        renderer = compiled["human_renderer"]
+        user_prompt = renderer("What is {task_type}?", {"task_type": "research"})
+
+        # Query text is not re-scanned and unknown placeholders stay intact
+        assert "Research query: What is {task_type}?" in user_prompt
+        assert "Task type: research" in user_prompt
+        assert "{expected_output}" in user_prompt
+
+    @pytest.mark.asyncio
+    async def test_generate_dynamic_prompt_bytes_matches_str(
+        self,
+        prompt_engineer,
+        mock_prompt_repo,
+        sample_system_prompt,
+        sample_human_prompt,
+        agent_config
+    ):
+        """Test byte prompts are the UTF-8 encoding of the str prompts"""
+        mock_prompt_repo.get_active_prompts.return_value = [
+            sample_system_prompt,
+            sample_human_prompt
+        ]
+        await prompt_engineer.compile_agent_prompts("agent_a", agent_config)
+
+        task_context = {"urgency": "high", "task_type": "résumé review"}
+        as_str = await prompt_engineer.generate_dynamic_prompt("agent_a", task_context, "Query é")
+        as_bytes = await prompt_engineer.generate_dynamic_prompt_bytes(
+            "agent_a", task_context, "Query é"
+        )
+
+        assert as_bytes == (as_str[0].encode(), as_str[1].encode())
+
+        fallback = await prompt_engineer.generate_dynamic_prompt_bytes("agent_x", {}, "Hi")
+        assert fallback[1] == b"Hi"
+
+    @pytest.mark.asyncio
+    async def test_generate_dynamic_prompt_empty_context(
+        self,
+        prompt_engineer,
+        mock_prompt_repo,
+        sample_system_prompt,
+        sample_human_prompt,
+        agent_config,
+        monkeypatch
+    ):
+        """Test empty task context serves the compiled prompt verbatim"""
+        mock_prompt_repo.get_active_prompts.return_value = [
+            sample_system_prompt,
+            sample_human_prompt
+        ]
+        await prompt_engineer.compile_agent_prompts("agent_a", agent_config)
+
+        def fail_adapt(*args, **kwargs):
+            raise AssertionError("adaptation should be skipped")
+
+        monkeypatch.setattr(prompt_engineer, "_adapt_system_prompt", fail_adapt)
+
+        system_prompt, user_prompt = await prompt_engineer.generate_dynamic_prompt(
+            "agent_a", {}, "Test query"
+        )
+
+        assert system_prompt is prompt_engineer.agents["agent_a"].system
+        assert "Research query: Test query" in user_prompt
+
     @pytest.mark.asyncio
     async def test_generate_dynamic_prompt_not_compiled(
         self,
@@ -294,6 +466,15 @@ class TestDynamicPromptGeneration:
         assert "agent_unknown" in system_prompt
         assert user_prompt == "Test query"
 
+    @pytest.mark.asyncio
+    async def test_fallback_system_prompt_reused(self, prompt_engineer):
+        """Test fallback system prompt is built once per agent"""
+        first, _ = await prompt_engineer.generate_dynamic_prompt("agent_x", {}, "Query 1")
+        second, user_prompt = await prompt_engineer.generate_dynamic_prompt("agent_x", {}, "Query 2")
+
+        assert first is second
+        assert user_prompt == "Query 2"
+
 
 class TestHelperMethods:
     """Test helper methods"""
@@ -317,6 +498,33 @@ class TestHelperMethods:
         formatted = prompt_engineer._format_tools_list([])
         assert formatted == "No tools available"
 
+    def test_compile_system_prompt_single_pass(self, prompt_engineer, agent_config):
+        """Test placeholders are substituted and unknown ones left intact"""
+        compiled = prompt_engineer._compile_system_prompt(
+            base_text="{agent_nickname} ({specialization}) uses {capabilities}. {unknown}",
+            agent_config=agent_config,
+            variables={"agent_nickname": "Bob", "specialization": "ignored"}
+        )
+
+        assert compiled == (
+            "Bob (Research Specialist) uses web_search, synthesis, analysis. {unknown}"
+        )
+
+    def test_compile_system_prompt_keeps_literal_braces(self, prompt_engineer, agent_config):
+        """Test JSON examples and escaped braces survive compilation"""
+        compiled = prompt_engineer._compile_system_prompt(
+            base_text='{specialization}. Reply as {"answer": "..."} not {{raw}}',
+            agent_config=agent_config,
+            variables={}
+        )
+
+        assert compiled == 'Research Specialist. Reply as {"answer": "..."} not {{raw}}'
+
+    def test_compile_system_prompt_without_placeholders(self, prompt_engineer, agent_config):
+        """Test prompts without placeholders are returned unchanged"""
+        text = "You are a helpful assistant."
+        assert prompt_engineer._compile_system_prompt(text, agent_config, {}) is text
+
     def test_generate_prompt_version_hash(self, prompt_engineer):
         """Test prompt version hashing"""
         prompt1 = "You are a helpful assistant"
@@ -360,6 +568,29 @@ class TestCacheManagement:
         assert "agent_b" in status["cached_agents"]
         assert status["cache_size"] == 2
 
+    @pytest.mark.asyncio
+    async def test_cache_evicts_least_recently_used(
+        self,
+        mock_prompt_repo,
+        sample_system_prompt,
+        agent_config
+    ):
+        """Test cache is bounded and evicts the least recently used agent"""
+        engineer = PromptEngineer(mock_prompt_repo, max_cached_agents=2)
+        mock_prompt_repo.get_active_prompts.return_value = [sample_system_prompt]
+
+        await engineer.compile_agent_prompts("agent_a", agent_config)
+        await engineer.compile_agent_prompts("agent_b", agent_config)
+
+        # Touch agent_a so agent_b becomes least recently used
+        await engineer.generate_dynamic_prompt("agent_a", {}, "Query")
+        await engineer.compile_agent_prompts("agent_c", agent_config)
+
+        assert list(engineer.agents) == ["agent_a", "agent_c"]
+        status = engineer.get_cache_status()
+        assert status["evictions"] == 1
+        assert status["max_cached_agents"] == 2
+
     @pytest.mark.asyncio
     async def test_clear_cache_specific_agent(
         self,
@@ -376,8 +607,8 @@ class TestCacheManagement:
         # Clear specific agent
         prompt_engineer.clear_cache("agent_a")
 
-        assert "agent_a" not in prompt_engineer.compiled_cache
-        assert "agent_b" in prompt_engineer.compiled_cache
+        assert "agent_a" not in prompt_engineer.agents
+        assert "agent_b" in prompt_engineer.agents
 
     @pytest.mark.asyncio
     async def test_clear_cache_all(
@@ -395,8 +626,7 @@ class TestCacheManagement:
         # Clear all
         prompt_engineer.clear_cache()
 
-        assert len(prompt_engineer.compiled_cache) == 0
-        assert len(prompt_engineer._compilation_timestamps) == 0
+        assert len(prompt_engineer.agents) == 0
 
 
 class TestSingletonPattern:
@@ -439,3 +669,133 @@ class TestSingletonPattern:
         # Should raise RuntimeError
         with pytest.raises(RuntimeError, match="not initialized"):
             get_prompt_engineer()
+
+
+class TestVersionInvalidation:
+    """Test lazy invalidation from database prompt versions"""
+
+    @pytest.fixture
+    def refresh_repo(self, monkeypatch):
+        """Repository handed to background work through its own session"""
+        import backend.core.prompt_engineer as pe_module
+
+        class FakeSession:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        repo = AsyncMock()
+        repo.get_prompt_versions.return_value = {}
+        monkeypatch.setattr(pe_module, "get_session_maker", lambda: FakeSession)
+        monkeypatch.setattr(pe_module, "PromptRepository", lambda session: repo)
+        return repo
+
+    @pytest.mark.asyncio
+    async def test_stale_prompts_recompiled_in_background(
+        self,
+        prompt_engineer,
+        mock_prompt_repo,
+        refresh_repo,
+        sample_system_prompt,
+        agent_config
+    ):
+        """Test a version change serves the old prompt once, then the new one"""
+        from backend.repositories.prompt_repository import set_prompt_versions
+
+        agent_id = "agent_a"
+        mock_prompt_repo.get_active_prompts.return_value = [sample_system_prompt]
+        await prompt_engineer.compile_agent_prompts(agent_id, agent_config)
+
+        changed = {agent_id: datetime(2026, 1, 1)}
+        updated = sample_system_prompt.model_copy(update={"prompt_text": "Updated prompt"})
+        refresh_repo.get_prompt_versions.return_value = changed
+        refresh_repo.get_active_prompts.return_value = [updated]
+        set_prompt_versions(changed)
+
+        # Stale entry is still served while the refresh runs
+        system_prompt, _ = await prompt_engineer.generate_dynamic_prompt(agent_id, {}, "Query")
+        assert "Bob" in system_prompt
+        await prompt_engineer._refresh_tasks[agent_id]
+
+        system_prompt, _ = await prompt_engineer.generate_dynamic_prompt(agent_id, {}, "Query")
+        assert system_prompt == "Updated prompt"
+        assert agent_id not in prompt_engineer._refresh_tasks
+        # The refresh ran on its own repository, not the shared one
+        mock_prompt_repo.get_active_prompts.assert_awaited_once()
+        refresh_repo.get_active_prompts.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_is_not_retried_immediately(
+        self,
+        prompt_engineer,
+        mock_prompt_repo,
+        refresh_repo,
+        sample_system_prompt,
+        agent_config
+    ):
+        """Test a failed recompile backs off instead of retrying every request"""
+        from backend.repositories.prompt_repository import set_prompt_versions
+
+        mock_prompt_repo.get_active_prompts.return_value = [sample_system_prompt]
+        await prompt_engineer.compile_agent_prompts("agent_a", agent_config)
+
+        refresh_repo.get_prompt_versions.side_effect = RuntimeError("db down")
+        set_prompt_versions({"agent_a": datetime(2026, 1, 1)})
+
+        await prompt_engineer.generate_dynamic_prompt("agent_a", {}, "Query")
+        await prompt_engineer._refresh_tasks["agent_a"]
+        system_prompt, _ = await prompt_engineer.generate_dynamic_prompt("agent_a", {}, "Query")
+
+        assert "Bob" in system_prompt
+        assert prompt_engineer._refresh_tasks == {}
+        assert refresh_repo.get_prompt_versions.await_count == 1
+
+        # Once the retry window passes, the recompile is attempted again
+        prompt_engineer._refresh_failed_at["agent_a"] -= prompt_engineer.REFRESH_RETRY_SECONDS
+        await prompt_engineer.generate_dynamic_prompt("agent_a", {}, "Query")
+        await prompt_engineer._refresh_tasks["agent_a"]
+        assert refresh_repo.get_prompt_versions.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_versions_polled_from_database(
+        self,
+        prompt_engineer,
+        mock_prompt_repo,
+        refresh_repo,
+        sample_system_prompt,
+        agent_config
+    ):
+        """Test writes made by other processes are seen through the periodic poll"""
+        from backend.repositories.prompt_repository import get_prompt_version
+
+        mock_prompt_repo.get_active_prompts.return_value = [sample_system_prompt]
+        await prompt_engineer.compile_agent_prompts("agent_a", agent_config)
+        refresh_repo.get_prompt_versions.return_value = {"agent_a": datetime(2026, 1, 1)}
+        prompt_engineer._versions_polled_at -= prompt_engineer.VERSION_POLL_SECONDS
+
+        await prompt_engineer.generate_dynamic_prompt("agent_a", {}, "Query")
+        await prompt_engineer._version_poll
+
+        refresh_repo.get_prompt_versions.assert_awaited_once_with(["agent_a"])
+        assert get_prompt_version("agent_a") == datetime(2026, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_current_prompts_not_refreshed(
+        self,
+        prompt_engineer,
+        mock_prompt_repo,
+        sample_system_prompt,
+        agent_config
+    ):
+        """Test unchanged versions never trigger a reload"""
+        mock_prompt_repo.get_prompt_versions.return_value = {"agent_a": datetime(2026, 1, 1)}
+        mock_prompt_repo.get_active_prompts.return_value = [sample_system_prompt]
+        await prompt_engineer.compile_agent_prompts("agent_a", agent_config)
+
+        await prompt_engineer.generate_dynamic_prompt("agent_a", {}, "Query")
+
+        assert prompt_engineer._refresh_tasks == {}
+        assert prompt_engineer._version_poll is None
+        mock_prompt_repo.get_active_prompts.assert_awaited_once()
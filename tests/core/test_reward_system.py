@@ -0,0 +1,229 @@
+"""
+Unit tests for RewardSystem
+"""
+
+import pytest
+
+from backend.core.reward_system import RewardSystem
+
+
+@pytest.fixture
+def reward_system():
+    """RewardSystem instance"""
+    return RewardSystem()
+
+
+class TestBonusTiers:
+    """Test table-driven speed and cost bonuses"""
+
+    @pytest.mark.parametrize("duration,expected", [
+        (0.0, 20),
+        (4.99, 20),
+        (5, 15),
+        (9.9, 15),
+        (10, 10),
+        (29.9, 10),
+        (30, 5),
+        (59.9, 5),
+        (60, 0),
+        (600, 0),
+    ])
+    def test_speed_bonus_tiers(self, reward_system, duration, expected):
+        """Test speed bonus boundaries match the documented tiers"""
+        assert reward_system._calculate_speed_bonus(duration) == expected
+
+    @pytest.mark.parametrize("cost,expected", [
+        (0.0, 30),
+        (0.049, 30),
+        (0.05, 22),
+        (0.10, 15),
+        (0.25, 7),
+        (0.49, 7),
+        (0.50, 0),
+        (5.0, 0),
+    ])
+    def test_cost_bonus_tiers(self, reward_system, cost, expected):
+        """Test cost bonus boundaries at full quality"""
+        assert reward_system._calculate_cost_bonus(cost, 1.0) == expected
+
+    def test_cost_bonus_scales_with_quality(self, reward_system):
+        """Test low quality halves the cost bonus at most"""
+        assert reward_system._calculate_cost_bonus(0.01, 0.2) == 15
+        assert reward_system._calculate_cost_bonus(0.01, 0.8) == 24
+
+
+class TestPeerBonus:
+    """Test peer recognition bonus"""
+
+    @pytest.mark.parametrize("evaluations,expected", [
+        (None, 0),
+        ([], 0),
+        ([{"score": 0.8}, {"score": 0.4}], 15),
+        ([0.8, 0.4], 15),
+        ([1, 1], 25),
+        ([{"score": 0.8}, 0.4], 15),
+        ([{"score": 0.8}, {"rating": 5}], 20),
+        (["bad", 0.4], 10),
+        ([{"rating": 5}], 0),
+    ])
+    def test_peer_bonus(self, reward_system, evaluations, expected):
+        """Test homogeneous fast path and mixed fallback agree"""
+        assert reward_system._calculate_peer_bonus(evaluations) == expected
+
+
+class TestCalculateReward:
+    """Test full reward calculation"""
+
+    def test_completed_task(self, reward_system):
+        """Test a fast, cheap, well-rated task"""
+        result = reward_system.calculate_reward(
+            task_status="COMPLETED",
+            overall_score=0.9,
+            duration_seconds=8.0,
+            total_cost=0.02,
+            user_rating=5,
+            peer_evaluations=[{"score": 0.8}, 0.6]
+        )
+
+        assert result.base_reward == 10
+        assert result.quality_bonus == 45
+        assert result.speed_bonus == 15
+        assert result.cost_bonus == 27
+        assert result.user_bonus == 40
+        assert result.peer_bonus == 17
+        assert result.penalties == 0
+        assert result.net_reward == result.total_reward == 154
+
+    @pytest.mark.parametrize("rating,expected", [(None, 0), (1, 8), (2, 16), (3, 24), (4, 32), (5, 40)])
+    def test_user_bonus(self, reward_system, rating, expected):
+        """Test user bonus scales per star"""
+        result = reward_system.calculate_reward("COMPLETED", 1.0, 1.0, 0.0, user_rating=rating)
+        assert result.user_bonus == expected
+
+    def test_failed_task_penalties(self, reward_system):
+        """Test failure, cost, timeout and rating penalties stack"""
+        result = reward_system.calculate_reward(
+            task_status="FAILED",
+            overall_score=0.0,
+            duration_seconds=140.0,
+            total_cost=0.75,
+            user_rating=1
+        )
+
+        assert result.base_reward == 0
+        assert result.penalties == 30 + 25 + 10 + 30
+        assert result.net_reward == result.total_reward - result.penalties
+
+
+class TestBatchRewards:
+    """Test vectorized reward calculation"""
+
+    def test_batch_matches_scalar(self, reward_system):
+        """Test batch results match calculate_reward row by row"""
+        import random
+
+        rng = random.Random(7)
+        rows = [
+            {
+                "task_status": rng.choice(["COMPLETED", "FAILED", "RUNNING"]),
+                "overall_score": rng.random(),
+                "duration_seconds": rng.uniform(0, 300),
+                "total_cost": rng.uniform(0, 1.5),
+                "user_rating": rng.choice([None, 1, 2, 3, 4, 5]),
+                "peer_score": rng.choice([None, rng.random()]),
+            }
+            for _ in range(2000)
+        ]
+
+        batch = reward_system.calculate_rewards_batch(
+            task_status=[r["task_status"] for r in rows],
+            overall_score=[r["overall_score"] for r in rows],
+            duration_seconds=[r["duration_seconds"] for r in rows],
+            total_cost=[r["total_cost"] for r in rows],
+            user_rating=[float("nan") if r["user_rating"] is None else r["user_rating"] for r in rows],
+            peer_score_avg=[float("nan") if r["peer_score"] is None else r["peer_score"] for r in rows],
+        )
+
+        for i, r in enumerate(rows):
+            expected = reward_system.calculate_reward(
+                task_status=r["task_status"],
+                overall_score=r["overall_score"],
+                duration_seconds=r["duration_seconds"],
+                total_cost=r["total_cost"],
+                user_rating=r["user_rating"],
+                peer_evaluations=None if r["peer_score"] is None else [r["peer_score"]],
+            ).to_dict()
+            assert {key: int(values[i]) for key, values in batch.items()} == expected
+
+    def test_batch_optional_columns(self, reward_system):
+        """Test ratings and peer scores default to absent"""
+        batch = reward_system.calculate_rewards_batch(
+            task_status=["COMPLETED"],
+            overall_score=[1.0],
+            duration_seconds=[1.0],
+            total_cost=[0.0],
+        )
+
+        assert batch["user_bonus"].tolist() == [0]
+        assert batch["peer_bonus"].tolist() == [0]
+        assert batch["net_reward"].tolist() == [110]
+        assert all(values.dtype == "int64" for values in batch.values())
+
+
+class TestCalculateTaskReward:
+    """Test metadata convenience function"""
+
+    def test_uses_shared_instance(self, monkeypatch):
+        """Test no RewardSystem is constructed per call"""
+        from backend.core import reward_system as rs_module
+
+        def fail_init(self):
+            raise AssertionError("RewardSystem constructed per call")
+
+        monkeypatch.setattr(rs_module.RewardSystem, "__init__", fail_init)
+
+        result = rs_module.calculate_task_reward({
+            "status": "COMPLETED",
+            "overall_score": 1.0,
+            "duration_seconds": 1.0,
+        })
+
+        assert result.net_reward == 110
+
+
+class TestRewardCalculation:
+    """Test RewardCalculation record"""
+
+    def test_to_dict_field_order(self, reward_system):
+        """Test to_dict keeps declaration order and values"""
+        result = reward_system.calculate_reward("COMPLETED", 1.0, 1.0, 0.0)
+
+        assert list(result.to_dict()) == [
+            "total_reward", "base_reward", "quality_bonus", "speed_bonus",
+            "cost_bonus", "user_bonus", "peer_bonus", "penalties", "net_reward",
+        ]
+        assert result.to_dict()["net_reward"] == result.net_reward == 110
+
+    def test_is_immutable(self, reward_system):
+        """Test results are frozen and slotted"""
+        import dataclasses
+
+        result = reward_system.calculate_reward("COMPLETED", 1.0, 1.0, 0.0)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.net_reward = 0
+        assert not hasattr(result, "__dict__")
+
+    def test_to_json(self, reward_system):
+        """Test JSON serialization matches to_dict"""
+        import json
+
+        from backend.core.reward_system import rewards_to_json
+
+        result = reward_system.calculate_reward("COMPLETED", 1.0, 1.0, 0.0)
+        failed = reward_system.calculate_reward("FAILED", 0.0, 1.0, 0.0)
+
+        assert json.loads(result.to_json()) == result.to_dict()
+        assert json.loads(rewards_to_json([result, failed])) == [
+            result.to_dict(), failed.to_dict()
+        ]
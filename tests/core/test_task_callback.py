@@ -0,0 +1,87 @@
+"""
+Unit tests for TaskProgressCallback
+"""
+
+import asyncio
+from datetime import timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from backend.core.task_callback import TaskProgressCallback
+from backend.models.task_models import TaskStatus
+
+
+@pytest.fixture
+def callback():
+    """Callback with mocked repository and WebSocket manager"""
+    repo = MagicMock()
+    repo.set_status = AsyncMock()
+    repo.update_progress = AsyncMock()
+    repo.update_task = AsyncMock()
+    ws_manager = MagicMock()
+    ws_manager.broadcast_task_event = AsyncMock()
+    return TaskProgressCallback(uuid4(), repo, ws_manager)
+
+
+class TestStatusChange:
+    """Test status transitions"""
+
+    async def test_in_progress_shares_timestamp(self, callback):
+        """Test repo write and event use the same instant"""
+        await callback.on_status_change(TaskStatus.QUEUED, TaskStatus.IN_PROGRESS)
+
+        started_at = callback.repo.set_status.call_args.kwargs["started_at"]
+        event = callback.ws_manager.broadcast_task_event.call_args.args[0]
+
+        assert started_at.tzinfo is None
+        assert event.timestamp.tzinfo is timezone.utc
+        assert event.timestamp.replace(tzinfo=None) == started_at
+
+    async def test_terminal_status_not_broadcast(self, callback):
+        """Test completed transitions only write"""
+        await callback.on_status_change(TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED)
+
+        assert "completed_at" in callback.repo.set_status.call_args.kwargs
+        callback.ws_manager.broadcast_task_event.assert_not_called()
+
+
+class TestWriteAndBroadcast:
+    """Test the concurrent write/broadcast path"""
+
+    async def test_write_and_broadcast_overlap(self, callback):
+        """Test the broadcast does not wait for the write"""
+        write_started = asyncio.Event()
+        broadcast_seen = asyncio.Event()
+
+        async def slow_write(*args):
+            write_started.set()
+            await asyncio.wait_for(broadcast_seen.wait(), timeout=1)
+
+        async def broadcast(event):
+            broadcast_seen.set()
+
+        callback.repo.update_progress = slow_write
+        callback.ws_manager.broadcast_task_event = broadcast
+
+        await callback.on_progress_update(50, "analyze")
+
+        assert write_started.is_set() and broadcast_seen.is_set()
+
+    async def test_failed_broadcast_is_logged(self, callback):
+        """Test a broadcast failure does not raise"""
+        callback.ws_manager.broadcast_task_event.side_effect = RuntimeError("socket closed")
+
+        await callback.on_consultation_started("agent_a", "agent_b", "bob")
+
+        callback.repo.update_task.assert_awaited_once()
+
+    async def test_failed_write_is_raised(self, callback):
+        """Test a repository failure still propagates"""
+        callback.repo.update_progress.side_effect = RuntimeError("db down")
+
+        with pytest.raises(RuntimeError, match="db down"):
+            await callback.on_progress_update(10, "plan")
+
+        callback.ws_manager.broadcast_task_event.assert_awaited_once()
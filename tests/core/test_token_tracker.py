@@ -0,0 +1,165 @@
+"""
+Unit tests for token usage tracking
+"""
+
+from types import SimpleNamespace
+
+from backend.core import token_tracker
+from backend.core.token_tracker import (
+    ExecutionMetrics,
+    TokenUsage,
+    extract_token_usage_from_response,
+)
+
+
+class TestTokenUsage:
+    """Test TokenUsage accumulation"""
+
+    def test_iadd_mutates_in_place(self):
+        """Test iadd accumulates into the same object"""
+        usage = TokenUsage(1, 2, 3)
+        result = usage.iadd(TokenUsage(10, 20, 30))
+
+        assert result is usage
+        assert usage == TokenUsage(11, 22, 33)
+
+    def test_add_returns_new_object(self):
+        """Test + leaves both operands untouched"""
+        a = TokenUsage(1, 2, 3)
+        b = TokenUsage(10, 20, 30)
+
+        assert a + b == TokenUsage(11, 22, 33)
+        assert a == TokenUsage(1, 2, 3)
+        assert b == TokenUsage(10, 20, 30)
+
+
+class TestExecutionMetrics:
+    """Test call recording and merging"""
+
+    def test_add_llm_call_accumulates_tokens(self):
+        """Test LLM calls update the existing TokenUsage"""
+        metrics = ExecutionMetrics()
+        usage = metrics.token_usage
+
+        metrics.add_llm_call("gpt-4", 100, 20, purpose="plan")
+        metrics.add_llm_call("gpt-4", 50, 5)
+
+        assert metrics.token_usage is usage
+        assert usage == TokenUsage(150, 25, 175)
+        assert metrics.llm_calls == 2
+        assert metrics.llm_call_details[0] == {
+            "model": "gpt-4",
+            "purpose": "plan",
+            "prompt_tokens": 100,
+            "completion_tokens": 20,
+            "total_tokens": 120,
+        }
+
+    def test_add_agent_call_merges_child(self):
+        """Test child metrics are folded into the parent"""
+        child = ExecutionMetrics()
+        child.add_llm_call("gpt-4", 10, 5)
+        child.add_tool_call("search")
+
+        parent = ExecutionMetrics()
+        parent.add_llm_call("gpt-4", 1, 1)
+        parent.add_agent_call("agent_a", "bob", child_metrics=child)
+
+        assert parent.llm_calls == 2
+        assert parent.tool_calls == 1
+        assert parent.agent_calls == 1
+        assert parent.token_usage == TokenUsage(11, 6, 17)
+        assert child.token_usage == TokenUsage(10, 5, 15)
+        assert len(parent.llm_call_details) == 2
+
+    def test_round_trip(self):
+        """Test to_dict/from_dict preserve counts and details"""
+        metrics = ExecutionMetrics()
+        metrics.add_llm_call("gpt-4", 10, 5)
+        metrics.add_tool_call("search", success=False)
+
+        data = metrics.to_dict(include_details=True)
+
+        assert ExecutionMetrics.from_dict(data).to_dict(include_details=True) == data
+
+    def test_track_details_disabled(self):
+        """Test counters still accumulate without building detail lists"""
+        child = ExecutionMetrics()
+        child.add_llm_call("gpt-4", 10, 5)
+
+        metrics = ExecutionMetrics(track_details=False)
+        metrics.add_llm_call("gpt-4", 1, 1)
+        metrics.add_tool_call("search")
+        metrics.add_agent_call("agent_a", "bob", child_metrics=child)
+
+        assert (metrics.llm_calls, metrics.tool_calls, metrics.agent_calls) == (2, 1, 1)
+        assert metrics.token_usage == TokenUsage(11, 6, 17)
+        assert metrics.llm_call_details == []
+        assert metrics.tool_call_details == []
+        assert metrics.agent_call_details == []
+
+    def test_to_dict_omits_empty_details(self):
+        """Test details are only emitted when something was recorded"""
+        metrics = ExecutionMetrics(track_details=False)
+        metrics.add_llm_call("gpt-4", 3, 4)
+
+        data = metrics.to_dict(include_details=True)
+
+        assert "details" not in data
+        assert data["tokens"] == {"prompt": 3, "completion": 4, "total": 7}
+        assert ExecutionMetrics.from_dict(data).token_usage == TokenUsage(3, 4, 7)
+
+
+class LangChainResponse:
+    def __init__(self, response_metadata):
+        self.response_metadata = response_metadata
+
+
+class ApiResponse:
+    def __init__(self, usage):
+        self.usage = usage
+
+
+class TestExtractTokenUsage:
+    """Test token extraction across response shapes"""
+
+    def test_response_metadata_formats(self):
+        """Test OpenAI and Anthropic metadata on the same class"""
+        openai = LangChainResponse({"token_usage": {"prompt_tokens": 7, "completion_tokens": 3}})
+        anthropic = LangChainResponse({"usage": {"input_tokens": 5, "output_tokens": 2}})
+
+        assert extract_token_usage_from_response(openai) == (7, 3)
+        assert extract_token_usage_from_response(anthropic) == (5, 2)
+        assert extract_token_usage_from_response(LangChainResponse({})) == (0, 0)
+
+    def test_usage_attribute_formats(self):
+        """Test OpenAI and Anthropic usage objects"""
+        openai = ApiResponse(SimpleNamespace(prompt_tokens=4, completion_tokens=1))
+        anthropic = ApiResponse(SimpleNamespace(input_tokens=6, output_tokens=9))
+
+        assert extract_token_usage_from_response(openai) == (4, 1)
+        assert extract_token_usage_from_response(anthropic) == (6, 9)
+
+    def test_unknown_and_malformed(self):
+        """Test responses without usage or with bad metadata yield zeros"""
+        assert extract_token_usage_from_response(object()) == (0, 0)
+        assert extract_token_usage_from_response(None) == (0, 0)
+        assert extract_token_usage_from_response(LangChainResponse("not a dict")) == (0, 0)
+
+    def test_strategy_cached_per_type(self, monkeypatch):
+        """Test attribute probing runs once per response class"""
+        calls = []
+        select = token_tracker._select_extractor
+
+        def counting_select(response):
+            calls.append(type(response))
+            return select(response)
+
+        monkeypatch.setattr(token_tracker, "_EXTRACTORS", {})
+        monkeypatch.setattr(token_tracker, "_select_extractor", counting_select)
+
+        for i in range(5):
+            response = LangChainResponse({"token_usage": {"prompt_tokens": i, "completion_tokens": 1}})
+            assert extract_token_usage_from_response(response) == (i, 1)
+
+        assert calls == [LangChainResponse]
@@ -10,6 +10,7 @@ This test verifies the complete flow:
 
 import pytest
 import asyncio
+import dataclasses
 from uuid import uuid4
 
 from backend.core.config import get_settings
@@ -190,7 +191,9 @@ async def test_tavily_rate_limiting(setup_and_teardown):
 
     # Create toolset with very low rate limit for testing
     with pytest.MonkeyPatch.context() as m:
-        m.setattr(settings, "tavily_rate_limit_per_minute", 2)
+        # Settings snapshots are frozen; hand the toolset a modified copy
+        limited = dataclasses.replace(settings, tavily_rate_limit_per_minute=2)
+        m.setattr("backend.tools.web_search.tavily_toolset.get_settings", lambda: limited)
 
         tavily = TavilyToolset(
             api_key=settings.tavily_api_key,
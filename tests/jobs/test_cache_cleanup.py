@@ -25,15 +25,28 @@ def mock_settings():
         settings.web_cache_ttl_hours = 24
         settings.web_cache_news_ttl_hours = 1
         settings.web_cache_collection_prefix = "web_cache"
+        settings.web_cache_cleanup_concurrency = 4
         mock.return_value = settings
         yield settings
 
 
+def _mock_lock_session(acquired: bool = True):
+    """Mock session answering pg_try_advisory_lock"""
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalar.return_value = acquired
+    session.execute = AsyncMock(return_value=result)
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    return session
+
+
 @pytest.fixture
 def mock_document_store():
     """Mock DocumentStore"""
     doc_store = MagicMock()
     doc_store.db = MagicMock()
+    doc_store.db.session.return_value = _mock_lock_session()
     doc_store.qdrant_client = MagicMock()
     return doc_store
 
@@ -74,13 +87,16 @@ class TestCleanupStaleWebCache:
                 return_value=mock_qdrant_collections
             )
 
-            with patch('backend.jobs.cache_cleanup._delete_stale_chunks') as mock_delete:
-                mock_delete.return_value = 0
+            with patch('backend.jobs.cache_cleanup._delete_collections_chunks') as mock_delete:
+                mock_delete.return_value = {}
 
                 stats = await cleanup_stale_web_cache()
 
                 # Should process only web_cache collections (2 out of 3)
                 assert stats["collections_processed"] == 2
+                assert mock_delete.call_args.kwargs["collection_names"] == [
+                    "web_cache_user123", "web_cache_user456"
+                ]
 
     @pytest.mark.asyncio
     async def test_uses_correct_ttl(
@@ -95,15 +111,15 @@ class TestCleanupStaleWebCache:
                 return_value=mock_qdrant_collections
             )
 
-            with patch('backend.jobs.cache_cleanup._delete_stale_chunks') as mock_delete:
-                mock_delete.return_value = 5
+            with patch('backend.jobs.cache_cleanup._delete_collections_chunks') as mock_delete:
+                mock_delete.return_value = {"web_cache_user123": 5}
 
                 await cleanup_stale_web_cache()
 
-                # Verify _delete_stale_chunks was called with correct TTL
-                calls = mock_delete.call_args_list
-                for call in calls:
-                    assert call.kwargs["ttl_hours"] == 48
+                # Verify the cutoff is 48 hours ago
+                cutoff_time = mock_delete.call_args.kwargs["cutoff_time"]
+                time_diff = (datetime.now(timezone.utc) - cutoff_time).total_seconds()
+                assert 48 * 3600 - 10 < time_diff < 48 * 3600 + 10
 
     @pytest.mark.asyncio
     async def test_aggregates_deletion_counts(
@@ -116,9 +132,9 @@ class TestCleanupStaleWebCache:
                 return_value=mock_qdrant_collections
             )
 
-            with patch('backend.jobs.cache_cleanup._delete_stale_chunks') as mock_delete:
+            with patch('backend.jobs.cache_cleanup._delete_collections_chunks') as mock_delete:
                 # First collection deletes 10, second deletes 15
-                mock_delete.side_effect = [10, 15]
+                mock_delete.return_value = {"web_cache_user123": 10, "web_cache_user456": 15}
 
                 stats = await cleanup_stale_web_cache()
 
@@ -126,26 +142,24 @@ class TestCleanupStaleWebCache:
                 assert stats["total_chunks_deleted"] == 25
 
     @pytest.mark.asyncio
-    async def test_handles_collection_errors(
+    async def test_handles_cleanup_errors(
         self, mock_settings, mock_document_store, mock_qdrant_collections
     ):
-        """Test that errors in one collection don't stop others"""
+        """Test that a failed set-based delete is reported, not raised"""
         with patch('backend.jobs.cache_cleanup.get_document_store') as mock_get_ds:
             mock_get_ds.return_value = mock_document_store
             mock_document_store.qdrant_client.get_collections = AsyncMock(
                 return_value=mock_qdrant_collections
             )
 
-            with patch('backend.jobs.cache_cleanup._delete_stale_chunks') as mock_delete:
-                # First collection fails, second succeeds
-                mock_delete.side_effect = [Exception("Database error"), 5]
+            with patch('backend.jobs.cache_cleanup._delete_collections_chunks') as mock_delete:
+                mock_delete.side_effect = Exception("Database error")
 
                 stats = await cleanup_stale_web_cache()
 
-                # First collection errors (not counted), second succeeds
-                assert stats["collections_processed"] == 1
+                assert stats["collections_processed"] == 0
                 assert stats["errors"] == 1
-                assert stats["total_chunks_deleted"] == 5
+                assert stats["total_chunks_deleted"] == 0
 
 
 class TestDeleteStaleChunks:
@@ -321,6 +335,178 @@ class TestDeleteStaleChunks:
         # Should still return 1 (PostgreSQL succeeded)
         assert deleted_count == 1
 
+    @pytest.mark.asyncio
+    async def test_deletes_in_bounded_batches(self, mock_document_store):
+        """Test full batches are followed by another until a short batch"""
+        from backend.jobs.cache_cleanup import _delete_in_batches
+
+        batches = [[(uuid4(),), (uuid4(),)], [(uuid4(),), (uuid4(),)], [(uuid4(),)]]
+
+        mock_session = AsyncMock()
+        mock_session.commit = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock()
+        results = []
+        for rows in batches:
+            result = MagicMock()
+            result.fetchall.return_value = rows
+            results.append(result)
+        mock_session.execute = AsyncMock(side_effect=results)
+        mock_document_store.db.session.return_value = mock_session
+        mock_document_store.qdrant_client.delete = AsyncMock()
+
+        deleted = await _delete_in_batches(
+            doc_store=mock_document_store,
+            delete_query="DELETE ... LIMIT :batch_size",
+            params={"collection_id": uuid4(), "cutoff_time": datetime.now(timezone.utc)},
+            collection_name="web_cache_user123",
+            batch_size=2,
+        )
+
+        assert deleted == {"web_cache_user123": 5}
+        assert mock_session.execute.call_count == 3
+        assert mock_session.commit.call_count == 3
+        assert mock_session.execute.call_args.args[1]["batch_size"] == 2
+
+        # One Qdrant delete per batch, each with only that batch's ids
+        sizes = [
+            len(call.kwargs["points_selector"].points)
+            for call in mock_document_store.qdrant_client.delete.call_args_list
+        ]
+        assert sizes == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_delete_query_is_batched(self, mock_document_store):
+        """Test the stale chunk DELETE is limited and skips locked rows"""
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.fetchone.return_value = (uuid4(),)
+        mock_result.fetchall.return_value = []
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        mock_session.commit = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock()
+        mock_document_store.db.session.return_value = mock_session
+
+        await _delete_stale_chunks(
+            doc_store=mock_document_store,
+            collection_name="web_cache_user123",
+            ttl_hours=24
+        )
+
+        query = mock_session.execute.call_args.args[0]
+        assert "LIMIT :batch_size" in query
+        assert "FOR UPDATE SKIP LOCKED" in query
+
+
+class TestDeleteCollectionsChunks:
+    """Test set-based deletion across collections"""
+
+    @pytest.mark.asyncio
+    async def test_single_query_buckets_by_collection(self, mock_document_store):
+        """Test one DELETE covers all collections and Qdrant deletes are per collection"""
+        from backend.jobs.cache_cleanup import _delete_collections_chunks
+
+        ids_a = [uuid4(), uuid4()]
+        ids_b = [uuid4()]
+
+        mock_session = AsyncMock()
+        mock_session.commit = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = [
+            ("web_cache_a", ids_a[0]), ("web_cache_b", ids_b[0]), ("web_cache_a", ids_a[1]),
+        ]
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        mock_document_store.db.session.return_value = mock_session
+        mock_document_store.qdrant_client.delete = AsyncMock()
+
+        deleted = await _delete_collections_chunks(
+            doc_store=mock_document_store,
+            collection_names=["web_cache_a", "web_cache_b"],
+            cutoff_time=datetime.now(timezone.utc),
+        )
+
+        assert deleted == {"web_cache_a": 2, "web_cache_b": 1}
+
+        mock_session.execute.assert_awaited_once()
+        query, params = mock_session.execute.call_args.args
+        assert "ANY(:collection_names)" in query
+        assert "RETURNING dcol.qdrant_collection_name, dc.id" in query
+        assert "'news'" not in query
+        assert params["collection_names"] == ["web_cache_a", "web_cache_b"]
+
+        qdrant_deletes = {
+            call.kwargs["collection_name"]: call.kwargs["points_selector"].points
+            for call in mock_document_store.qdrant_client.delete.call_args_list
+        }
+        assert qdrant_deletes == {
+            "web_cache_a": [str(i) for i in ids_a],
+            "web_cache_b": [str(i) for i in ids_b],
+        }
+
+    @pytest.mark.asyncio
+    async def test_news_filter_and_empty_names(self, mock_document_store):
+        """Test news_only adds the topic filter and no names skips the query"""
+        from backend.jobs.cache_cleanup import _delete_collections_chunks
+
+        mock_session = AsyncMock()
+        mock_session.commit = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = []
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        mock_document_store.db.session.return_value = mock_session
+
+        assert await _delete_collections_chunks(
+            mock_document_store, [], datetime.now(timezone.utc)
+        ) == {}
+        mock_session.execute.assert_not_called()
+
+        await _delete_collections_chunks(
+            mock_document_store, ["web_cache_a"], datetime.now(timezone.utc), news_only=True
+        )
+        assert "metadata->>'topic' = 'news'" in mock_session.execute.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_qdrant_deletes_bounded_concurrency(self, mock_document_store):
+        """Test per-collection Qdrant deletes overlap up to max_concurrency"""
+        import asyncio
+
+        from backend.jobs.cache_cleanup import _delete_collections_chunks
+
+        names = [f"web_cache_{i}" for i in range(6)]
+
+        mock_session = AsyncMock()
+        mock_session.commit = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = [(name, uuid4()) for name in names]
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        mock_document_store.db.session.return_value = mock_session
+
+        in_flight = 0
+        peak = 0
+
+        async def slow_delete(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        mock_document_store.qdrant_client.delete = slow_delete
+
+        deleted = await _delete_collections_chunks(
+            mock_document_store, names, datetime.now(timezone.utc), max_concurrency=2
+        )
+
+        assert deleted == {name: 1 for name in names}
+        assert peak == 2
+
 
 class TestCleanupNewsCache:
     """Test news cache cleanup (1h TTL)"""
@@ -338,18 +524,18 @@ class TestCleanupNewsCache:
                 return_value=mock_qdrant_collections
             )
 
-            with patch('backend.jobs.cache_cleanup._delete_news_chunks') as mock_delete:
-                mock_delete.return_value = 0
+            with patch('backend.jobs.cache_cleanup._delete_collections_chunks') as mock_delete:
+                mock_delete.return_value = {}
 
                 stats = await cleanup_news_cache()
 
-                # Verify correct TTL was used
-                calls = mock_delete.call_args_list
-                for call in calls:
-                    cutoff_time = call.kwargs["cutoff_time"]
-                    time_diff = (datetime.now(timezone.utc) - cutoff_time).total_seconds()
-                    # Should be approximately 1 hour (3600 seconds)
-                    assert 3590 < time_diff < 3610
+                # Verify correct TTL and news filter were used
+                assert mock_delete.call_args.kwargs["news_only"] is True
+                cutoff_time = mock_delete.call_args.kwargs["cutoff_time"]
+                time_diff = (datetime.now(timezone.utc) - cutoff_time).total_seconds()
+                # Should be approximately 1 hour (3600 seconds)
+                assert 3590 < time_diff < 3610
+                assert stats["collections_processed"] == 2
 
     @pytest.mark.asyncio
     async def test_only_deletes_news_chunks(self, mock_document_store):
@@ -412,6 +598,66 @@ class TestCleanupWebCacheForUser:
                 assert deleted_count == 10
 
 
+class TestCleanupLock:
+    """Test advisory lock guarding overlapping cleanup runs"""
+
+    @pytest.mark.asyncio
+    async def test_skips_when_lock_held(
+        self, mock_settings, mock_document_store, mock_qdrant_collections
+    ):
+        """Test every cleanup job exits early when another run holds the lock"""
+        mock_document_store.db.session.return_value = _mock_lock_session(acquired=False)
+        mock_document_store.qdrant_client.get_collections = AsyncMock(
+            return_value=mock_qdrant_collections
+        )
+
+        with patch('backend.jobs.cache_cleanup.get_document_store') as mock_get_ds, \
+             patch('backend.jobs.cache_cleanup._delete_collections_chunks') as mock_bulk, \
+             patch('backend.jobs.cache_cleanup._delete_stale_chunks') as mock_single:
+            mock_get_ds.return_value = mock_document_store
+
+            stats = await cleanup_stale_web_cache()
+            news_stats = await cleanup_news_cache()
+            user_deleted = await cleanup_web_cache_for_user("user123")
+
+        assert stats == news_stats == {
+            "collections_processed": 0, "total_chunks_deleted": 0, "errors": 0,
+        }
+        assert user_deleted == 0
+        mock_bulk.assert_not_called()
+        mock_single.assert_not_called()
+
+        # Never unlocks a lock it didn't take
+        queries = [c.args[0] for c in mock_document_store.db.session.return_value.execute.call_args_list]
+        assert not any("pg_advisory_unlock" in q for q in queries)
+
+    @pytest.mark.asyncio
+    async def test_releases_lock_after_run(
+        self, mock_settings, mock_document_store, mock_qdrant_collections
+    ):
+        """Test the lock is taken and released with a stable key"""
+        from backend.jobs.cache_cleanup import _CLEANUP_LOCK_KEY
+
+        lock_session = mock_document_store.db.session.return_value
+        mock_document_store.qdrant_client.get_collections = AsyncMock(
+            return_value=mock_qdrant_collections
+        )
+
+        with patch('backend.jobs.cache_cleanup.get_document_store') as mock_get_ds, \
+             patch('backend.jobs.cache_cleanup._delete_collections_chunks') as mock_bulk:
+            mock_get_ds.return_value = mock_document_store
+            mock_bulk.side_effect = Exception("Database error")
+
+            stats = await cleanup_stale_web_cache()
+
+        assert stats["errors"] == 1
+        calls = lock_session.execute.call_args_list
+        assert "pg_try_advisory_lock" in calls[0].args[0]
+        assert "pg_advisory_unlock" in calls[-1].args[0]
+        assert calls[-1].args[1] == {"key": _CLEANUP_LOCK_KEY}
+        assert 0 < _CLEANUP_LOCK_KEY <= 0x7FFFFFFF
+
+
 class TestIndexUsage:
     """Test that cleanup queries use the new indexes"""
 
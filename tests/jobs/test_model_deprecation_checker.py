@@ -0,0 +1,76 @@
+"""
+Tests for model deprecation checker
+Tests that approved models are checked concurrently and stragglers are bounded
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.jobs.model_deprecation_checker import (
+    ModelCheckResult,
+    ModelDeprecationChecker,
+)
+
+
+def _checker_with_models(models):
+    """Checker whose session returns the given approved models"""
+    session = MagicMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = models
+    session.execute = AsyncMock(return_value=result)
+    return ModelDeprecationChecker(session)
+
+
+def _models(count):
+    return [SimpleNamespace(provider="openai", model_name=f"model-{i}") for i in range(count)]
+
+
+class TestCheckAllModels:
+    """Test concurrent model checks"""
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently_with_bound(self):
+        """Test checks overlap but never exceed MAX_CONCURRENT_CHECKS"""
+        checker = _checker_with_models(_models(20))
+        checker.MAX_CONCURRENT_CHECKS = 4
+        in_flight = 0
+        peak = 0
+
+        async def fake_check(provider, model_name):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return ModelCheckResult(provider, model_name, "active")
+
+        checker._check_model = fake_check
+
+        report = await checker.check_all_models()
+
+        assert peak == 4
+        assert report.checked_models == report.active_models == 20
+        # Results keep the input order
+        assert [r.model_name for r in report.details] == [f"model-{i}" for i in range(20)]
+
+    @pytest.mark.asyncio
+    async def test_slow_check_reported_unknown(self):
+        """Test a provider call past the timeout doesn't hold up the report"""
+        checker = _checker_with_models(_models(2))
+        checker.CHECK_TIMEOUT_SECONDS = 0.05
+
+        async def fake_check(provider, model_name):
+            if model_name == "model-0":
+                await asyncio.sleep(10)
+            return ModelCheckResult(provider, model_name, "active")
+
+        checker._check_model = fake_check
+
+        report = await checker.check_all_models()
+
+        assert report.details[0].status == "unknown"
+        assert "timed out" in report.details[0].error_message
+        assert report.details[1].status == "active"
+        assert report.unknown_models == 1